@@ -16,6 +16,7 @@ import src.subleases.models
 import src.userratings.models
 import src.propertyimages.models
 import src.messages.models
+import src.utils.scheduler
 
 config = context.config
 
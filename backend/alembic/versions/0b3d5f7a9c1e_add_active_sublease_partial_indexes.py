@@ -0,0 +1,67 @@
+"""add_active_sublease_partial_indexes
+
+Revision ID: 0b3d5f7a9c1e
+Revises: f2a4c6e8d0b1
+Create Date: 2026-10-19 16:12:09.825713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b3d5f7a9c1e'
+down_revision: Union[str, None] = 'f2a4c6e8d0b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status = 'active'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expire listings that ended before the sweeper existed
+    op.execute(
+        "UPDATE subleases SET status = 'expired', updated_at = now() "
+        "WHERE status = 'active' AND available_until < current_date"
+    )
+
+    op.drop_index('ix_subleases_status_created_at_id', table_name='subleases')
+    op.drop_index('ix_subleases_status_rate_id', table_name='subleases')
+    op.drop_index('ix_subleases_status_available_from_id', table_name='subleases')
+
+    op.create_index(
+        'ix_subleases_active_created_at_id', 'subleases', ['created_at', 'sublease_id'],
+        unique=False, postgresql_where=ACTIVE
+    )
+    op.create_index(
+        'ix_subleases_active_rate_id', 'subleases', ['rate', 'sublease_id'],
+        unique=False, postgresql_where=ACTIVE
+    )
+    op.create_index(
+        'ix_subleases_active_available_from_id', 'subleases', ['available_from', 'sublease_id'],
+        unique=False, postgresql_where=ACTIVE
+    )
+    op.create_index(
+        'ix_subleases_active_available_until', 'subleases', ['available_until'],
+        unique=False, postgresql_where=ACTIVE
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subleases_active_available_until', table_name='subleases', postgresql_where=ACTIVE)
+    op.drop_index('ix_subleases_active_available_from_id', table_name='subleases', postgresql_where=ACTIVE)
+    op.drop_index('ix_subleases_active_rate_id', table_name='subleases', postgresql_where=ACTIVE)
+    op.drop_index('ix_subleases_active_created_at_id', table_name='subleases', postgresql_where=ACTIVE)
+
+    op.create_index(
+        'ix_subleases_status_available_from_id', 'subleases', ['status', 'available_from', 'sublease_id'],
+        unique=False
+    )
+    op.create_index('ix_subleases_status_rate_id', 'subleases', ['status', 'rate', 'sublease_id'], unique=False)
+    op.create_index(
+        'ix_subleases_status_created_at_id', 'subleases', ['status', 'created_at', 'sublease_id'], unique=False
+    )
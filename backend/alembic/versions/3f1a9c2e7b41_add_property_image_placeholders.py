@@ -0,0 +1,30 @@
+"""add_property_image_placeholders
+
+Revision ID: 3f1a9c2e7b41
+Revises: ba6f8a37a1da
+Create Date: 2026-10-19 09:12:44.201733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2e7b41'
+down_revision: Union[str, None] = 'ba6f8a37a1da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('property_images', sa.Column('blurhash', sa.String(length=64), nullable=True))
+    op.add_column('property_images', sa.Column('dominant_color', sa.String(length=7), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('property_images', 'dominant_color')
+    op.drop_column('property_images', 'blurhash')
@@ -0,0 +1,67 @@
+"""normalize_property_amenities
+
+Revision ID: 5a7c9e1f3b24
+Revises: 8d2e4b6a9c13
+Create Date: 2026-10-19 11:21:48.903512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c9e1f3b24'
+down_revision: Union[str, None] = '8d2e4b6a9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Convert the {"0": "...", "1": "..."} mapping to a JSONB array, keeping order
+    op.add_column('properties', sa.Column('amenities_array', postgresql.JSONB(), nullable=True))
+    op.execute("""
+        UPDATE properties SET amenities_array = CASE json_typeof(amenities)
+            WHEN 'array' THEN amenities::jsonb
+            WHEN 'object' THEN (
+                SELECT jsonb_agg(value ORDER BY CASE WHEN key ~ '^[0-9]+$' THEN key::int END, key)
+                FROM json_each(amenities)
+            )
+        END
+        WHERE amenities IS NOT NULL
+    """)
+    op.drop_column('properties', 'amenities')
+    op.alter_column('properties', 'amenities_array', new_column_name='amenities')
+
+    op.create_index(
+        'ix_properties_amenities', 'properties', ['amenities'], unique=False,
+        postgresql_using='gin', postgresql_ops={'amenities': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_properties_state_city', 'properties',
+        [sa.text('lower(state)'), sa.text('lower(city)')], unique=False
+    )
+    op.create_index('ix_properties_property_type', 'properties', ['property_type'], unique=False)
+    op.create_index('ix_subleases_rate', 'subleases', ['rate'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subleases_rate', table_name='subleases')
+    op.drop_index('ix_properties_property_type', table_name='properties')
+    op.drop_index('ix_properties_state_city', table_name='properties')
+    op.drop_index('ix_properties_amenities', table_name='properties', postgresql_using='gin')
+
+    op.add_column('properties', sa.Column('amenities_object', sa.JSON(), nullable=True))
+    op.execute("""
+        UPDATE properties SET amenities_object = (
+            SELECT json_object_agg((ordinality - 1)::text, value ORDER BY ordinality)
+            FROM jsonb_array_elements_text(amenities) WITH ORDINALITY
+        )
+        WHERE jsonb_typeof(amenities) = 'array'
+    """)
+    op.drop_column('properties', 'amenities')
+    op.alter_column('properties', 'amenities_object', new_column_name='amenities')
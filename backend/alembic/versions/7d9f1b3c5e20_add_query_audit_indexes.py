@@ -0,0 +1,94 @@
+"""add_query_audit_indexes
+
+Revision ID: 7d9f1b3c5e20
+Revises: 0b3d5f7a9c1e
+Create Date: 2026-10-19 17:05:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d9f1b3c5e20'
+down_revision: Union[str, None] = '0b3d5f7a9c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIMARY = sa.text("is_primary")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Read receipts were inserted check-then-act; drop duplicates before enforcing uniqueness
+    op.execute(
+        "DELETE FROM message_reads a USING message_reads b "
+        "WHERE a.message_id = b.message_id AND a.user_id = b.user_id "
+        "AND (a.read_at, a.read_id) > (b.read_at, b.read_id)"
+    )
+    op.create_index(
+        'ux_message_reads_message_user', 'message_reads', ['message_id', 'user_id'], unique=True
+    )
+    op.drop_index('ix_message_reads_message_id', table_name='message_reads')
+
+    op.create_index(
+        'ix_messages_sender_receiver_created_at', 'messages', ['sender_id', 'receiver_id', 'created_at'],
+        unique=False
+    )
+    op.drop_index('ix_messages_sender_id', table_name='messages')
+
+    op.create_index(
+        'ix_conversations_user1_last_message_at', 'conversations', ['user1_id', 'last_message_at'],
+        unique=False
+    )
+    op.create_index(
+        'ix_conversations_user2_last_message_at', 'conversations', ['user2_id', 'last_message_at'],
+        unique=False
+    )
+    op.drop_index('ix_conversations_user1_id', table_name='conversations')
+    op.drop_index('ix_conversations_user2_id', table_name='conversations')
+
+    op.create_index(
+        'ix_property_images_property_order', 'property_images', ['property_id', 'image_order', 'created_at'],
+        unique=False
+    )
+    op.create_index(
+        'ix_property_images_primary', 'property_images', ['property_id'],
+        unique=False, postgresql_where=PRIMARY
+    )
+
+    op.create_index(
+        'ix_user_ratings_rated_user_created_at', 'user_ratings', ['rated_user_id', 'created_at'],
+        unique=False, postgresql_include=['rating']
+    )
+    op.create_index('ix_user_ratings_rater_created_at', 'user_ratings', ['rater_id', 'created_at'], unique=False)
+    op.create_index('ix_user_ratings_sublease_id', 'user_ratings', ['sublease_id'], unique=False)
+
+    op.create_index('ix_subleases_lessor_created_at', 'subleases', ['lessor_id', 'created_at'], unique=False)
+    op.create_index('ix_subleases_property_id', 'subleases', ['property_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subleases_property_id', table_name='subleases')
+    op.drop_index('ix_subleases_lessor_created_at', table_name='subleases')
+
+    op.drop_index('ix_user_ratings_sublease_id', table_name='user_ratings')
+    op.drop_index('ix_user_ratings_rater_created_at', table_name='user_ratings')
+    op.drop_index('ix_user_ratings_rated_user_created_at', table_name='user_ratings')
+
+    op.drop_index('ix_property_images_primary', table_name='property_images', postgresql_where=PRIMARY)
+    op.drop_index('ix_property_images_property_order', table_name='property_images')
+
+    op.create_index('ix_conversations_user2_id', 'conversations', ['user2_id'], unique=False)
+    op.create_index('ix_conversations_user1_id', 'conversations', ['user1_id'], unique=False)
+    op.drop_index('ix_conversations_user2_last_message_at', table_name='conversations')
+    op.drop_index('ix_conversations_user1_last_message_at', table_name='conversations')
+
+    op.create_index('ix_messages_sender_id', 'messages', ['sender_id'], unique=False)
+    op.drop_index('ix_messages_sender_receiver_created_at', table_name='messages')
+
+    op.create_index('ix_message_reads_message_id', 'message_reads', ['message_id'], unique=False)
+    op.drop_index('ux_message_reads_message_user', table_name='message_reads')
@@ -0,0 +1,42 @@
+"""add_sublease_availability_range
+
+Revision ID: 8d2e4b6a9c13
+Revises: 3f1a9c2e7b41
+Create Date: 2026-10-19 10:03:17.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6a9c13'
+down_revision: Union[str, None] = '3f1a9c2e7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'subleases',
+        sa.Column(
+            'availability',
+            postgresql.DATERANGE(),
+            sa.Computed("daterange(available_from, available_until, '[]')", persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'ix_subleases_availability', 'subleases', ['availability'], unique=False,
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subleases_availability', table_name='subleases', postgresql_using='gist')
+    op.drop_column('subleases', 'availability')
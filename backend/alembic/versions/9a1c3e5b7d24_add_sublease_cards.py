@@ -0,0 +1,229 @@
+"""add_sublease_cards
+
+Revision ID: 9a1c3e5b7d24
+Revises: 7d9f1b3c5e20
+Create Date: 2026-10-19 17:48:22.504917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1c3e5b7d24'
+down_revision: Union[str, None] = '7d9f1b3c5e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sublease_cards',
+    sa.Column('sublease_id', sa.UUID(), nullable=False),
+    sa.Column('property_id', sa.UUID(), nullable=False),
+    sa.Column('lessor_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('minimum_stay_days', sa.Integer(), nullable=False),
+    sa.Column('maximum_stay_days', sa.Integer(), nullable=True),
+    sa.Column('available_from', sa.Date(), nullable=False),
+    sa.Column('available_until', sa.Date(), nullable=False),
+    sa.Column(
+        'availability', postgresql.DATERANGE(),
+        sa.Computed("daterange(available_from, available_until, '[]')", persisted=True), nullable=True
+    ),
+    sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('property_title', sa.String(length=100), nullable=False),
+    sa.Column('property_type', sa.String(length=50), nullable=True),
+    sa.Column('city', sa.String(length=60), nullable=False),
+    sa.Column('state', sa.String(length=60), nullable=False),
+    sa.Column('square_feet', sa.Integer(), nullable=True),
+    sa.Column('amenities', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('image_blurhash', sa.String(length=64), nullable=True),
+    sa.Column('image_dominant_color', sa.String(length=7), nullable=True),
+    sa.Column('lessor_first_name', sa.String(), nullable=False),
+    sa.Column('lessor_last_name', sa.String(), nullable=False),
+    sa.Column('lessor_profile_image_url', sa.String(), nullable=True),
+    sa.Column('lessor_average_rating', sa.Float(), nullable=True),
+    sa.Column('lessor_total_ratings', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['sublease_id'], ['subleases.sublease_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sublease_id')
+    )
+    op.create_index('ix_sublease_cards_created_at_id', 'sublease_cards', ['created_at', 'sublease_id'], unique=False)
+    op.create_index('ix_sublease_cards_rate_id', 'sublease_cards', ['rate', 'sublease_id'], unique=False)
+    op.create_index(
+        'ix_sublease_cards_available_from_id', 'sublease_cards', ['available_from', 'sublease_id'], unique=False
+    )
+    op.create_index(
+        'ix_sublease_cards_availability', 'sublease_cards', ['availability'], unique=False, postgresql_using='gist'
+    )
+    op.create_index(
+        'ix_sublease_cards_search_vector', 'sublease_cards', ['search_vector'], unique=False,
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_sublease_cards_amenities', 'sublease_cards', ['amenities'], unique=False,
+        postgresql_using='gin', postgresql_ops={'amenities': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_sublease_cards_state_city', 'sublease_cards', [sa.text('lower(state)'), sa.text('lower(city)')],
+        unique=False
+    )
+    op.create_index('ix_sublease_cards_property_type', 'sublease_cards', ['property_type'], unique=False)
+    op.create_index(
+        'ix_sublease_cards_earth_location', 'sublease_cards',
+        [sa.text('ll_to_earth(latitude, longitude)')], unique=False, postgresql_using='gist'
+    )
+    op.create_index('ix_sublease_cards_property_id', 'sublease_cards', ['property_id'], unique=False)
+    op.create_index('ix_sublease_cards_lessor_id', 'sublease_cards', ['lessor_id'], unique=False)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sublease_cards_refresh(ids uuid[]) RETURNS void AS $$
+        BEGIN
+            INSERT INTO sublease_cards (
+                sublease_id, property_id, lessor_id, title, rate, minimum_stay_days, maximum_stay_days,
+                available_from, available_until, search_vector, created_at,
+                property_title, property_type, city, state, square_feet, amenities, latitude, longitude,
+                image_url, image_blurhash, image_dominant_color,
+                lessor_first_name, lessor_last_name, lessor_profile_image_url,
+                lessor_average_rating, lessor_total_ratings
+            )
+            SELECT
+                s.sublease_id, s.property_id, s.lessor_id, s.title, s.rate, s.minimum_stay_days, s.maximum_stay_days,
+                s.available_from, s.available_until, s.search_vector, s.created_at,
+                p.title, p.property_type, p.city, p.state, p.square_feet, p.amenities, p.latitude, p.longitude,
+                img.image_url, img.blurhash, img.dominant_color,
+                u.first_name, u.last_name, u.profile_image_url,
+                r.average_rating, r.total_ratings
+            FROM subleases s
+            JOIN properties p ON p.property_id = s.property_id
+            JOIN users u ON u.user_id = s.lessor_id
+            LEFT JOIN LATERAL (
+                SELECT i.image_url, i.blurhash, i.dominant_color
+                FROM property_images i
+                WHERE i.property_id = s.property_id
+                ORDER BY i.is_primary IS TRUE DESC, i.image_order, i.created_at
+                LIMIT 1
+            ) img ON true
+            CROSS JOIN LATERAL (
+                SELECT avg(ur.rating)::float8 AS average_rating, count(*) AS total_ratings
+                FROM user_ratings ur
+                WHERE ur.rated_user_id = s.lessor_id
+            ) r
+            WHERE s.sublease_id = ANY(ids) AND s.status = 'active'
+            ON CONFLICT (sublease_id) DO UPDATE SET
+                property_id = EXCLUDED.property_id, lessor_id = EXCLUDED.lessor_id, title = EXCLUDED.title,
+                rate = EXCLUDED.rate, minimum_stay_days = EXCLUDED.minimum_stay_days,
+                maximum_stay_days = EXCLUDED.maximum_stay_days, available_from = EXCLUDED.available_from,
+                available_until = EXCLUDED.available_until, search_vector = EXCLUDED.search_vector,
+                created_at = EXCLUDED.created_at, property_title = EXCLUDED.property_title,
+                property_type = EXCLUDED.property_type, city = EXCLUDED.city, state = EXCLUDED.state,
+                square_feet = EXCLUDED.square_feet, amenities = EXCLUDED.amenities, latitude = EXCLUDED.latitude,
+                longitude = EXCLUDED.longitude, image_url = EXCLUDED.image_url,
+                image_blurhash = EXCLUDED.image_blurhash, image_dominant_color = EXCLUDED.image_dominant_color,
+                lessor_first_name = EXCLUDED.lessor_first_name, lessor_last_name = EXCLUDED.lessor_last_name,
+                lessor_profile_image_url = EXCLUDED.lessor_profile_image_url,
+                lessor_average_rating = EXCLUDED.lessor_average_rating,
+                lessor_total_ratings = EXCLUDED.lessor_total_ratings,
+                refreshed_at = now();
+
+            DELETE FROM sublease_cards c
+            WHERE c.sublease_id = ANY(ids)
+              AND c.sublease_id NOT IN (
+                  SELECT sublease_id FROM subleases WHERE sublease_id = ANY(ids) AND status = 'active'
+              );
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sublease_cards_sublease_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM sublease_cards_refresh(ARRAY[NEW.sublease_id]);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER sublease_cards_sublease_trigger
+            AFTER INSERT OR UPDATE ON subleases
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_sublease_changed()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sublease_cards_property_changed() RETURNS trigger AS $$
+        DECLARE
+            changed uuid := CASE WHEN TG_OP = 'DELETE' THEN OLD.property_id ELSE NEW.property_id END;
+        BEGIN
+            PERFORM sublease_cards_refresh(ARRAY(
+                SELECT sublease_id FROM subleases WHERE property_id = changed AND status = 'active'
+            ));
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER sublease_cards_property_trigger
+            AFTER UPDATE OF title, property_type, city, state, square_feet, amenities, latitude, longitude ON properties
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_property_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER sublease_cards_image_trigger
+            AFTER INSERT OR UPDATE OR DELETE ON property_images
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_property_changed()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sublease_cards_lessor_changed() RETURNS trigger AS $$
+        DECLARE
+            changed uuid;
+        BEGIN
+            IF TG_TABLE_NAME = 'users' THEN
+                changed := NEW.user_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                changed := OLD.rated_user_id;
+            ELSE
+                changed := NEW.rated_user_id;
+            END IF;
+
+            PERFORM sublease_cards_refresh(ARRAY(
+                SELECT sublease_id FROM subleases WHERE lessor_id = changed AND status = 'active'
+            ));
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER sublease_cards_lessor_trigger
+            AFTER UPDATE OF first_name, last_name, profile_image_url ON users
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER sublease_cards_rating_trigger
+            AFTER INSERT OR UPDATE OF rating OR DELETE ON user_ratings
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed()
+    """)
+
+    # Build cards for the current active listings
+    op.execute(
+        "SELECT sublease_cards_refresh(ARRAY(SELECT sublease_id FROM subleases WHERE status = 'active'))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_rating_trigger ON user_ratings")
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users")
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_image_trigger ON property_images")
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_property_trigger ON properties")
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_sublease_trigger ON subleases")
+    op.execute("DROP FUNCTION IF EXISTS sublease_cards_lessor_changed()")
+    op.execute("DROP FUNCTION IF EXISTS sublease_cards_property_changed()")
+    op.execute("DROP FUNCTION IF EXISTS sublease_cards_sublease_changed()")
+    op.execute("DROP FUNCTION IF EXISTS sublease_cards_refresh(uuid[])")
+    op.drop_table('sublease_cards')
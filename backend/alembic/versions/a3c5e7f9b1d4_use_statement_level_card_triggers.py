@@ -0,0 +1,248 @@
+"""use_statement_level_card_triggers
+
+Revision ID: a3c5e7f9b1d4
+Revises: e8a0c2d4f6b7
+Create Date: 2026-10-20 09:14:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b1d4'
+down_revision: Union[str, None] = 'e8a0c2d4f6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Card refresh as an upsert, and triggers running once per statement with
+# the changed rows in transition tables (same as src.subleases.feed)
+UPGRADE_SQL = """
+    CREATE OR REPLACE FUNCTION sublease_cards_refresh(ids uuid[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO sublease_cards (
+            sublease_id, property_id, lessor_id, title, rate, minimum_stay_days, maximum_stay_days,
+            available_from, available_until, search_vector, created_at,
+            property_title, property_type, city, state, square_feet, amenities, latitude, longitude,
+            image_url, image_blurhash, image_dominant_color,
+            lessor_first_name, lessor_last_name, lessor_profile_image_url,
+            lessor_average_rating, lessor_total_ratings, lessor_reputation_score
+        )
+        SELECT
+            s.sublease_id, s.property_id, s.lessor_id, s.title, s.rate, s.minimum_stay_days, s.maximum_stay_days,
+            s.available_from, s.available_until, s.search_vector, s.created_at,
+            p.title, p.property_type, p.city, p.state, p.square_feet, p.amenities, p.latitude, p.longitude,
+            img.image_url, img.blurhash, img.dominant_color,
+            u.first_name, u.last_name, u.profile_image_url,
+            u.average_rating::float8, u.total_ratings, u.reputation_score
+        FROM subleases s
+        JOIN properties p ON p.property_id = s.property_id
+        JOIN users u ON u.user_id = s.lessor_id
+        LEFT JOIN LATERAL (
+            SELECT i.image_url, i.blurhash, i.dominant_color
+            FROM property_images i
+            WHERE i.property_id = s.property_id
+            ORDER BY i.is_primary IS TRUE DESC, i.image_order, i.created_at
+            LIMIT 1
+        ) img ON true
+        WHERE s.sublease_id = ANY(ids) AND s.status = 'active'
+        ON CONFLICT (sublease_id) DO UPDATE SET
+            property_id = EXCLUDED.property_id, lessor_id = EXCLUDED.lessor_id, title = EXCLUDED.title,
+            rate = EXCLUDED.rate, minimum_stay_days = EXCLUDED.minimum_stay_days,
+            maximum_stay_days = EXCLUDED.maximum_stay_days, available_from = EXCLUDED.available_from,
+            available_until = EXCLUDED.available_until, search_vector = EXCLUDED.search_vector,
+            created_at = EXCLUDED.created_at, property_title = EXCLUDED.property_title,
+            property_type = EXCLUDED.property_type, city = EXCLUDED.city, state = EXCLUDED.state,
+            square_feet = EXCLUDED.square_feet, amenities = EXCLUDED.amenities, latitude = EXCLUDED.latitude,
+            longitude = EXCLUDED.longitude, image_url = EXCLUDED.image_url,
+            image_blurhash = EXCLUDED.image_blurhash, image_dominant_color = EXCLUDED.image_dominant_color,
+            lessor_first_name = EXCLUDED.lessor_first_name, lessor_last_name = EXCLUDED.lessor_last_name,
+            lessor_profile_image_url = EXCLUDED.lessor_profile_image_url,
+            lessor_average_rating = EXCLUDED.lessor_average_rating,
+            lessor_total_ratings = EXCLUDED.lessor_total_ratings,
+            lessor_reputation_score = EXCLUDED.lessor_reputation_score,
+            refreshed_at = now();
+
+        DELETE FROM sublease_cards c
+        WHERE c.sublease_id = ANY(ids)
+          AND c.sublease_id NOT IN (
+              SELECT sublease_id FROM subleases WHERE sublease_id = ANY(ids) AND status = 'active'
+          );
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION sublease_cards_sublease_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM sublease_cards_refresh(ARRAY(SELECT DISTINCT sublease_id FROM new_rows));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS sublease_cards_sublease_trigger ON subleases;
+    DROP TRIGGER IF EXISTS sublease_cards_sublease_insert_trigger ON subleases;
+    CREATE TRIGGER sublease_cards_sublease_insert_trigger
+        AFTER INSERT ON subleases
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_sublease_changed();
+    DROP TRIGGER IF EXISTS sublease_cards_sublease_update_trigger ON subleases;
+    CREATE TRIGGER sublease_cards_sublease_update_trigger
+        AFTER UPDATE ON subleases
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_sublease_changed();
+
+    CREATE OR REPLACE FUNCTION sublease_cards_property_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM sublease_cards_refresh(ARRAY(
+            SELECT s.sublease_id
+            FROM subleases s
+            WHERE s.status = 'active' AND s.property_id IN (
+                SELECT n.property_id
+                FROM new_rows n
+                JOIN old_rows o ON o.property_id = n.property_id
+                WHERE (n.title, n.property_type, n.city, n.state, n.square_feet, n.amenities, n.latitude, n.longitude)
+                    IS DISTINCT FROM
+                    (o.title, o.property_type, o.city, o.state, o.square_feet, o.amenities, o.latitude, o.longitude)
+            )
+        ));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS sublease_cards_property_trigger ON properties;
+    CREATE TRIGGER sublease_cards_property_trigger
+        AFTER UPDATE ON properties
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_property_changed();
+
+    CREATE OR REPLACE FUNCTION sublease_cards_image_changed() RETURNS trigger AS $$
+    DECLARE
+        changed uuid[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            changed := ARRAY(SELECT DISTINCT property_id FROM new_rows);
+        ELSIF TG_OP = 'UPDATE' THEN
+            changed := ARRAY(SELECT property_id FROM new_rows UNION SELECT property_id FROM old_rows);
+        ELSE
+            changed := ARRAY(SELECT DISTINCT property_id FROM old_rows);
+        END IF;
+
+        PERFORM sublease_cards_refresh(ARRAY(
+            SELECT sublease_id FROM subleases WHERE property_id = ANY(changed) AND status = 'active'
+        ));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS sublease_cards_image_trigger ON property_images;
+    DROP TRIGGER IF EXISTS sublease_cards_image_insert_trigger ON property_images;
+    CREATE TRIGGER sublease_cards_image_insert_trigger
+        AFTER INSERT ON property_images
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_image_changed();
+    DROP TRIGGER IF EXISTS sublease_cards_image_update_trigger ON property_images;
+    CREATE TRIGGER sublease_cards_image_update_trigger
+        AFTER UPDATE ON property_images
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_image_changed();
+    DROP TRIGGER IF EXISTS sublease_cards_image_delete_trigger ON property_images;
+    CREATE TRIGGER sublease_cards_image_delete_trigger
+        AFTER DELETE ON property_images
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_image_changed();
+
+    CREATE OR REPLACE FUNCTION sublease_cards_lessor_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM sublease_cards_refresh(ARRAY(
+            SELECT s.sublease_id
+            FROM subleases s
+            WHERE s.status = 'active' AND s.lessor_id IN (
+                SELECT n.user_id
+                FROM new_rows n
+                JOIN old_rows o ON o.user_id = n.user_id
+                WHERE (n.first_name, n.last_name, n.profile_image_url, n.average_rating, n.total_ratings,
+                       n.reputation_score)
+                    IS DISTINCT FROM
+                    (o.first_name, o.last_name, o.profile_image_url, o.average_rating, o.total_ratings,
+                     o.reputation_score)
+            )
+        ));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users;
+    CREATE TRIGGER sublease_cards_lessor_trigger
+        AFTER UPDATE ON users
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sublease_cards_lessor_changed();
+
+    -- Ratings reach the cards through the lessor's aggregates; drop the trigger older schemas had
+    DROP TRIGGER IF EXISTS sublease_cards_rating_trigger ON user_ratings;
+"""
+
+# Per-row triggers from d7f9b1c3e5a6; the upserting refresh function stays
+DOWNGRADE_SQL = """
+    DROP TRIGGER IF EXISTS sublease_cards_sublease_insert_trigger ON subleases;
+    DROP TRIGGER IF EXISTS sublease_cards_sublease_update_trigger ON subleases;
+    DROP TRIGGER IF EXISTS sublease_cards_property_trigger ON properties;
+    DROP TRIGGER IF EXISTS sublease_cards_image_insert_trigger ON property_images;
+    DROP TRIGGER IF EXISTS sublease_cards_image_update_trigger ON property_images;
+    DROP TRIGGER IF EXISTS sublease_cards_image_delete_trigger ON property_images;
+    DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users;
+    DROP FUNCTION IF EXISTS sublease_cards_image_changed();
+
+    CREATE OR REPLACE FUNCTION sublease_cards_sublease_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM sublease_cards_refresh(ARRAY[NEW.sublease_id]);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER sublease_cards_sublease_trigger
+        AFTER INSERT OR UPDATE ON subleases
+        FOR EACH ROW EXECUTE FUNCTION sublease_cards_sublease_changed();
+
+    CREATE OR REPLACE FUNCTION sublease_cards_property_changed() RETURNS trigger AS $$
+    DECLARE
+        changed uuid := CASE WHEN TG_OP = 'DELETE' THEN OLD.property_id ELSE NEW.property_id END;
+    BEGIN
+        PERFORM sublease_cards_refresh(ARRAY(
+            SELECT sublease_id FROM subleases WHERE property_id = changed AND status = 'active'
+        ));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER sublease_cards_property_trigger
+        AFTER UPDATE OF title, property_type, city, state, square_feet, amenities, latitude, longitude ON properties
+        FOR EACH ROW EXECUTE FUNCTION sublease_cards_property_changed();
+
+    CREATE TRIGGER sublease_cards_image_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON property_images
+        FOR EACH ROW EXECUTE FUNCTION sublease_cards_property_changed();
+
+    CREATE OR REPLACE FUNCTION sublease_cards_lessor_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM sublease_cards_refresh(ARRAY(
+            SELECT sublease_id FROM subleases WHERE lessor_id = NEW.user_id AND status = 'active'
+        ));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER sublease_cards_lessor_trigger
+        AFTER UPDATE OF first_name, last_name, profile_image_url, average_rating, total_ratings, reputation_score
+        ON users
+        FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed();
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(DOWNGRADE_SQL)
@@ -0,0 +1,186 @@
+"""add_user_rating_aggregates
+
+Revision ID: b4d6f8a0c2e3
+Revises: 9a1c3e5b7d24
+Create Date: 2026-10-19 18:31:07.842163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d6f8a0c2e3'
+down_revision: Union[str, None] = '9a1c3e5b7d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAR_COLUMNS = [f'rating_{star}_count' for star in range(1, 6)]
+
+# Card refresh with the lessor's rating columns and join left to fill in
+REFRESH_SQL = """
+    CREATE OR REPLACE FUNCTION sublease_cards_refresh(ids uuid[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO sublease_cards (
+            sublease_id, property_id, lessor_id, title, rate, minimum_stay_days, maximum_stay_days,
+            available_from, available_until, search_vector, created_at,
+            property_title, property_type, city, state, square_feet, amenities, latitude, longitude,
+            image_url, image_blurhash, image_dominant_color,
+            lessor_first_name, lessor_last_name, lessor_profile_image_url,
+            lessor_average_rating, lessor_total_ratings
+        )
+        SELECT
+            s.sublease_id, s.property_id, s.lessor_id, s.title, s.rate, s.minimum_stay_days, s.maximum_stay_days,
+            s.available_from, s.available_until, s.search_vector, s.created_at,
+            p.title, p.property_type, p.city, p.state, p.square_feet, p.amenities, p.latitude, p.longitude,
+            img.image_url, img.blurhash, img.dominant_color,
+            u.first_name, u.last_name, u.profile_image_url,
+            {ratings}
+        FROM subleases s
+        JOIN properties p ON p.property_id = s.property_id
+        JOIN users u ON u.user_id = s.lessor_id
+        LEFT JOIN LATERAL (
+            SELECT i.image_url, i.blurhash, i.dominant_color
+            FROM property_images i
+            WHERE i.property_id = s.property_id
+            ORDER BY i.is_primary IS TRUE DESC, i.image_order, i.created_at
+            LIMIT 1
+        ) img ON true
+        {ratings_join}
+        WHERE s.sublease_id = ANY(ids) AND s.status = 'active'
+        ON CONFLICT (sublease_id) DO UPDATE SET
+            property_id = EXCLUDED.property_id, lessor_id = EXCLUDED.lessor_id, title = EXCLUDED.title,
+            rate = EXCLUDED.rate, minimum_stay_days = EXCLUDED.minimum_stay_days,
+            maximum_stay_days = EXCLUDED.maximum_stay_days, available_from = EXCLUDED.available_from,
+            available_until = EXCLUDED.available_until, search_vector = EXCLUDED.search_vector,
+            created_at = EXCLUDED.created_at, property_title = EXCLUDED.property_title,
+            property_type = EXCLUDED.property_type, city = EXCLUDED.city, state = EXCLUDED.state,
+            square_feet = EXCLUDED.square_feet, amenities = EXCLUDED.amenities, latitude = EXCLUDED.latitude,
+            longitude = EXCLUDED.longitude, image_url = EXCLUDED.image_url,
+            image_blurhash = EXCLUDED.image_blurhash, image_dominant_color = EXCLUDED.image_dominant_color,
+            lessor_first_name = EXCLUDED.lessor_first_name, lessor_last_name = EXCLUDED.lessor_last_name,
+            lessor_profile_image_url = EXCLUDED.lessor_profile_image_url,
+            lessor_average_rating = EXCLUDED.lessor_average_rating,
+            lessor_total_ratings = EXCLUDED.lessor_total_ratings,
+            refreshed_at = now();
+
+        DELETE FROM sublease_cards c
+        WHERE c.sublease_id = ANY(ids)
+          AND c.sublease_id NOT IN (
+              SELECT sublease_id FROM subleases WHERE sublease_id = ANY(ids) AND status = 'active'
+          );
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+REBUILD_CARDS_SQL = (
+    "SELECT sublease_cards_refresh(ARRAY(SELECT sublease_id FROM subleases WHERE status = 'active'))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ['rating_sum', *STAR_COLUMNS]:
+        op.add_column('users', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+    op.execute("UPDATE users SET total_ratings = 0 WHERE total_ratings IS NULL")
+    op.alter_column('users', 'total_ratings', server_default='0', nullable=False)
+
+    # Backfill from the ratings; average_rating and total_ratings were never maintained
+    op.execute("""
+        UPDATE users u SET
+            total_ratings = r.total_ratings,
+            rating_sum = r.rating_sum,
+            average_rating = CAST(r.rating_sum AS NUMERIC) / r.total_ratings,
+            rating_1_count = r.rating_1_count,
+            rating_2_count = r.rating_2_count,
+            rating_3_count = r.rating_3_count,
+            rating_4_count = r.rating_4_count,
+            rating_5_count = r.rating_5_count
+        FROM (
+            SELECT
+                rated_user_id,
+                count(*) AS total_ratings,
+                sum(rating) AS rating_sum,
+                count(*) FILTER (WHERE rating = 1) AS rating_1_count,
+                count(*) FILTER (WHERE rating = 2) AS rating_2_count,
+                count(*) FILTER (WHERE rating = 3) AS rating_3_count,
+                count(*) FILTER (WHERE rating = 4) AS rating_4_count,
+                count(*) FILTER (WHERE rating = 5) AS rating_5_count
+            FROM user_ratings
+            GROUP BY rated_user_id
+        ) r
+        WHERE u.user_id = r.rated_user_id
+    """)
+    op.execute("UPDATE users SET average_rating = NULL WHERE total_ratings = 0")
+
+    # Cards read the lessor's aggregates instead of aggregating ratings, and
+    # rating changes reach them through the aggregate columns
+    op.execute(REFRESH_SQL.format(ratings="u.average_rating::float8, u.total_ratings", ratings_join=""))
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_rating_trigger ON user_ratings")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sublease_cards_lessor_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM sublease_cards_refresh(ARRAY(
+                SELECT sublease_id FROM subleases WHERE lessor_id = NEW.user_id AND status = 'active'
+            ));
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users")
+    op.execute("""
+        CREATE TRIGGER sublease_cards_lessor_trigger
+            AFTER UPDATE OF first_name, last_name, profile_image_url, average_rating, total_ratings ON users
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed()
+    """)
+    op.execute(REBUILD_CARDS_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(REFRESH_SQL.format(
+        ratings="r.average_rating, r.total_ratings",
+        ratings_join="""CROSS JOIN LATERAL (
+            SELECT avg(ur.rating)::float8 AS average_rating, count(*) AS total_ratings
+            FROM user_ratings ur
+            WHERE ur.rated_user_id = s.lessor_id
+        ) r"""
+    ))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sublease_cards_lessor_changed() RETURNS trigger AS $$
+        DECLARE
+            changed uuid;
+        BEGIN
+            IF TG_TABLE_NAME = 'users' THEN
+                changed := NEW.user_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                changed := OLD.rated_user_id;
+            ELSE
+                changed := NEW.rated_user_id;
+            END IF;
+
+            PERFORM sublease_cards_refresh(ARRAY(
+                SELECT sublease_id FROM subleases WHERE lessor_id = changed AND status = 'active'
+            ));
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users")
+    op.execute("""
+        CREATE TRIGGER sublease_cards_lessor_trigger
+            AFTER UPDATE OF first_name, last_name, profile_image_url ON users
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER sublease_cards_rating_trigger
+            AFTER INSERT OR UPDATE OF rating OR DELETE ON user_ratings
+            FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed()
+    """)
+    op.execute(REBUILD_CARDS_SQL)
+
+    op.alter_column('users', 'total_ratings', server_default=None, nullable=True)
+    for column in reversed(['rating_sum', *STAR_COLUMNS]):
+        op.drop_column('users', column)
@@ -0,0 +1,77 @@
+"""add_sublease_search_vector
+
+Revision ID: c6e8a0b2d4f5
+Revises: 5a7c9e1f3b24
+Create Date: 2026-10-19 12:40:05.117842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e8a0b2d4f5'
+down_revision: Union[str, None] = '5a7c9e1f3b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('subleases', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION subleases_search_vector_update() RETURNS trigger AS $$
+        DECLARE
+            prop record;
+        BEGIN
+            SELECT title, description, address_line1, address_line2, city, state
+            INTO prop FROM properties WHERE property_id = NEW.property_id;
+
+            NEW.search_vector :=
+                setweight(to_tsvector('english', concat_ws(' ', NEW.title, prop.title)), 'A') ||
+                setweight(to_tsvector('english', concat_ws(' ', NEW.description, prop.description)), 'B') ||
+                setweight(to_tsvector('english', concat_ws(' ', prop.address_line1, prop.address_line2, prop.city, prop.state)), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER subleases_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, description, property_id ON subleases
+            FOR EACH ROW EXECUTE FUNCTION subleases_search_vector_update()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION properties_search_vector_propagate() RETURNS trigger AS $$
+        BEGIN
+            UPDATE subleases SET title = title WHERE property_id = NEW.property_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER properties_search_vector_trigger
+            AFTER UPDATE OF title, description, address_line1, address_line2, city, state ON properties
+            FOR EACH ROW EXECUTE FUNCTION properties_search_vector_propagate()
+    """)
+
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE subleases SET title = title")
+
+    op.create_index(
+        'ix_subleases_search_vector', 'subleases', ['search_vector'], unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subleases_search_vector', table_name='subleases', postgresql_using='gin')
+    op.execute("DROP TRIGGER IF EXISTS properties_search_vector_trigger ON properties")
+    op.execute("DROP FUNCTION IF EXISTS properties_search_vector_propagate()")
+    op.execute("DROP TRIGGER IF EXISTS subleases_search_vector_trigger ON subleases")
+    op.execute("DROP FUNCTION IF EXISTS subleases_search_vector_update()")
+    op.drop_column('subleases', 'search_vector')
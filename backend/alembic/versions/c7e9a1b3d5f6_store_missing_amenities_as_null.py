@@ -0,0 +1,31 @@
+"""store_missing_amenities_as_null
+
+Revision ID: c7e9a1b3d5f6
+Revises: a3c5e7f9b1d4
+Create Date: 2026-10-20 10:02:17.645093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e9a1b3d5f6'
+down_revision: Union[str, None] = 'a3c5e7f9b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Properties created without amenities stored a JSON null; the card
+    # trigger carries the change over to sublease_cards
+    op.execute("UPDATE properties SET amenities = NULL WHERE jsonb_typeof(amenities) = 'null'")
+    op.execute("UPDATE sublease_cards SET amenities = NULL WHERE jsonb_typeof(amenities) = 'null'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # SQL NULL is what the column should have held all along; nothing to undo
+    pass
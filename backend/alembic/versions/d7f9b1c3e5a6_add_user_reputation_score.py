@@ -0,0 +1,113 @@
+"""add_user_reputation_score
+
+Revision ID: d7f9b1c3e5a6
+Revises: b4d6f8a0c2e3
+Create Date: 2026-10-19 19:12:44.207318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f9b1c3e5a6'
+down_revision: Union[str, None] = 'b4d6f8a0c2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Card refresh with the optional reputation column left to fill in
+REFRESH_SQL = """
+    CREATE OR REPLACE FUNCTION sublease_cards_refresh(ids uuid[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO sublease_cards (
+            sublease_id, property_id, lessor_id, title, rate, minimum_stay_days, maximum_stay_days,
+            available_from, available_until, search_vector, created_at,
+            property_title, property_type, city, state, square_feet, amenities, latitude, longitude,
+            image_url, image_blurhash, image_dominant_color,
+            lessor_first_name, lessor_last_name, lessor_profile_image_url,
+            lessor_average_rating, lessor_total_ratings{reputation_column}
+        )
+        SELECT
+            s.sublease_id, s.property_id, s.lessor_id, s.title, s.rate, s.minimum_stay_days, s.maximum_stay_days,
+            s.available_from, s.available_until, s.search_vector, s.created_at,
+            p.title, p.property_type, p.city, p.state, p.square_feet, p.amenities, p.latitude, p.longitude,
+            img.image_url, img.blurhash, img.dominant_color,
+            u.first_name, u.last_name, u.profile_image_url,
+            u.average_rating::float8, u.total_ratings{reputation_value}
+        FROM subleases s
+        JOIN properties p ON p.property_id = s.property_id
+        JOIN users u ON u.user_id = s.lessor_id
+        LEFT JOIN LATERAL (
+            SELECT i.image_url, i.blurhash, i.dominant_color
+            FROM property_images i
+            WHERE i.property_id = s.property_id
+            ORDER BY i.is_primary IS TRUE DESC, i.image_order, i.created_at
+            LIMIT 1
+        ) img ON true
+        WHERE s.sublease_id = ANY(ids) AND s.status = 'active'
+        ON CONFLICT (sublease_id) DO UPDATE SET
+            property_id = EXCLUDED.property_id, lessor_id = EXCLUDED.lessor_id, title = EXCLUDED.title,
+            rate = EXCLUDED.rate, minimum_stay_days = EXCLUDED.minimum_stay_days,
+            maximum_stay_days = EXCLUDED.maximum_stay_days, available_from = EXCLUDED.available_from,
+            available_until = EXCLUDED.available_until, search_vector = EXCLUDED.search_vector,
+            created_at = EXCLUDED.created_at, property_title = EXCLUDED.property_title,
+            property_type = EXCLUDED.property_type, city = EXCLUDED.city, state = EXCLUDED.state,
+            square_feet = EXCLUDED.square_feet, amenities = EXCLUDED.amenities, latitude = EXCLUDED.latitude,
+            longitude = EXCLUDED.longitude, image_url = EXCLUDED.image_url,
+            image_blurhash = EXCLUDED.image_blurhash, image_dominant_color = EXCLUDED.image_dominant_color,
+            lessor_first_name = EXCLUDED.lessor_first_name, lessor_last_name = EXCLUDED.lessor_last_name,
+            lessor_profile_image_url = EXCLUDED.lessor_profile_image_url,
+            lessor_average_rating = EXCLUDED.lessor_average_rating,
+            lessor_total_ratings = EXCLUDED.lessor_total_ratings,{reputation_update}
+            refreshed_at = now();
+
+        DELETE FROM sublease_cards c
+        WHERE c.sublease_id = ANY(ids)
+          AND c.sublease_id NOT IN (
+              SELECT sublease_id FROM subleases WHERE sublease_id = ANY(ids) AND status = 'active'
+          );
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+LESSOR_TRIGGER_SQL = """
+    CREATE TRIGGER sublease_cards_lessor_trigger
+        AFTER UPDATE OF first_name, last_name, profile_image_url, average_rating, total_ratings{reputation_column}
+        ON users
+        FOR EACH ROW EXECUTE FUNCTION sublease_cards_lessor_changed()
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Scores are filled in by the first recompute_reputation_scores run
+    op.add_column('users', sa.Column('reputation_score', sa.Float(), server_default='0', nullable=False))
+    op.add_column(
+        'sublease_cards', sa.Column('lessor_reputation_score', sa.Float(), server_default='0', nullable=False)
+    )
+    op.alter_column('sublease_cards', 'lessor_reputation_score', server_default=None)
+    op.create_index(
+        'ix_sublease_cards_reputation_id', 'sublease_cards', ['lessor_reputation_score', 'sublease_id'],
+        unique=False
+    )
+
+    op.execute(REFRESH_SQL.format(
+        reputation_column=", lessor_reputation_score",
+        reputation_value=", u.reputation_score",
+        reputation_update="\n            lessor_reputation_score = EXCLUDED.lessor_reputation_score,"
+    ))
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users")
+    op.execute(LESSOR_TRIGGER_SQL.format(reputation_column=", reputation_score"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS sublease_cards_lessor_trigger ON users")
+    op.execute(LESSOR_TRIGGER_SQL.format(reputation_column=""))
+    op.execute(REFRESH_SQL.format(reputation_column="", reputation_value="", reputation_update=""))
+
+    op.drop_index('ix_sublease_cards_reputation_id', table_name='sublease_cards')
+    op.drop_column('sublease_cards', 'lessor_reputation_score')
+    op.drop_column('users', 'reputation_score')
@@ -0,0 +1,42 @@
+"""add_property_coordinates
+
+Revision ID: e1f3a5c7b9d2
+Revises: c6e8a0b2d4f5
+Create Date: 2026-10-19 13:55:31.640279
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a5c7b9d2'
+down_revision: Union[str, None] = 'c6e8a0b2d4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+
+    op.add_column('properties', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('properties', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index(
+        'ix_properties_earth_location', 'properties',
+        [sa.text('ll_to_earth(latitude, longitude)')], unique=False, postgresql_using='gist'
+    )
+    op.create_index(
+        'ix_properties_latitude_longitude', 'properties', ['latitude', 'longitude'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_properties_latitude_longitude', table_name='properties')
+    op.drop_index('ix_properties_earth_location', table_name='properties', postgresql_using='gist')
+    op.drop_column('properties', 'longitude')
+    op.drop_column('properties', 'latitude')
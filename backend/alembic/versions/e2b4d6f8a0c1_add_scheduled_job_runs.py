@@ -0,0 +1,33 @@
+"""add_scheduled_job_runs
+
+Revision ID: e2b4d6f8a0c1
+Revises: c7e9a1b3d5f6
+Create Date: 2026-10-21 09:31:06.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b4d6f8a0c1'
+down_revision: Union[str, None] = 'c7e9a1b3d5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Last start time of each scheduled job, so workers run a job once per interval between them
+    op.create_table('scheduled_job_runs',
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('job_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduled_job_runs')
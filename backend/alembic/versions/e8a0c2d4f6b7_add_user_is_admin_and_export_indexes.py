@@ -0,0 +1,34 @@
+"""add_user_is_admin_and_export_indexes
+
+Revision ID: e8a0c2d4f6b7
+Revises: d7f9b1c3e5a6
+Create Date: 2026-10-19 20:05:38.514906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a0c2d4f6b7'
+down_revision: Union[str, None] = 'd7f9b1c3e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('is_admin', sa.Boolean(), server_default='false', nullable=False))
+
+    # Incremental exports scan from each row's last change
+    op.create_index('ix_subleases_changed_at', 'subleases', [sa.text('coalesce(updated_at, created_at)')])
+    op.create_index('ix_messages_changed_at', 'messages', [sa.text('coalesce(updated_at, created_at)')])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_changed_at', table_name='messages')
+    op.drop_index('ix_subleases_changed_at', table_name='subleases')
+    op.drop_column('users', 'is_admin')
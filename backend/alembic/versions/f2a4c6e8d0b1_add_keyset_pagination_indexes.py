@@ -0,0 +1,46 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: f2a4c6e8d0b1
+Revises: e1f3a5c7b9d2
+Create Date: 2026-10-19 15:08:52.374106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a4c6e8d0b1'
+down_revision: Union[str, None] = 'e1f3a5c7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_subleases_created_at_id', 'subleases', ['created_at', 'sublease_id'], unique=False)
+    op.create_index(
+        'ix_subleases_status_created_at_id', 'subleases', ['status', 'created_at', 'sublease_id'], unique=False
+    )
+    op.create_index('ix_subleases_status_rate_id', 'subleases', ['status', 'rate', 'sublease_id'], unique=False)
+    op.create_index(
+        'ix_subleases_status_available_from_id', 'subleases', ['status', 'available_from', 'sublease_id'],
+        unique=False
+    )
+    op.create_index('ix_properties_created_at_id', 'properties', ['created_at', 'property_id'], unique=False)
+    op.create_index(
+        'ix_properties_owner_created_at_id', 'properties', ['owner_id', 'created_at', 'property_id'], unique=False
+    )
+    op.create_index('ix_user_ratings_created_at_id', 'user_ratings', ['created_at', 'rating_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_ratings_created_at_id', table_name='user_ratings')
+    op.drop_index('ix_properties_owner_created_at_id', table_name='properties')
+    op.drop_index('ix_properties_created_at_id', table_name='properties')
+    op.drop_index('ix_subleases_status_available_from_id', table_name='subleases')
+    op.drop_index('ix_subleases_status_rate_id', table_name='subleases')
+    op.drop_index('ix_subleases_status_created_at_id', table_name='subleases')
+    op.drop_index('ix_subleases_created_at_id', table_name='subleases')
@@ -0,0 +1,122 @@
+"""
+Benchmark image serving: Starlette StaticFiles mount vs. StaticImagesMiddleware.
+
+Both variants are exercised in-process through httpx's ASGI transport with the
+same outer stack as production (Socket.IO ASGI app, CORS and the request limit
+middleware), so the numbers isolate the cost of the serving path itself.
+
+Usage:
+    uv run python scripts/benchmark_images.py [--requests 5000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+import socketio
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.main import CORS_OPTIONS, RequestLimitMiddleware  # noqa: E402
+from src.storage.backends import LocalStorage  # noqa: E402
+from src.storage.static import StaticImagesMiddleware  # noqa: E402
+
+IMAGE_KEY = "properties/benchmark.jpg"
+IMAGE_SIZE = 48 * 1024
+
+
+def build_app(root: str, fast_path: bool) -> socketio.ASGIApp:
+    """
+    Build an app with the production middleware stack serving ``root``.
+
+    Args:
+        root: Directory holding the benchmark image.
+        fast_path: Whether to put StaticImagesMiddleware in front of the stack.
+
+    Returns:
+        socketio.ASGIApp: Outermost ASGI app.
+    """
+    app = FastAPI()
+    app.add_middleware(CORSMiddleware, **CORS_OPTIONS)
+    app.add_middleware(RequestLimitMiddleware)
+    app.mount("/images", StaticFiles(directory=root), name="images")
+
+    inner = app
+    if fast_path:
+        inner = StaticImagesMiddleware(app, LocalStorage(root, signing_secret="benchmark"), CORS_OPTIONS)
+    return socketio.ASGIApp(socketio.AsyncServer(async_mode="asgi"), inner)
+
+
+async def run(app: socketio.ASGIApp, requests: int, concurrency: int, headers: dict) -> float:
+    """
+    Issue ``requests`` GETs for the benchmark image and return requests/sec.
+
+    Args:
+        app: ASGI app under test.
+        requests: Total number of requests.
+        concurrency: Number of concurrent workers.
+        headers: Request headers.
+
+    Returns:
+        float: Requests per second.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        per_worker = requests // concurrency
+
+        async def worker() -> None:
+            for _ in range(per_worker):
+                response = await client.get(f"/images/{IMAGE_KEY}", headers=headers)
+                assert response.status_code in (200, 206, 304), response.status_code
+
+        # Warm up
+        await client.get(f"/images/{IMAGE_KEY}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return per_worker * concurrency / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "properties"))
+        with open(os.path.join(root, IMAGE_KEY), "wb") as f:
+            f.write(os.urandom(IMAGE_SIZE))
+
+        baseline = build_app(root, fast_path=False)
+        fast = build_app(root, fast_path=True)
+
+        probe = httpx.AsyncClient(transport=httpx.ASGITransport(app=fast), base_url="http://bench")
+        etag = (await probe.get(f"/images/{IMAGE_KEY}")).headers["etag"]
+        await probe.aclose()
+
+        scenarios = {
+            "full GET": {},
+            "conditional GET (304)": {"If-None-Match": etag},
+            "range GET (4 KB)": {"Range": "bytes=0-4095"},
+        }
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {IMAGE_SIZE // 1024} KB image")
+        print(f"{'scenario':<24}{'StaticFiles':>14}{'fast path':>14}{'speedup':>10}")
+        for name, headers in scenarios.items():
+            before = await run(baseline, args.requests, args.concurrency, headers)
+            after = await run(fast, args.requests, args.concurrency, headers)
+            print(f"{name:<24}{before:>12.0f}/s{after:>12.0f}/s{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,247 @@
+"""
+Benchmark serializing a 100-item list page before and after the fast JSON path.
+
+"Before" converts rows the way the routers used to (validate every nested
+image and lessor, then the item built from them) and encodes the result
+through FastAPI's ``response_model`` path into a ``JSONResponse``. "After"
+converts rows in one ``from_attributes`` validation pass and encodes them
+either through the same FastAPI path into an ``ORJSONResponse`` or straight
+to bytes with ``TypeAdapter.dump_json``, as the list endpoints do. A last
+variant skips validation with ``model_construct``, for reference. Rows are
+in-memory ORM objects, so the numbers exclude the database. Every variant's
+output is checked to be identical.
+
+Usage:
+    uv run --extra orjson python scripts/benchmark_serialization.py [--pages 200] [--page-size 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import src.main  # noqa: E402,F401  (registers every mapper)
+from src.auth.models import User  # noqa: E402
+from src.properties.models import Property  # noqa: E402
+from src.properties.schemas import PropertyRead  # noqa: E402
+from src.properties.service import PropertiesService, normalize_amenities  # noqa: E402
+from src.propertyimages.models import PropertyImage  # noqa: E402
+from src.subleases.models import SubLease, SubLeaseStatus  # noqa: E402
+from src.subleases.router import _convert_sublease_to_read  # noqa: E402
+from src.subleases.schemas import LessorRead, PropertyImageRead, SubLeaseRead  # noqa: E402
+
+IMAGES_PER_PROPERTY = 5
+
+
+def make_rows(count: int) -> List[SubLease]:
+    """
+    Build subleases with their property, images and lessor, as a page query loads them.
+
+    Args:
+        count: Number of subleases.
+
+    Returns:
+        List[SubLease]: Transient rows.
+    """
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    rows = []
+    for i in range(count):
+        lessor = User(
+            user_id=uuid.uuid4(), first_name="Alex", last_name=f"Lessor {i}", email=f"lessor{i}@example.com",
+            phone_number="806-555-0100", average_rating=Decimal("4.25"), total_ratings=12, updated_at=now
+        )
+        prop = Property(
+            property_id=uuid.uuid4(), owner_id=lessor.user_id, title=f"Apartment {i}",
+            description="Two bedroom apartment close to campus. " * 4, property_type="apartment",
+            address_line1=f"{i} Main St", city="Lubbock", state="TX", country="USA", square_feet=850,
+            amenities=["wifi", "parking", "laundry"], latitude=33.58, longitude=-101.85,
+            created_at=now, updated_at=now
+        )
+        prop.images = [
+            PropertyImage(
+                image_id=uuid.uuid4(), property_id=prop.property_id, image_url=f"/images/properties/{i}-{n}.jpg",
+                image_name=f"{n}.jpg", image_size=48_000, image_order=n, is_primary=n == 0,
+                blurhash="LEHV6nWB2yk8pyo0adR*.7kCMdnj", dominant_color="#a1b2c3", created_at=now
+            )
+            for n in range(IMAGES_PER_PROPERTY)
+        ]
+        sublease = SubLease(
+            sublease_id=uuid.uuid4(), property_id=prop.property_id, lessor_id=lessor.user_id,
+            title=f"Summer sublease {i}", description="Furnished room, utilities included. " * 3,
+            rate=Decimal("725.00"), minimum_stay_days=30, maximum_stay_days=120,
+            available_from=date(2026, 5, 1), available_until=date(2026, 5, 1) + timedelta(days=120),
+            status="active", created_at=now
+        )
+        sublease.property = prop
+        sublease.lessor = lessor
+        rows.append(sublease)
+    return rows
+
+
+def legacy_sublease_read(sublease: SubLease) -> SubLeaseRead:
+    """The conversion the sublease router used before: nested schemas validated one by one."""
+    prop = sublease.property
+    return SubLeaseRead.model_validate({
+        "sublease_id": sublease.sublease_id,
+        "property_id": sublease.property_id,
+        "lessor_id": sublease.lessor_id,
+        "title": sublease.title,
+        "description": sublease.description,
+        "rate": sublease.rate,
+        "minimum_stay_days": sublease.minimum_stay_days,
+        "maximum_stay_days": sublease.maximum_stay_days,
+        "available_from": sublease.available_from,
+        "available_until": sublease.available_until,
+        "status": sublease.status,
+        "created_at": sublease.created_at,
+        "property_images": [PropertyImageRead.model_validate(image) for image in prop.images],
+        "primary_image": PropertyImageRead.model_validate(prop.primary_image),
+        "lessor": LessorRead.model_validate(sublease.lessor),
+        "latitude": prop.latitude,
+        "longitude": prop.longitude,
+    })
+
+
+def legacy_property_read(prop: Property) -> PropertyRead:
+    """The conversion the properties service used before: dictionaries, then validation."""
+    images = [
+        {
+            "image_id": str(img.image_id), "image_url": img.image_url, "image_name": img.image_name,
+            "is_primary": img.is_primary, "alt_text": img.alt_text, "image_size": img.image_size,
+            "blurhash": img.blurhash, "dominant_color": img.dominant_color, "created_at": img.created_at
+        }
+        for img in prop.images
+    ]
+    return PropertyRead.model_validate({
+        "property_id": prop.property_id, "title": prop.title, "description": prop.description,
+        "property_type": prop.property_type, "address_line1": prop.address_line1,
+        "address_line2": prop.address_line2, "city": prop.city, "state": prop.state, "country": prop.country,
+        "square_feet": prop.square_feet, "owner_id": prop.owner_id, "amenities": normalize_amenities(prop.amenities),
+        "latitude": prop.latitude, "longitude": prop.longitude, "created_at": prop.created_at,
+        "images": images or None, "primary_image": images[0] if images else None,
+    })
+
+
+def constructed_sublease_read(sublease: SubLease) -> SubLeaseRead:
+    """Build the item without validation, converting only what validation would have."""
+    prop = sublease.property
+    images = [PropertyImageRead.model_construct(**_columns(image, PropertyImageRead)) for image in prop.images]
+    values = _columns(sublease, SubLeaseRead)
+    values["status"] = SubLeaseStatus(values["status"])
+    lessor = _columns(sublease.lessor, LessorRead)
+    lessor["average_rating"] = float(lessor["average_rating"])
+    return SubLeaseRead.model_construct(**{
+        **values,
+        "property_images": images,
+        "primary_image": next(image for image in images if image.is_primary),
+        "lessor": LessorRead.model_construct(**lessor),
+        "latitude": prop.latitude,
+        "longitude": prop.longitude,
+    })
+
+
+def _columns(row: Any, schema: Any) -> dict:
+    return {name: getattr(row, name) for name in schema.model_fields if hasattr(type(row), name)}
+
+
+def fastapi_encoder(schema: Any, response_class: type) -> Callable[[List[Any]], bytes]:
+    """
+    Encode a list the way FastAPI does for an endpoint with ``response_model=List[schema]``.
+
+    Args:
+        schema: Item schema.
+        response_class: Response class rendering the serialized content.
+
+    Returns:
+        Callable[[List[Any]], bytes]: Encoder producing the response body.
+    """
+    field = create_model_field(name="Response", type_=List[schema], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def encode(items: List[Any]) -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+        return response_class(content).body
+
+    return encode
+
+
+def measure(convert: Callable[[Any], Any], encode: Callable[[List[Any]], bytes], rows: List[Any], pages: int):
+    """
+    Time converting and encoding one page, ``pages`` times.
+
+    Returns:
+        Tuple[float, float, bytes]: Median milliseconds converting and encoding a page, and the last body.
+    """
+    convert_times, encode_times = [], []
+    body = b""
+    for _ in range(pages):
+        started = time.perf_counter()
+        items = [convert(row) for row in rows]
+        converted = time.perf_counter()
+        body = encode(items)
+        encoded = time.perf_counter()
+        convert_times.append((converted - started) * 1000)
+        encode_times.append((encoded - converted) * 1000)
+    return statistics.median(convert_times), statistics.median(encode_times), body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    subleases = make_rows(args.page_size)
+    properties = [sublease.property for sublease in subleases]
+    properties_service = PropertiesService(None)
+    sublease_list = TypeAdapter(List[SubLeaseRead])
+    property_list = TypeAdapter(List[PropertyRead])
+
+    scenarios = [
+        ("subleases", subleases, [
+            ("before: validate + JSONResponse", legacy_sublease_read, fastapi_encoder(SubLeaseRead, JSONResponse)),
+            ("after: from_attributes + ORJSONResponse", _convert_sublease_to_read,
+             fastapi_encoder(SubLeaseRead, ORJSONResponse)),
+            ("after: from_attributes + dump_json", _convert_sublease_to_read, sublease_list.dump_json),
+            ("ref: model_construct + dump_json", constructed_sublease_read, sublease_list.dump_json),
+        ]),
+        ("properties", properties, [
+            ("before: validate + JSONResponse", legacy_property_read, fastapi_encoder(PropertyRead, JSONResponse)),
+            ("after: from_attributes + ORJSONResponse", properties_service.convert_property_to_read,
+             fastapi_encoder(PropertyRead, ORJSONResponse)),
+            ("after: from_attributes + dump_json", properties_service.convert_property_to_read,
+             property_list.dump_json),
+        ]),
+    ]
+
+    print(f"{args.page_size} items per page, median of {args.pages} pages, milliseconds per page")
+    print(f"{'variant':<44}{'convert':>10}{'encode':>10}{'total':>10}{'speedup':>10}")
+    for name, rows, variants in scenarios:
+        print(name)
+        baseline_total, baseline_body = None, None
+        for label, convert, encode in variants:
+            convert_ms, encode_ms, body = measure(convert, encode, rows, args.pages)
+            total = convert_ms + encode_ms
+            if baseline_total is None:
+                baseline_total, baseline_body = total, json.loads(body)
+            elif json.loads(body) != baseline_body:
+                raise SystemExit(f"{name}: '{label}' output differs from the baseline")
+            print(f"  {label:<42}{convert_ms:>10.2f}{encode_ms:>10.2f}{total:>10.2f}{baseline_total / total:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Check that hot service queries use indexes on a seeded dataset.
+
+The script creates a scratch schema and builds the tables with the model
+metadata, so it includes every index the models declare. It seeds enough rows
+that the planner prefers indexes wherever they apply, then calls the real
+service read paths. Each SELECT they issue is captured and run again under
+``EXPLAIN (FORMAT JSON)``. If any plan contains a sequential scan of a seeded
+table, the script prints that plan and exits non-zero. Run it after adding or
+changing a service query; without the right index the query fails here.
+
+Requires a Postgres database with the cube/earthdistance extensions available.
+
+Usage:
+    uv run python scripts/check_query_plans.py [--database-url URL] [--scale 1.0] [--keep]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.auth.models import User  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.database import Base  # noqa: E402
+from src.messages.models import Conversation, Message, MessageRead  # noqa: E402
+from src.messages.service import MessagesService  # noqa: E402
+from src.properties.models import Property  # noqa: E402
+from src.properties.service import PropertiesService  # noqa: E402
+from src.propertyimages.models import PropertyImage  # noqa: E402
+from src.propertyimages.service import PropertyImageService  # noqa: E402
+from src.subleases.models import SubLease, SubLeaseCard, SubLeaseStatus  # noqa: E402
+from src.subleases.schemas import SubLeaseFilters, SubLeaseSort  # noqa: E402
+from src.subleases.service import SubLeaseService  # noqa: E402
+from src.userratings.models import UserRating  # noqa: E402
+from src.userratings.schemas import UserRatingFilters  # noqa: E402
+from src.userratings.service import UserRatingService  # noqa: E402
+from src.userratings.tasks import repair_rating_aggregates  # noqa: E402
+
+SCHEMA = "query_plan_check"
+
+# Row counts at --scale 1.0
+ROWS = {
+    "users": 20_000,
+    "properties": 10_000,
+    "subleases": 40_000,
+    "user_ratings": 60_000,
+    "messages": 200_000,
+    "conversations": 20_000,
+}
+
+CHECKED_TABLES = {
+    model.__tablename__
+    for model in (
+        User, Property, PropertyImage, SubLease, SubLeaseCard, UserRating, Message, Conversation, MessageRead
+    )
+}
+
+# Seed data uses deterministic ids, md5('<table><n>')::uuid, so rows can
+# reference each other without lookups.
+SEED_SQL = """
+INSERT INTO users (user_id, email, first_name, last_name, password_hash, total_ratings, is_active)
+SELECT md5('user' || i)::uuid, 'user' || i || '@example.com', 'First' || i, 'Last' || i, 'x', 0, true
+FROM generate_series(1, :users) AS i;
+
+INSERT INTO properties (
+    property_id, title, description, property_type, address_line1, city, state, country,
+    square_feet, latitude, longitude, owner_id, amenities, created_at
+)
+SELECT
+    md5('property' || i)::uuid, 'Property ' || i, 'Seeded property',
+    (ARRAY['apartment', 'house', 'condo', 'townhouse'])[1 + i % 4],
+    i || ' Main St', 'City' || (i % 200), 'State' || (i % 50), 'US',
+    400 + (i * 37) % 2000, 25 + random() * 20, -120 + random() * 40,
+    md5('user' || (1 + i % :users))::uuid,
+    jsonb_build_array((ARRAY['wifi', 'parking', 'laundry', 'gym', 'pool'])[1 + i % 5]),
+    now() - (i || ' minutes')::interval
+FROM generate_series(1, :properties) AS i;
+
+INSERT INTO property_images (image_id, property_id, image_url, image_name, image_order, is_primary, created_at)
+SELECT
+    md5('image' || p || '-' || n)::uuid, md5('property' || p)::uuid,
+    '/images/' || p || '-' || n || '.jpg', p || '-' || n || '.jpg', n, n = 0, now()
+FROM generate_series(1, :properties) AS p, generate_series(0, 2) AS n;
+
+INSERT INTO subleases (
+    sublease_id, property_id, lessor_id, title, description, rate, minimum_stay_days,
+    available_from, available_until, status, created_at
+)
+SELECT
+    md5('sublease' || i)::uuid, md5('property' || (1 + i % :properties))::uuid,
+    md5('user' || (1 + (1 + i % :properties) % :users))::uuid,
+    (ARRAY['Quiet', 'Sunny', 'Spacious', 'Cozy'])[1 + i % 4] || ' room near campus ' || i,
+    'Furnished room with ' || (ARRAY['wifi', 'parking', 'a balcony'])[1 + i % 3],
+    300 + (i * 13) % 1500, 1 + i % 30,
+    :today + (i % 120), :today + (i % 120) + 30 + i % 200,
+    CASE WHEN i % 10 < 8 THEN 'active' ELSE 'rented' END,
+    now() - (i || ' minutes')::interval
+FROM generate_series(1, :subleases) AS i;
+
+INSERT INTO user_ratings (rating_id, sublease_id, rater_id, rated_user_id, rating, created_at)
+SELECT
+    md5('rating' || i)::uuid, md5('sublease' || (1 + i % :subleases))::uuid,
+    md5('user' || (1 + (i * 7) % :users))::uuid, md5('user' || (1 + i % :users))::uuid,
+    1 + i % 5, now() - (i || ' minutes')::interval
+FROM generate_series(1, :user_ratings) AS i;
+
+INSERT INTO conversations (conversation_id, user1_id, user2_id, last_message_at, created_at)
+SELECT
+    md5('conversation' || i)::uuid, md5('user' || (1 + i % :users))::uuid,
+    md5('user' || (1 + (i * 7 + 1) % :users))::uuid, now() - (i || ' minutes')::interval, now()
+FROM generate_series(1, :conversations) AS i;
+
+INSERT INTO messages (message_id, sender_id, receiver_id, content, created_at)
+SELECT
+    md5('message' || i)::uuid,
+    md5('user' || CASE WHEN i % 2 = 0 THEN 1 + c % :users ELSE 1 + (c * 7 + 1) % :users END)::uuid,
+    md5('user' || CASE WHEN i % 2 = 0 THEN 1 + (c * 7 + 1) % :users ELSE 1 + c % :users END)::uuid,
+    'Message ' || i, now() - (i || ' seconds')::interval
+FROM generate_series(1, :messages) AS i, LATERAL (SELECT 1 + i % :conversations AS c) AS pair;
+
+INSERT INTO message_reads (read_id, message_id, user_id, read_at)
+SELECT md5('read' || id)::uuid, message_id, receiver_id, created_at
+FROM (SELECT row_number() OVER () AS id, message_id, receiver_id, created_at FROM messages) AS m
+WHERE id % 2 = 0;
+"""
+
+
+# Feed triggers refresh cards row by row; seeding builds them in one pass instead
+CARD_TRIGGERS = {
+    "subleases": "sublease_cards_sublease_trigger",
+    "properties": "sublease_cards_property_trigger",
+    "property_images": "sublease_cards_image_trigger",
+    "users": "sublease_cards_lessor_trigger",
+}
+BUILD_CARDS_SQL = (
+    "SELECT sublease_cards_refresh(ARRAY(SELECT sublease_id FROM subleases WHERE status = 'active'))"
+)
+
+
+def seeded_id(table: str, n: int) -> uuid.UUID:
+    """
+    Get the id of the ``n``-th seeded row of a table.
+
+    Args:
+        table: Seed prefix, e.g. ``user``.
+        n: 1-based row number.
+
+    Returns:
+        uuid.UUID: Row id.
+    """
+    return uuid.UUID(hashlib.md5(f"{table}{n}".encode()).hexdigest())
+
+
+def hot_queries(counts: Dict[str, int]) -> Dict[str, Callable[[Session], object]]:
+    """
+    Service calls whose queries must stay on indexes.
+
+    Args:
+        counts: Seeded row counts per table.
+
+    Returns:
+        Dict[str, Callable[[Session], object]]: Check name to service call.
+    """
+    # Conversation 41 is between users 42 and 1 + (41 * 7 + 1) % users
+    user = seeded_id("user", 42)
+    other = seeded_id("user", 1 + (41 * 7 + 1) % counts["users"])
+    prop = seeded_id("property", 42)
+    sublease = seeded_id("sublease", 42)
+
+    return {
+        "subleases: newest active page": lambda db: SubLeaseService(db).get_subleases_page(
+            status=SubLeaseStatus.ACTIVE, sort=SubLeaseSort.NEWEST, limit=20
+        ),
+        "subleases: cheapest active page": lambda db: SubLeaseService(db).get_subleases_page(
+            status=SubLeaseStatus.ACTIVE, sort=SubLeaseSort.PRICE_ASC, limit=20
+        ),
+        "subleases: text search": lambda db: SubLeaseService(db).search_subleases(
+            SubLeaseFilters(q="campus 4242"), status=SubLeaseStatus.ACTIVE, limit=20
+        ),
+        "subleases: city filter": lambda db: SubLeaseService(db).get_subleases_page(
+            SubLeaseFilters(city="city7", state="state7"), status=SubLeaseStatus.ACTIVE, limit=20
+        ),
+        "subleases: radius": lambda db: SubLeaseService(db).get_subleases_page(
+            SubLeaseFilters(latitude=35.0, longitude=-100.0, radius_km=5),
+            status=SubLeaseStatus.ACTIVE, limit=20
+        ),
+        "subleases: feed newest": lambda db: SubLeaseService(db).get_feed_page(limit=20),
+        "subleases: feed best lessors": lambda db: SubLeaseService(db).get_feed_page(
+            sort=SubLeaseSort.REPUTATION, limit=20
+        ),
+        "subleases: feed filtered": lambda db: SubLeaseService(db).get_feed_page(
+            SubLeaseFilters(city="city7", state="state7", min_rate=500), sort=SubLeaseSort.PRICE_ASC, limit=20
+        ),
+        "subleases: by lessor": lambda db: SubLeaseService(db).get_subleases_by_lessor(user),
+        "subleases: by property": lambda db: SubLeaseService(db).get_subleases_by_property(prop),
+        "subleases: detail": lambda db: SubLeaseService(db).get_sublease_by_id(sublease),
+        "properties: by owner": lambda db: PropertiesService(db).get_properties_page_by_owner(user, limit=20),
+        "property images: gallery": lambda db: PropertyImageService(db).get_images_by_property(prop),
+        "property images: primary": lambda db: PropertyImageService(db).get_primary_image(prop),
+        "ratings: received": lambda db: UserRatingService(db).get_ratings_page(
+            UserRatingFilters(rated_user_id=user), limit=20
+        ),
+        "ratings: given": lambda db: UserRatingService(db).get_ratings_page(
+            UserRatingFilters(rater_id=user), limit=20
+        ),
+        "ratings: for sublease": lambda db: UserRatingService(db).get_ratings_page(
+            UserRatingFilters(sublease_id=sublease), limit=20
+        ),
+        "ratings: stats": lambda db: UserRatingService(db).get_user_rating_stats(user),
+        "messages: conversation history": lambda db: MessagesService(db).get_conversation_messages(
+            user, other, limit=50
+        ),
+        "messages: conversation list": lambda db: MessagesService(db).get_user_conversations(user),
+        "messages: unread count": lambda db: MessagesService(db).get_unread_count(user, other),
+    }
+
+
+@contextmanager
+def capture_selects(engine: Engine) -> Iterator[List[Tuple[str, object]]]:
+    """
+    Record every SELECT executed on an engine.
+
+    Args:
+        engine: Engine to listen on.
+
+    Yields:
+        List[Tuple[str, object]]: Captured (statement, parameters) pairs.
+    """
+    captured: List[Tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def seq_scans(plan: dict) -> List[str]:
+    """
+    Find sequential scans of checked tables in a JSON plan.
+
+    Args:
+        plan: Plan node from ``EXPLAIN (FORMAT JSON)``.
+
+    Returns:
+        List[str]: Names of tables read with a sequential scan.
+    """
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def explain(engine: Engine, statement: str, parameters: object) -> dict:
+    """
+    Get the JSON plan for a captured statement.
+
+    Args:
+        engine: Engine to run on.
+        statement: SQL as sent to the driver.
+        parameters: Driver parameters.
+
+    Returns:
+        dict: Root plan node.
+    """
+    with engine.connect() as conn:
+        result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]["Plan"]
+
+
+def seed(engine: Engine, counts: Dict[str, int]) -> None:
+    """
+    Create the scratch schema, build the tables and seed them.
+
+    Args:
+        engine: Engine whose search_path starts with the scratch schema.
+        counts: Row counts per table.
+    """
+    params = dict(counts, today=date.today() - timedelta(days=30))
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        for table, trigger in CARD_TRIGGERS.items():
+            conn.execute(text(f"ALTER TABLE {table} DISABLE TRIGGER {trigger}"))
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                conn.execute(text(statement), params)
+    with Session(engine) as db:
+        repair_rating_aggregates(db)
+    with engine.begin() as conn:
+        for table, trigger in CARD_TRIGGERS.items():
+            conn.execute(text(f"ALTER TABLE {table} ENABLE TRIGGER {trigger}"))
+        conn.execute(text(BUILD_CARDS_SQL))
+        conn.exec_driver_sql("ANALYZE")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for seeded row counts")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema afterwards")
+    args = parser.parse_args()
+
+    engine = create_engine(
+        args.database_url,
+        connect_args={"options": f"-csearch_path={SCHEMA},public"}
+    )
+    counts = {name: max(int(count * args.scale), 100) for name, count in ROWS.items()}
+    checks = hot_queries(counts)
+    failures = 0
+    try:
+        seed(engine, counts)
+
+        for name, call in checks.items():
+            with Session(bind=engine) as db, capture_selects(engine) as captured:
+                call(db)
+
+            scanned = []
+            for statement, parameters in captured:
+                plan = explain(engine, statement, parameters)
+                tables = seq_scans(plan)
+                if tables:
+                    scanned.extend(tables)
+                    print(f"\n{name}: sequential scan of {', '.join(sorted(set(tables)))}\n{statement}")
+                    print(json.dumps(plan, indent=2))
+
+            status = "FAIL" if scanned else "ok"
+            failures += bool(scanned)
+            print(f"{status:<6}{name} ({len(captured)} queries)")
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        engine.dispose()
+
+    print(f"\n{failures} of {len(checks)} checks fell back to sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
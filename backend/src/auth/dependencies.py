@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from src.auth.models import User
 from src.auth.service import AuthService
 from src.database import get_db
+from src.exceptions import AuthorizationError
 
 
 security = HTTPBearer()
@@ -79,6 +80,26 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """
+    Get current user, requiring admin rights.
+    
+    Args:
+        current_user: Current active user.
+        
+    Returns:
+        User: Current admin user.
+        
+    Raises:
+        AuthorizationError: If the user is not an admin.
+    """
+    if not current_user.is_admin:
+        raise AuthorizationError("Admin access required")
+    return current_user
+
+
 async def get_current_user_from_token(token: str, db: Session) -> User | None:
     """
     Get current user from raw token string (for WebSocket authentication).
@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric, String, func
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, Numeric, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -26,12 +26,23 @@ class User(Base):
     profile_image_url = Column(String, nullable=True)
     date_of_birth = Column(DateTime, nullable=True)
     password_hash = Column(String, nullable=False)
+    # Rating aggregates, maintained by UserRatingService as ratings change and
+    # reconciled by the repair_rating_aggregates job
     average_rating = Column(Numeric, nullable=True)
-    total_ratings = Column(Integer, default=0)
+    total_ratings = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bayesian, recency-weighted score, recomputed by recompute_reputation_scores
+    reputation_score = Column(Float, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
     email_verified = Column(Boolean, default=False)
+    is_admin = Column(Boolean, nullable=False, default=False, server_default="false")
     
     properties = relationship("Property", back_populates="owner")
     subleases = relationship("SubLease", back_populates="lessor")
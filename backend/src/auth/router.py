@@ -2,7 +2,7 @@
 Authentication routers and endpoints.
 """
 from datetime import timedelta
-from typing import Any
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from pydantic import BaseModel
@@ -15,7 +15,8 @@ from src.auth.service import AuthService
 from src.config import settings
 from src.database import get_db
 from src.exceptions import ValidationError
-from src.utils.file_upload import upload_user_avatar
+from src.utils.cache import bump_version
+from src.utils.file_upload import AVATAR_DEFAULT_SIZE, delete_user_avatar, upload_user_avatar
 from src.utils.responses import error_response, success_response
 
 
@@ -35,6 +36,7 @@ class AvatarUploadResponse(BaseModel):
     Avatar upload response schema.
     """
     profile_image_url: str
+    sizes: Dict[int, str]
 
 
 @router.post("/register", response_model=Any)
@@ -170,18 +172,25 @@ async def upload_avatar(
         db: Database session.
         
     Returns:
-        Success response with avatar URL.
+        Success response with avatar URLs.
     """
     # Upload and process the avatar
-    avatar_url = await upload_user_avatar(current_user.user_id, file)
+    avatar_urls = await upload_user_avatar(current_user.user_id, file)
+    avatar_url = avatar_urls[AVATAR_DEFAULT_SIZE]
+    previous_url = current_user.profile_image_url
 
     # Update user's profile image URL in database
     _ = AuthService(db)
     current_user.profile_image_url = avatar_url
     db.commit()
+    bump_version(User.__tablename__)
     db.refresh(current_user)
 
-    upload_data = AvatarUploadResponse(profile_image_url=avatar_url)
+    # Old avatar URLs are versioned, so their files can go once nothing points at them
+    if previous_url and previous_url != avatar_url:
+        await delete_user_avatar(previous_url)
+
+    upload_data = AvatarUploadResponse(profile_image_url=avatar_url, sizes=avatar_urls)
 
     return success_response(
         data=upload_data,
@@ -13,6 +13,8 @@ from sqlalchemy.orm import Session
 from src.auth.models import User
 from src.auth.schemas import UserCreate, UserUpdate
 from src.config import settings
+from src.utils.cache import bump_version
+from src.utils.loaders import EntityLoader
 
 
 class AuthService:
@@ -100,17 +102,21 @@ class AuthService:
         except (JWTError, ExpiredSignatureError):
             return None
     
-    def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+    def get_user_by_id(self, user_id: Union[uuid.UUID, str]) -> Optional[User]:
         """
-        Get user by ID.
+        Get user by ID, reusing the copy already loaded in this session.
         
         Args:
-            user_id: User ID.
+            user_id: User ID, as a UUID or the token subject string.
             
         Returns:
             User: User object or None.
         """
-        return self.db.query(User).filter(User.user_id == user_id).first()
+        try:
+            user_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
+        except ValueError:
+            return None
+        return EntityLoader.for_session(self.db).load(User, user_id)
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         """
@@ -161,6 +167,7 @@ class AuthService:
             setattr(user, field, value)
         
         self.db.commit()
+        bump_version(User.__tablename__)
         self.db.refresh(user)
         
         return user
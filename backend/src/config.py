@@ -1,6 +1,8 @@
 """
 Global configuration settings for the application.
 """
+from typing import Optional
+
 from pydantic import ConfigDict, PostgresDsn
 from pydantic_settings import BaseSettings
 
@@ -9,7 +11,7 @@ class Config(BaseSettings):
     """
     Global application configuration.
     """
-    model_config = ConfigDict(env_file=".env")
+    model_config = ConfigDict(env_file=".env", extra="ignore")
     
     DATABASE_URL: PostgresDsn
     SECRET_KEY: str
@@ -21,6 +23,13 @@ class Config(BaseSettings):
     MAX_TOTAL_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50 MB total
     MAX_FILES_PER_UPLOAD: int = 10  # Maximum number of files per upload
     UPLOAD_DIR: str = "uploads"
+    IMAGE_PROCESS_WORKERS: int = 2  # Worker processes for image decoding/encoding
+    SCHEDULER_ENABLED: bool = True  # Run periodic background jobs in this process
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory", "redis" or "none"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024  # Responses kept in each process
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+    JSON_RESPONSE_CLASS: str = "default"  # "default" or "orjson" (needs the orjson extra)
 
 
 settings = Config()
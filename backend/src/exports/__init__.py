@@ -0,0 +1,6 @@
+"""
+Exports domain package.
+"""
+from .router import router
+
+__all__ = ["router"]
@@ -0,0 +1,21 @@
+"""
+Exports configuration.
+"""
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+
+class ExportConfig(BaseSettings):
+    """
+    Export configuration settings.
+    """
+    model_config = ConfigDict(env_file=".env", env_prefix="EXPORT_", extra="ignore")
+
+    BATCH_SIZE: int = 1000  # Rows fetched from the server-side cursor and written per chunk
+    GZIP_LEVEL: int = 6  # Compression level when the client accepts gzip
+    # How far behind the database clock watermarks are set; must exceed the longest
+    # write transaction plus any clock skew between API hosts and the database
+    WATERMARK_LAG_SECONDS: int = 300
+
+
+export_config = ExportConfig()
@@ -0,0 +1,17 @@
+"""
+Exports domain schemas.
+"""
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Output formats for exports."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportDataset(str, Enum):
+    """Tables that can be exported."""
+    RATINGS = "ratings"
+    SUBLEASES = "subleases"
+    MESSAGES = "messages"
@@ -0,0 +1,255 @@
+"""
+Exports domain service.
+
+Exports stream whole tables (or the rows changed since a watermark) straight
+from a server-side cursor: rows are fetched ``EXPORT_BATCH_SIZE`` at a time,
+encoded and handed to the response before the next batch is read, so memory
+stays flat however large the table is.
+
+Each export covers ``since <= changed_at < watermark`` and returns the
+watermark to the client; passing it back as ``since`` on the next pull picks
+up where this one stopped. Change times are stamped when a row is flushed,
+but the row only becomes visible when its transaction commits, and some are
+stamped by the API hosts' clocks rather than the database's. So the
+watermark is the database's clock minus ``EXPORT_WATERMARK_LAG_SECONDS``:
+rows stamped before it are assumed committed by the time the export reads
+them. A row whose transaction stays open longer than the lag can still be
+missed by incremental pulls.
+Ratings have no update timestamp, so their exports follow ``created_at`` and
+edits to older ratings only show up in full exports.
+"""
+import csv
+import io
+import json
+import uuid
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import Column, ColumnElement, Table, func, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.exports.config import export_config
+from src.exports.schemas import ExportDataset, ExportFormat
+from src.messages.models import Message
+from src.subleases.models import SubLease
+from src.userratings.models import UserRating
+
+
+class ExportSpec(NamedTuple):
+    """
+    What an export reads: a table and the time each row last changed.
+    """
+    table: Table
+    changed_at: ColumnElement  # Backed by an index, so watermarked pulls are range scans
+    key: Column
+
+
+EXPORTS = {
+    ExportDataset.RATINGS: ExportSpec(UserRating.__table__, UserRating.created_at, UserRating.rating_id),
+    ExportDataset.SUBLEASES: ExportSpec(
+        SubLease.__table__, func.coalesce(SubLease.updated_at, SubLease.created_at), SubLease.sublease_id
+    ),
+    ExportDataset.MESSAGES: ExportSpec(
+        Message.__table__, func.coalesce(Message.updated_at, Message.created_at), Message.message_id
+    ),
+}
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def export_columns(table: Table) -> List[Column]:
+    """
+    Get the columns of a table worth exporting.
+
+    Search vectors and generated columns are derived from the others.
+
+    Args:
+        table: Exported table.
+
+    Returns:
+        List[Column]: Columns in table order.
+    """
+    return [
+        column for column in table.columns
+        if column.computed is None and not isinstance(column.type, TSVECTOR)
+    ]
+
+
+def export_watermark(db: Session) -> datetime:
+    """
+    Get the watermark for an export starting now.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        datetime: Naive UTC time from the database clock, minus the safety lag.
+    """
+    now = db.execute(select(func.timezone("UTC", func.now()))).scalar_one()
+    return now - timedelta(seconds=export_config.WATERMARK_LAG_SECONDS)
+
+
+def utc_naive(timestamp: datetime) -> datetime:
+    """
+    Convert a timestamp to the naive UTC stored in the database.
+
+    Args:
+        timestamp: Naive (assumed UTC) or aware timestamp.
+
+    Returns:
+        datetime: Naive UTC timestamp.
+    """
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def iter_batches(
+    dataset: ExportDataset,
+    until: datetime,
+    since: Optional[datetime] = None,
+    batch_size: Optional[int] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream the rows of an export in batches from a server-side cursor.
+
+    Opens its own session, since the response body is produced after the
+    request's session has been closed.
+
+    Args:
+        dataset: Table to export.
+        until: Watermark; rows changed at or after it are left out.
+        since: Previous watermark; rows changed before it are left out.
+        batch_size: Rows fetched per round trip.
+
+    Yields:
+        List[Dict[str, Any]]: Rows of one batch, ordered by change time.
+    """
+    spec = EXPORTS[dataset]
+    query = select(*export_columns(spec.table)).where(spec.changed_at < until)
+    if since is not None:
+        query = query.where(spec.changed_at >= since)
+    query = query.order_by(spec.changed_at, spec.key).execution_options(
+        yield_per=batch_size or export_config.BATCH_SIZE
+    )
+
+    db = SessionLocal()
+    try:
+        for rows in db.execute(query).mappings().partitions():
+            yield [dict(row) for row in rows]
+    finally:
+        db.close()
+
+
+def encode_ndjson(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """
+    Encode batches as newline-delimited JSON, one object per row.
+
+    Args:
+        batches: Row batches.
+
+    Yields:
+        bytes: Encoded lines of one batch.
+    """
+    for rows in batches:
+        yield "".join(
+            json.dumps(row, default=_json_default, separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+
+def encode_csv(columns: List[str], batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """
+    Encode batches as CSV with a header row.
+
+    Args:
+        columns: Column names, in output order.
+        batches: Row batches.
+
+    Yields:
+        bytes: Encoded header, then the lines of one batch at a time.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows([_csv_value(row[column]) for column in columns] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Compress a byte stream into a gzip stream as it is produced.
+
+    Args:
+        chunks: Uncompressed chunks.
+        level: Compression level.
+
+    Yields:
+        bytes: Compressed chunks.
+    """
+    compressor = zlib.compressobj(
+        export_config.GZIP_LEVEL if level is None else level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(
+    dataset: ExportDataset,
+    export_format: ExportFormat,
+    until: datetime,
+    since: Optional[datetime] = None,
+    gzip: bool = False
+) -> Iterator[bytes]:
+    """
+    Build the response body of an export.
+
+    Nothing is read until the body is iterated.
+
+    Args:
+        dataset: Table to export.
+        export_format: Output format.
+        until: Watermark of this export.
+        since: Watermark of the previous export, for incremental pulls.
+        gzip: Whether to gzip the body.
+
+    Returns:
+        Iterator[bytes]: Body chunks.
+    """
+    batches = iter_batches(dataset, until, since)
+    if export_format == ExportFormat.CSV:
+        columns = [column.name for column in export_columns(EXPORTS[dataset].table)]
+        body = encode_csv(columns, batches)
+    else:
+        body = encode_ndjson(batches)
+    return gzip_stream(body) if gzip else body
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default, separators=(",", ":"))
+    return value
@@ -0,0 +1,6 @@
+"""
+Imports domain package.
+"""
+from .router import router
+
+__all__ = ["router"]
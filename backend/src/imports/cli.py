@@ -0,0 +1,71 @@
+"""
+Bulk import of listings from the command line.
+
+Runs the same import as ``POST /imports/listings`` without its row and
+archive size limits, for onboarding runs too large for one request.
+
+Cached API responses are invalidated only with ``RESPONSE_CACHE_BACKEND=redis``;
+with the in-process ``memory`` cache, API workers list the new listings after
+``RESPONSE_CACHE_TTL_SECONDS``.
+
+Usage:
+    python -m src.imports.cli manifest.csv images.zip --owner-email manager@example.com [--batch-size 100]
+"""
+import argparse
+import asyncio
+import logging
+import zipfile
+
+from src.auth.models import User
+from src.config import settings
+from src.database import SessionLocal
+from src.imports.config import import_config
+from src.imports.service import BulkImportService, parse_manifest
+from src.utils.cache import invalidates_other_processes
+from src.utils.image_processing import shutdown_process_pool
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import listings from a manifest and an image archive.")
+    parser.add_argument("manifest", help="Path to the CSV or JSON manifest")
+    parser.add_argument("archive", nargs="?", help="Path to the zip of images")
+    parser.add_argument("--owner-email", required=True, help="Email of the user who will own the listings")
+    parser.add_argument("--batch-size", type=int, default=import_config.BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.manifest, "rb") as f:
+        rows = parse_manifest(args.manifest, f.read())
+
+    db = SessionLocal()
+    archive = zipfile.ZipFile(args.archive) if args.archive else None
+    try:
+        owner = db.query(User).filter(User.email == args.owner_email).first()
+        if owner is None:
+            parser.error(f"No user with email {args.owner_email}")
+        report = asyncio.run(
+            BulkImportService(db).import_listings(owner.user_id, rows, archive, args.batch_size)
+        )
+    finally:
+        if archive is not None:
+            archive.close()
+        db.close()
+        shutdown_process_pool()
+
+    for error in report.errors:
+        logger.warning(f"Row {error.row}: {'; '.join(error.errors)}")
+    logger.info(
+        f"Imported {report.properties_created} of {report.total_rows} listings "
+        f"({report.images_created} images, {report.subleases_created} subleases)"
+    )
+    if report.properties_created and not invalidates_other_processes():
+        logger.warning(
+            "API workers keep serving cached listings for up to "
+            f"{settings.RESPONSE_CACHE_TTL_SECONDS}s; only RESPONSE_CACHE_BACKEND=redis invalidates them from a CLI"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Imports configuration.
+"""
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+
+class ImportConfig(BaseSettings):
+    """
+    Bulk import configuration settings.
+    """
+    model_config = ConfigDict(env_file=".env", env_prefix="IMPORT_", extra="ignore")
+
+    BATCH_SIZE: int = 100  # Manifest rows validated and inserted per transaction
+    MAX_ROWS: int = 1000  # Rows accepted per API import; the CLI has no limit
+    MAX_ARCHIVE_SIZE: int = 1024 * 1024 * 1024  # 1 GB image archive per API import
+    MAX_IMAGES_PER_ROW: int = 20
+
+
+import_config = ImportConfig()
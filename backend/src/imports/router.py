@@ -0,0 +1,102 @@
+"""
+Imports domain router.
+"""
+import asyncio
+import logging
+import uuid
+import zipfile
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from sqlalchemy.orm import Session
+
+from src.auth.dependencies import get_current_active_user
+from src.auth.models import User
+from src.database import get_db
+from src.exceptions import AuthorizationError, FileUploadError, NotFoundError, ValidationError
+from src.imports.config import import_config
+from src.imports.service import BulkImportService, parse_manifest
+from src.utils.responses import success_response
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+
+@router.post("/listings", response_model=Any)
+async def import_listings(
+    manifest: UploadFile = File(..., description="CSV or JSON manifest, one listing per row"),
+    archive: Optional[UploadFile] = File(None, description="Zip of the images the manifest refers to"),
+    owner_id: Optional[uuid.UUID] = Form(None, description="Import for another user (admins only)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Bulk import properties with images and optional subleases.
+
+    Valid rows are imported even if others fail; the report lists the
+    problems of each rejected row. Larger imports can be run with
+    ``python -m src.imports.cli`` instead.
+
+    Args:
+        manifest: Manifest file.
+        archive: Image archive.
+        owner_id: Owner to import for; defaults to the current user.
+        current_user: Current authenticated user.
+        db: Database session.
+
+    Returns:
+        Success response with the import report.
+
+    Raises:
+        AuthorizationError: If a non-admin imports for another user.
+        NotFoundError: If the owner doesn't exist.
+        ValidationError: If the manifest is invalid or too large.
+        FileUploadError: If the archive is not a valid zip or too large.
+    """
+    if owner_id is None or owner_id == current_user.user_id:
+        owner = current_user
+    elif not current_user.is_admin:
+        raise AuthorizationError("Only admins can import listings for another user")
+    else:
+        owner = db.query(User).filter(User.user_id == owner_id).first()
+        if owner is None:
+            raise NotFoundError("Owner not found")
+
+    rows = parse_manifest(manifest.filename, await manifest.read())
+    if not rows:
+        raise ValidationError("Manifest has no rows.")
+    if len(rows) > import_config.MAX_ROWS:
+        raise ValidationError(
+            f"Manifest has {len(rows)} rows; at most {import_config.MAX_ROWS} are allowed per upload."
+        )
+
+    image_archive = None
+    if archive is not None and archive.filename:
+        if archive.size is not None and archive.size > import_config.MAX_ARCHIVE_SIZE:
+            raise FileUploadError(
+                f"Archive too large. Maximum {import_config.MAX_ARCHIVE_SIZE / (1024 * 1024):.0f} MB allowed."
+            )
+        try:
+            # The upload is spooled to a temporary file, so members are read from disk on demand;
+            # opening it reads the central directory, so do that off the event loop too
+            image_archive = await asyncio.to_thread(zipfile.ZipFile, archive.file)
+        except zipfile.BadZipFile:
+            raise FileUploadError("Archive is not a valid zip file.")
+
+    logger.info(f"Importing {len(rows)} listings for user {owner.user_id}")
+    try:
+        report = await BulkImportService(db).import_listings(owner.user_id, rows, image_archive)
+    finally:
+        if image_archive is not None:
+            image_archive.close()
+
+    logger.info(
+        f"Import for user {owner.user_id}: {report.properties_created} properties, "
+        f"{report.subleases_created} subleases, {len(report.errors)} rejected rows"
+    )
+    return success_response(
+        data=report,
+        message=f"Imported {report.properties_created} of {report.total_rows} listings"
+    )
@@ -0,0 +1,66 @@
+"""
+Imports domain schemas.
+"""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from src.subleases.schemas import SubLeaseBase
+
+
+class ImportSubLease(SubLeaseBase):
+    """Sublease to create for an imported property."""
+
+    @model_validator(mode="after")
+    def check_dates(self) -> "ImportSubLease":
+        if self.available_until < self.available_from:
+            raise ValueError("available_until must not be before available_from")
+        if self.maximum_stay_days is not None and self.maximum_stay_days < self.minimum_stay_days:
+            raise ValueError("maximum_stay_days must not be below minimum_stay_days")
+        return self
+
+
+class ImportRow(BaseModel):
+    """
+    One manifest row: a property, its images and optionally a sublease.
+
+    Lengths mirror the column sizes so a bad row is rejected on its own
+    instead of failing the insert of its whole batch.
+    """
+    title: str = Field(min_length=1, max_length=100)
+    description: str
+    property_type: Optional[str] = Field(None, max_length=50)
+    address_line1: str = Field(min_length=1)
+    address_line2: Optional[str] = Field(None, max_length=100)
+    city: str = Field(min_length=1, max_length=60)
+    state: str = Field(min_length=1, max_length=60)
+    country: str = Field(min_length=1, max_length=60)
+    square_feet: Optional[int] = Field(None, ge=0)
+    amenities: Optional[List[str]] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    images: List[str] = Field(default_factory=list, description="Paths of the row's images in the archive")
+    sublease: Optional[ImportSubLease] = None
+
+    @field_validator("amenities", "images", mode="before")
+    @classmethod
+    def split_list(cls, value):
+        # CSV manifests list several values in one cell, separated by semicolons
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(";") if item.strip()]
+        return value
+
+
+class ImportRowError(BaseModel):
+    """Problems that kept a manifest row from being imported."""
+    row: int = Field(description="1-based row number in the manifest, excluding the CSV header")
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """Outcome of a bulk import."""
+    total_rows: int
+    properties_created: int = 0
+    images_created: int = 0
+    subleases_created: int = 0
+    errors: List[ImportRowError] = []
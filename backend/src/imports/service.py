@@ -0,0 +1,372 @@
+"""
+Imports domain service.
+
+Bulk import of listings from a manifest (CSV or JSON) and a zip of images.
+Each manifest row describes a property, the archive paths of its images and
+optionally a sublease. Rows are processed ``IMPORT_BATCH_SIZE`` at a time:
+validated, their images checked and stored, then all properties, images and
+subleases of the batch go in with one multi-row INSERT per table and one
+commit. If a batch fails to insert, its rows are retried one by one so only
+the offending rows are reported. Archive reads and the batch inserts, which
+fire the search and card triggers, run in worker threads so the event loop
+keeps serving other requests during an import.
+
+CSV manifests use the ``ImportRow`` fields as columns; ``amenities`` and
+``images`` hold semicolon-separated values and sublease fields are prefixed
+with ``sublease_`` (e.g. ``sublease_rate``). JSON manifests are a list of
+objects with a nested ``sublease`` object.
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+import posixpath
+import uuid
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.exceptions import ValidationError
+from src.imports.config import import_config
+from src.imports.schemas import ImportReport, ImportRow, ImportRowError
+from src.properties.models import Property
+from src.properties.service import normalize_amenities
+from src.propertyimages.models import PropertyImage
+from src.storage import get_storage
+from src.storage.backends import StorageBackend
+from src.subleases.models import SubLease
+from src.utils.cache import bump_version
+from src.utils.file_upload import ALLOWED_EXTENSIONS
+from src.utils.image_processing import compute_placeholder, run_in_process
+
+logger = logging.getLogger(__name__)
+
+SUBLEASE_COLUMN_PREFIX = "sublease_"
+
+
+class StagedRow(NamedTuple):
+    """
+    A validated row with its images already in storage, ready to insert.
+    """
+    number: int
+    property: Dict[str, Any]
+    images: List[Dict[str, Any]]
+    sublease: Optional[Dict[str, Any]]
+    keys: List[str]  # Stored image keys, removed again if the row fails
+
+
+def parse_manifest(filename: str, data: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse a CSV or JSON manifest into raw rows.
+
+    Args:
+        filename: Manifest filename; its extension selects the format.
+        data: Manifest contents.
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per row, not yet validated.
+
+    Raises:
+        ValidationError: If the manifest can't be read.
+    """
+    extension = posixpath.splitext(filename or "")[1].lower()
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValidationError("Manifest must be UTF-8 encoded.")
+
+    if extension == ".json":
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Manifest is not valid JSON: {e}")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValidationError("JSON manifest must be a list of objects.")
+        return rows
+
+    if extension == ".csv":
+        return [_nest_csv_row(row) for row in csv.DictReader(io.StringIO(text))]
+
+    raise ValidationError("Manifest must be a .csv or .json file.")
+
+
+def archive_index(archive: Optional[zipfile.ZipFile]) -> Dict[str, zipfile.ZipInfo]:
+    """
+    Index the files of an image archive by normalized path.
+
+    Args:
+        archive: Image archive, if any.
+
+    Returns:
+        Dict[str, zipfile.ZipInfo]: Archive entries by path.
+    """
+    if archive is None:
+        return {}
+    return {_normalize_path(info.filename): info for info in archive.infolist() if not info.is_dir()}
+
+
+def validate_row(
+    raw: Dict[str, Any],
+    index: Dict[str, zipfile.ZipInfo]
+) -> Tuple[Optional[ImportRow], List[str]]:
+    """
+    Validate a manifest row and check that its images are in the archive.
+
+    Only archive metadata is checked here; image contents are checked when
+    they are staged.
+
+    Args:
+        raw: Raw manifest row.
+        index: Archive entries by path.
+
+    Returns:
+        Tuple[Optional[ImportRow], List[str]]: The row, or None and its errors.
+    """
+    try:
+        row = ImportRow.model_validate(raw)
+    except PydanticValidationError as e:
+        return None, [
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()
+        ]
+
+    errors = []
+    if len(row.images) > import_config.MAX_IMAGES_PER_ROW:
+        errors.append(f"Too many images; at most {import_config.MAX_IMAGES_PER_ROW} are allowed per row.")
+    for path in row.images:
+        info = index.get(_normalize_path(path))
+        extension = posixpath.splitext(path)[1].lower()
+        if extension not in ALLOWED_EXTENSIONS:
+            errors.append(f"Image '{path}' has unsupported type '{extension}'.")
+        elif info is None:
+            errors.append(f"Image '{path}' is not in the archive.")
+        elif info.file_size == 0:
+            errors.append(f"Image '{path}' is empty.")
+        elif info.file_size > settings.MAX_FILE_SIZE:
+            errors.append(f"Image '{path}' exceeds the maximum file size.")
+    return (None, errors) if errors else (row, [])
+
+
+class BulkImportService:
+    """
+    Bulk import service for onboarding many listings at once.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def import_listings(
+        self,
+        owner_id: uuid.UUID,
+        rows: Sequence[Dict[str, Any]],
+        archive: Optional[zipfile.ZipFile] = None,
+        batch_size: Optional[int] = None
+    ) -> ImportReport:
+        """
+        Import listings for an owner from parsed manifest rows.
+
+        Args:
+            owner_id: Owner of the properties and lessor of the subleases.
+            rows: Raw manifest rows from ``parse_manifest``.
+            archive: Zip archive holding the images the rows refer to.
+            batch_size: Rows per transaction.
+
+        Returns:
+            ImportReport: Counts of created rows and per-row errors.
+        """
+        batch_size = batch_size or import_config.BATCH_SIZE
+        index = archive_index(archive)
+        storage = get_storage()
+        report = ImportReport(total_rows=len(rows))
+
+        for start in range(0, len(rows), batch_size):
+            staged = []
+            for number, raw in enumerate(rows[start:start + batch_size], start=start + 1):
+                row, errors = validate_row(raw, index)
+                if row is not None:
+                    staged_row, errors = await self._stage_row(storage, owner_id, number, row, archive, index)
+                    if staged_row is not None:
+                        staged.append(staged_row)
+                        continue
+                report.errors.append(ImportRowError(row=number, errors=errors))
+            if staged:
+                await self._insert_batch(storage, staged, report)
+            logger.info(f"Imported rows {start + 1}-{min(start + batch_size, len(rows))} of {len(rows)}")
+
+        if report.properties_created:
+            bump_version(Property.__tablename__, PropertyImage.__tablename__, SubLease.__tablename__)
+        report.errors.sort(key=lambda error: error.row)
+        return report
+
+    async def _stage_row(
+        self,
+        storage: StorageBackend,
+        owner_id: uuid.UUID,
+        number: int,
+        row: ImportRow,
+        archive: Optional[zipfile.ZipFile],
+        index: Dict[str, zipfile.ZipInfo]
+    ) -> Tuple[Optional[StagedRow], List[str]]:
+        """
+        Decode and store a row's images and build its insert values.
+
+        Args:
+            storage: Storage backend.
+            owner_id: Owner user ID.
+            number: Row number in the manifest.
+            row: Validated row.
+            archive: Image archive.
+            index: Archive entries by path.
+
+        Returns:
+            Tuple[Optional[StagedRow], List[str]]: The staged row, or None and its errors.
+        """
+        members = [index[_normalize_path(path)] for path in row.images]
+        try:
+            # The archive is read from the spooled upload on disk; keep that off the event loop
+            contents = await asyncio.to_thread(lambda: [archive.read(member) for member in members])
+        except (zipfile.BadZipFile, OSError) as e:
+            return None, [f"Failed to read images from the archive: {str(e)}"]
+        placeholders = await asyncio.gather(
+            *(run_in_process(compute_placeholder, data) for data in contents), return_exceptions=True
+        )
+        for placeholder in placeholders:
+            if isinstance(placeholder, BrokenProcessPool):
+                raise placeholder
+        errors = [
+            f"Image '{path}' is not a valid image."
+            for path, placeholder in zip(row.images, placeholders) if isinstance(placeholder, BaseException)
+        ]
+        if errors:
+            return None, errors
+
+        property_id = uuid.uuid4()
+        images, keys = [], []
+        try:
+            for order, (path, data, (blurhash, dominant_color)) in enumerate(zip(row.images, contents, placeholders)):
+                image_id = uuid.uuid4()
+                key = f"properties/{image_id}{posixpath.splitext(path)[1].lower()}"
+                stored = await storage.put(key, data, content_type=StorageBackend.guess_content_type(key))
+                keys.append(key)
+                images.append({
+                    "image_id": image_id,
+                    "property_id": property_id,
+                    "image_url": storage.url(key),
+                    "image_name": posixpath.basename(path),
+                    "image_size": stored.size,
+                    "image_order": order,
+                    "is_primary": order == 0,
+                    "blurhash": blurhash,
+                    "dominant_color": dominant_color,
+                })
+        except Exception as e:
+            logger.error(f"Failed to store images of import row {number}: {str(e)}")
+            await self._delete_keys(storage, keys)
+            return None, [f"Failed to store images: {str(e)}"]
+
+        values = row.model_dump(exclude={"images", "sublease"})
+        values["amenities"] = normalize_amenities(values["amenities"])
+        sublease = None
+        if row.sublease is not None:
+            sublease = row.sublease.model_dump()
+            sublease.update(
+                sublease_id=uuid.uuid4(),
+                property_id=property_id,
+                lessor_id=owner_id,
+                status=row.sublease.status.value
+            )
+        return StagedRow(
+            number,
+            {**values, "property_id": property_id, "owner_id": owner_id},
+            images,
+            sublease,
+            keys
+        ), []
+
+    async def _insert_batch(self, storage: StorageBackend, staged: List[StagedRow], report: ImportReport) -> None:
+        """
+        Insert a batch in one transaction, falling back to one row at a time.
+
+        Args:
+            storage: Storage backend, to remove the images of failed rows.
+            staged: Staged rows.
+            report: Report to update.
+        """
+        try:
+            # The inserts fire the search and card triggers for the whole batch; run them in a thread
+            await asyncio.to_thread(self._commit_rows, staged)
+        except SQLAlchemyError as e:
+            await asyncio.to_thread(self.db.rollback)
+            if len(staged) == 1:
+                logger.warning(f"Import row {staged[0].number} failed to insert: {str(e)}")
+                await self._delete_keys(storage, staged[0].keys)
+                report.errors.append(ImportRowError(
+                    row=staged[0].number, errors=[f"Database error: {getattr(e, 'orig', e)}"]
+                ))
+                return
+            logger.warning(f"Import batch failed to insert, retrying {len(staged)} rows one by one: {str(e)}")
+            for row in staged:
+                await self._insert_batch(storage, [row], report)
+            return
+
+        report.properties_created += len(staged)
+        report.images_created += sum(len(row.images) for row in staged)
+        report.subleases_created += sum(row.sublease is not None for row in staged)
+
+    def _commit_rows(self, staged: List[StagedRow]) -> None:
+        """
+        Insert staged rows and commit them; blocking.
+
+        Args:
+            staged: Staged rows.
+        """
+        self._insert_rows(staged)
+        self.db.commit()
+
+    def _insert_rows(self, staged: List[StagedRow]) -> None:
+        """
+        Insert staged rows with one multi-row INSERT per table.
+
+        Args:
+            staged: Staged rows.
+        """
+        self.db.execute(insert(Property), [row.property for row in staged])
+        images = [image for row in staged for image in row.images]
+        if images:
+            self.db.execute(insert(PropertyImage), images)
+        subleases = [row.sublease for row in staged if row.sublease is not None]
+        if subleases:
+            self.db.execute(insert(SubLease), subleases)
+
+    async def _delete_keys(self, storage: StorageBackend, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                await storage.delete(key)
+            except Exception:
+                logger.warning(f"Failed to remove imported image {key}", exc_info=True)
+
+
+def _normalize_path(path: str) -> str:
+    return posixpath.normpath(path.replace("\\", "/")).lstrip("/")
+
+
+def _nest_csv_row(row: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    # Blank cells mean "not given"; sublease_* columns become the nested sublease
+    values: Dict[str, Any] = {}
+    sublease: Dict[str, Any] = {}
+    for column, value in row.items():
+        if column is None or value is None or not value.strip():
+            continue
+        if column.startswith(SUBLEASE_COLUMN_PREFIX):
+            sublease[column[len(SUBLEASE_COLUMN_PREFIX):]] = value.strip()
+        else:
+            values[column] = value.strip()
+    if sublease:
+        values["sublease"] = sublease
+    return values
@@ -1,23 +1,32 @@
 """
 Main FastAPI application.
 """
-import os
 import uvicorn
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import socketio
 
 from src.auth import router as auth_router
 from src.properties import router as properties_router
+from src.propertyimages import router as propertyimages_router
 from src.subleases import router as subleases_router
 from src.userratings import router as userratings_router
 from src.messages import router as messages_router
+from src.exports import router as exports_router
+from src.imports import router as imports_router
 from src.messages.websocket import chat_manager
+from src.storage import StaticImagesMiddleware, get_storage, router as storage_router
 from src.config import settings
 from src.database import create_db_and_tables
+from src.subleases.config import sublease_config
+from src.subleases.tasks import expire_subleases
+from src.userratings.config import userrating_config
+from src.userratings.tasks import recompute_reputation_scores, repair_rating_aggregates
+from src.utils.image_processing import shutdown_process_pool
+from src.utils.scheduler import scheduler
+from src.utils.serialization import default_response_class
 
 # Import all models to ensure they are registered with SQLAlchemy
 from src.auth.models import User  # noqa: F401
@@ -37,10 +46,23 @@ async def lifespan(app: FastAPI):
         app: FastAPI application instance.
     """
     create_db_and_tables()
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    os.makedirs(f"{settings.UPLOAD_DIR}/avatars", exist_ok=True)
-    os.makedirs(f"{settings.UPLOAD_DIR}/properties", exist_ok=True)
+    if settings.SCHEDULER_ENABLED:
+        scheduler.add_job(
+            "expire_subleases", expire_subleases,
+            interval_seconds=sublease_config.EXPIRY_INTERVAL_SECONDS
+        )
+        scheduler.add_job(
+            "repair_rating_aggregates", repair_rating_aggregates,
+            interval_seconds=userrating_config.AGGREGATE_REPAIR_INTERVAL_SECONDS
+        )
+        scheduler.add_job(
+            "recompute_reputation_scores", recompute_reputation_scores,
+            interval_seconds=userrating_config.REPUTATION_INTERVAL_SECONDS
+        )
+        scheduler.start()
     yield
+    await scheduler.stop()
+    shutdown_process_pool()
 
 
 app = FastAPI(
@@ -48,21 +70,27 @@ app = FastAPI(
     description="Sublease your apartment, house or room with ease.Short term and long term subleases available.",
     version="1.0.0",
     docs_url="/api/v1/docs",
+    default_response_class=default_response_class(settings.JSON_RESPONSE_CLASS),
     lifespan=lifespan
 )
 
-# Create Socket.IO ASGI app
-sio_app = socketio.ASGIApp(chat_manager.sio, app)
+storage = get_storage()
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
+CORS_OPTIONS = dict(
     allow_origins=["*"],  # Allow all origins for development
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Create Socket.IO ASGI app. Image requests are answered by StaticImagesMiddleware
+# before they reach the CORS/request-limit middleware stack and FastAPI routing,
+# so it applies the same CORS policy to them itself.
+sio_app = socketio.ASGIApp(chat_manager.sio, StaticImagesMiddleware(app, storage, CORS_OPTIONS))
+
+# Add CORS middleware
+app.add_middleware(CORSMiddleware, **CORS_OPTIONS)
+
 # Configure larger request body limits for file uploads
 # These settings help handle multiple file uploads better
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -84,14 +112,19 @@ class RequestLimitMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(RequestLimitMiddleware)
 
-app.mount("/images", StaticFiles(directory=settings.UPLOAD_DIR), name="images")
+# Fallback for running the bare FastAPI app without the fast image path
+app.mount(storage.public_prefix, storage.static_app(), name="images")
 
 # Include routers
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(properties_router, prefix="/api/v1/properties", tags=["Properties"])
+app.include_router(propertyimages_router, prefix="/api/v1/properties", tags=["Property Images"])
 app.include_router(subleases_router, prefix="/api/v1/subleases", tags=["Subleases"])
 app.include_router(userratings_router, prefix="/api/v1/userratings", tags=["User Ratings"])
-# app.include_router(messages_router, prefix="/api/v1/messages", tags=["Messages"])
+app.include_router(storage_router, prefix="/api/v1/storage", tags=["Storage"])
+app.include_router(exports_router, prefix="/api/v1/exports", tags=["Exports"])
+app.include_router(imports_router, prefix="/api/v1/imports", tags=["Imports"])
+app.include_router(messages_router, prefix="/api/v1/messages", tags=["Messages"])
 
 
 @app.get("/")
@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -24,9 +24,15 @@ class Message(Base):
     Message model for storing chat messages.
     """
     __tablename__ = "messages"
+    __table_args__ = (
+        # Conversation history: each direction of the pair is one range scan
+        Index("ix_messages_sender_receiver_created_at", "sender_id", "receiver_id", "created_at"),
+        # Incremental exports from a last-change watermark (see src.exports)
+        Index("ix_messages_changed_at", text("coalesce(updated_at, created_at)")),
+    )
     
     message_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    sender_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
+    sender_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
     receiver_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     message_type = Column(String, default="text")  # text, image, file, etc.
@@ -48,8 +54,8 @@ class Conversation(Base):
     __tablename__ = "conversations"
     
     conversation_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user1_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
-    user2_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
+    user1_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
+    user2_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
     last_message_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
@@ -58,9 +64,11 @@ class Conversation(Base):
     user1 = relationship("User", foreign_keys=[user1_id])
     user2 = relationship("User", foreign_keys=[user2_id])
     
-    # Add unique constraint to prevent duplicate conversations
     __table_args__ = (
-        {"sqlite_autoincrement": True}
+        # A user's conversations, most recent first, from either side of the pair
+        Index("ix_conversations_user1_last_message_at", "user1_id", "last_message_at"),
+        Index("ix_conversations_user2_last_message_at", "user2_id", "last_message_at"),
+        {"sqlite_autoincrement": True},
     )
 
 
@@ -69,9 +77,13 @@ class MessageRead(Base):
     Message read status tracking.
     """
     __tablename__ = "message_reads"
+    __table_args__ = (
+        # One read receipt per user and message; also serves the unread anti-join
+        Index("ux_message_reads_message_user", "message_id", "user_id", unique=True),
+    )
     
     read_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    message_id = Column(UUID(as_uuid=True), ForeignKey("messages.message_id"), nullable=False, index=True)
+    message_id = Column(UUID(as_uuid=True), ForeignKey("messages.message_id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
     read_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     
@@ -3,9 +3,10 @@ Messages domain router for HTTP endpoints.
 """
 import logging
 import uuid
-from typing import List
+from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from src.auth.dependencies import get_current_user
@@ -21,11 +22,17 @@ from src.messages.schemas import (
     MessageReadCreate,
     MessageUpdate,
 )
+from src.utils.conditional import make_etag, not_modified
+from src.utils.fieldsets import FieldSet, fieldset_query
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MESSAGE_LIST_JSON = TypeAdapter(List[MessageRead])
+
+get_message_fieldset = fieldset_query(MessageRead, "message_id", relations=("sender", "receiver"))
+
 
 @router.post("/", response_model=MessageRead, status_code=status.HTTP_201_CREATED)
 async def create_message(
@@ -57,118 +64,33 @@ async def create_message(
         )
 
 
-@router.get("/{message_id}", response_model=MessageRead)
-async def get_message(
-    message_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> MessageRead:
-    """
-    Get a specific message.
-    
-    Args:
-        message_id: Message ID.
-        current_user: Current authenticated user.
-        db: Database session.
-        
-    Returns:
-        MessageRead: Message details.
-    """
-    messages_service = MessagesService(db)
-    message = messages_service.get_message_by_id(message_id)
-    
-    if not message:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message not found"
-        )
-    
-    # Check if user is involved in this message
-    if (message.sender_id != current_user.user_id and 
-        message.receiver_id != current_user.user_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view this message"
-        )
-    
-    return message
-
-
-@router.put("/{message_id}", response_model=MessageRead)
-async def update_message(
-    message_id: uuid.UUID,
-    message_data: MessageUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> MessageRead:
-    """
-    Update a message (only by sender).
-    
-    Args:
-        message_id: Message ID.
-        message_data: Updated message data.
-        current_user: Current authenticated user.
-        db: Database session.
-        
-    Returns:
-        MessageRead: Updated message.
-    """
-    messages_service = MessagesService(db)
-    message = messages_service.update_message(message_id, message_data, current_user.user_id)
-    
-    if not message:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message not found or not authorized to update"
-        )
-    
-    return message
-
-
-@router.delete("/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_message(
-    message_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Delete a message (only by sender).
-    
-    Args:
-        message_id: Message ID.
-        current_user: Current authenticated user.
-        db: Database session.
-    """
-    messages_service = MessagesService(db)
-    success = messages_service.delete_message(message_id, current_user.user_id)
-    
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message not found or not authorized to delete"
-        )
-
-
 @router.get("/conversations/{conversation_id}/messages", response_model=List[MessageRead])
 async def get_conversation_messages(
     conversation_id: uuid.UUID,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
-) -> List[MessageRead]:
+    limit: int = Query(50, ge=1, le=100),
+    fieldset: FieldSet = Depends(get_message_fieldset)
+) -> Response:
     """
     Get messages from a specific conversation.
     
+    ``fields`` and ``include`` narrow both the query and the response,
+    e.g. ``?fields=content,created_at`` leaves out the sender and receiver.
+    
     Args:
         conversation_id: Conversation ID.
+        response: Response whose headers are kept.
         current_user: Current authenticated user.
         db: Database session.
         skip: Number of messages to skip.
         limit: Maximum number of messages to return.
+        fieldset: Fields to return.
         
     Returns:
-        List[MessageRead]: List of messages.
+        Response: JSON list of messages.
     """
     messages_service = MessagesService(db)
     
@@ -184,27 +106,41 @@ async def get_conversation_messages(
     other_user_id = conversation.user2_id if conversation.user1_id == current_user.user_id else conversation.user1_id
     
     messages = messages_service.get_conversation_messages(
-        current_user.user_id, other_user_id, skip, limit
+        current_user.user_id, other_user_id, skip, limit, fieldset
     )
-    return messages
+    return fieldset.response(MESSAGE_LIST_JSON, messages, response)
 
 
 @router.get("/conversations", response_model=List[ConversationSummary])
 async def get_user_conversations(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[ConversationSummary]:
+) -> Any:
     """
     Get all conversations for the current user.
     
+    Validators come from a single aggregate query, so a matching
+    ``If-None-Match`` gets an empty 304 without building the summaries.
+    
     Args:
+        request: Current request.
+        response: Response, used to set validator headers.
         current_user: Current authenticated user.
         db: Database session.
         
     Returns:
-        List[ConversationSummary]: List of conversation summaries.
+        List[ConversationSummary]: List of conversation summaries, or a 304 response.
     """
     messages_service = MessagesService(db)
+    stamp, last_modified = messages_service.get_conversation_summaries_stamp(current_user.user_id)
+    unchanged = not_modified(
+        request, response, make_etag(current_user.user_id, stamp), last_modified, compare_last_modified=False
+    )
+    if unchanged:
+        return unchanged
+    
     conversations = messages_service.get_user_conversation_summaries(current_user.user_id)
     return conversations
 
@@ -314,3 +250,96 @@ async def get_unread_count(
     messages_service = MessagesService(db)
     count = messages_service.get_unread_count(current_user.user_id, user_id)
     return {"unread_count": count}
+
+
+# Declared last so /{message_id} doesn't shadow /conversations and the other literal paths
+@router.get("/{message_id}", response_model=MessageRead)
+async def get_message(
+    message_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> MessageRead:
+    """
+    Get a specific message.
+    
+    Args:
+        message_id: Message ID.
+        current_user: Current authenticated user.
+        db: Database session.
+        
+    Returns:
+        MessageRead: Message details.
+    """
+    messages_service = MessagesService(db)
+    message = messages_service.get_message_by_id(message_id)
+    
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Message not found"
+        )
+    
+    # Check if user is involved in this message
+    if (message.sender_id != current_user.user_id and 
+        message.receiver_id != current_user.user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this message"
+        )
+    
+    return message
+
+
+@router.put("/{message_id}", response_model=MessageRead)
+async def update_message(
+    message_id: uuid.UUID,
+    message_data: MessageUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> MessageRead:
+    """
+    Update a message (only by sender).
+    
+    Args:
+        message_id: Message ID.
+        message_data: Updated message data.
+        current_user: Current authenticated user.
+        db: Database session.
+        
+    Returns:
+        MessageRead: Updated message.
+    """
+    messages_service = MessagesService(db)
+    message = messages_service.update_message(message_id, message_data, current_user.user_id)
+    
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Message not found or not authorized to update"
+        )
+    
+    return message
+
+
+@router.delete("/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_message(
+    message_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a message (only by sender).
+    
+    Args:
+        message_id: Message ID.
+        current_user: Current authenticated user.
+        db: Database session.
+    """
+    messages_service = MessagesService(db)
+    success = messages_service.delete_message(message_id, current_user.user_id)
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Message not found or not authorized to delete"
+        )
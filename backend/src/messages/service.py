@@ -3,10 +3,11 @@ Messages domain service for chat operations.
 """
 import uuid
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
-from sqlalchemy import and_, desc, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, desc, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only
 
 from src.messages.models import Conversation, Message, MessageRead
 from src.messages.schemas import (
@@ -18,6 +19,14 @@ from src.messages.schemas import (
     UserBasic
 )
 from src.auth.models import User
+from src.utils.fieldsets import FieldSet
+from src.utils.loaders import EntityLoader
+
+# Message columns returned by list endpoints
+MESSAGE_COLUMNS = (
+    "message_id", "sender_id", "receiver_id", "content", "message_type", "status", "is_edited", "edited_at",
+    "created_at", "updated_at",
+)
 
 
 class MessagesService:
@@ -88,7 +97,8 @@ class MessagesService:
         user1_id: uuid.UUID, 
         user2_id: uuid.UUID, 
         skip: int = 0, 
-        limit: int = 50
+        limit: int = 50,
+        fieldset: Optional[FieldSet] = None
     ) -> List[MessageReadSchema]:
         """
         Get messages between two users.
@@ -98,16 +108,24 @@ class MessagesService:
             user2_id: Second user ID.
             skip: Number of messages to skip.
             limit: Maximum number of messages to return.
+            fieldset: Fields to load and return; everything by default.
             
         Returns:
             List[MessageReadSchema]: List of messages.
         """
+        fieldset = fieldset or FieldSet()
+        options = [
+            joinedload(getattr(Message, relation))
+            for relation in ("sender", "receiver") if relation in fieldset
+        ]
+        if not fieldset.is_full:
+            options.append(load_only(
+                Message.message_id, Message.created_at,
+                *(getattr(Message, name) for name in MESSAGE_COLUMNS if name in fieldset)
+            ))
         messages = (
             self.db.query(Message)
-            .options(
-                joinedload(Message.sender),
-                joinedload(Message.receiver)
-            )
+            .options(*options)
             .filter(
                 or_(
                     and_(Message.sender_id == user1_id, Message.receiver_id == user2_id),
@@ -120,7 +138,7 @@ class MessagesService:
             .all()
         )
         
-        return [self._convert_message_to_read(msg) for msg in messages]
+        return [self._convert_message_to_read(msg, fieldset) for msg in messages]
     
     def update_message(
         self, 
@@ -200,10 +218,6 @@ class MessagesService:
         """
         conversations = (
             self.db.query(Conversation)
-            .options(
-                joinedload(Conversation.user1),
-                joinedload(Conversation.user2)
-            )
             .filter(
                 or_(
                     Conversation.user1_id == user_id,
@@ -213,6 +227,7 @@ class MessagesService:
             .order_by(desc(Conversation.last_message_at))
             .all()
         )
+        self._load_participants(conversations)
         
         return [self._convert_conversation_to_read(conv, user_id) for conv in conversations]
 
@@ -228,10 +243,6 @@ class MessagesService:
         """
         conversations = (
             self.db.query(Conversation)
-            .options(
-                joinedload(Conversation.user1),
-                joinedload(Conversation.user2)
-            )
             .filter(
                 or_(
                     Conversation.user1_id == user_id,
@@ -241,6 +252,7 @@ class MessagesService:
             .order_by(desc(Conversation.last_message_at))
             .all()
         )
+        self._load_participants(conversations)
         
         summaries = []
         for conv in conversations:
@@ -278,6 +290,43 @@ class MessagesService:
         
         return summaries
 
+    def get_conversation_summaries_stamp(self, user_id: uuid.UUID) -> Tuple[Tuple[Any, ...], Optional[datetime]]:
+        """
+        Get values that change whenever a user's conversation summaries do.
+        
+        One aggregate query over the user's conversations, their counterparts,
+        the user's messages and read receipts; far cheaper than building the
+        summaries, which run two queries per conversation.
+        
+        Args:
+            user_id: User ID.
+            
+        Returns:
+            Tuple[Tuple[Any, ...], Optional[datetime]]: Validator inputs and the
+                newest timestamp among them.
+        """
+        in_conversation = or_(Conversation.user1_id == user_id, Conversation.user2_id == user_id)
+        other_user_id = case(
+            (Conversation.user1_id == user_id, Conversation.user2_id), else_=Conversation.user1_id
+        )
+        in_messages = or_(Message.sender_id == user_id, Message.receiver_id == user_id)
+        stamp = tuple(self.db.execute(select(
+            select(func.count()).select_from(Conversation).where(in_conversation).scalar_subquery(),
+            select(func.max(Conversation.last_message_at)).where(in_conversation).scalar_subquery(),
+            select(func.max(Conversation.updated_at)).where(in_conversation).scalar_subquery(),
+            select(func.max(User.updated_at))
+                .join(Conversation, User.user_id == other_user_id)
+                .where(in_conversation)
+                .scalar_subquery(),
+            select(func.count()).select_from(Message).where(in_messages).scalar_subquery(),
+            select(func.max(func.coalesce(Message.updated_at, Message.created_at)))
+                .where(in_messages)
+                .scalar_subquery(),
+            select(func.count()).select_from(MessageRead).where(MessageRead.user_id == user_id).scalar_subquery()
+        )).one())
+        timestamps = [value for value in stamp if isinstance(value, datetime)]
+        return stamp, max(timestamps) if timestamps else None
+    
     def get_conversation_by_id(self, conversation_id: uuid.UUID) -> Optional[Conversation]:
         """
         Get a conversation by ID.
@@ -331,6 +380,7 @@ class MessagesService:
             self.db.add(conversation)
             self.db.commit()
             self.db.refresh(conversation)
+        self._load_participants([conversation])
         
         return self._convert_conversation_to_read(conversation, user1_id)
 
@@ -353,7 +403,7 @@ class MessagesService:
         conversation_read = self.get_or_create_conversation(user1_id, user2_id)
         
         # Get the other user details
-        other_user = self.db.query(User).filter(User.user_id == user2_id).first()
+        other_user = EntityLoader.for_session(self.db).load(User, user2_id)
         if not other_user:
             raise ValueError(f"User with ID {user2_id} not found")
         
@@ -407,7 +457,12 @@ class MessagesService:
         )
         
         self.db.add(message_read)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Marked read concurrently (see ux_message_reads_message_user)
+            self.db.rollback()
+            return False
         return True
     
     def get_unread_count(self, user_id: uuid.UUID, conversation_user_id: uuid.UUID) -> int:
@@ -440,49 +495,25 @@ class MessagesService:
         
         return unread_count
     
-    def _convert_message_to_read(self, message: Message) -> MessageReadSchema:
+    def _convert_message_to_read(self, message: Message, fieldset: Optional[FieldSet] = None) -> MessageReadSchema:
         """
         Convert Message model to MessageReadSchema.
         
         Args:
             message: Message model instance.
+            fieldset: Fields to fill; everything by default.
             
         Returns:
             MessageReadSchema: Converted message schema.
         """
-        sender = None
-        receiver = None
-        
-        if hasattr(message, 'sender') and message.sender:
-            sender = UserBasic(
-                user_id=message.sender.user_id,
-                first_name=message.sender.first_name,
-                last_name=message.sender.last_name,
-                profile_image_url=message.sender.profile_image_url
-            )
+        fieldset = fieldset or FieldSet()
+        message_dict = {name: getattr(message, name) for name in MESSAGE_COLUMNS if name in fieldset}
         
-        if hasattr(message, 'receiver') and message.receiver:
-            receiver = UserBasic(
-                user_id=message.receiver.user_id,
-                first_name=message.receiver.first_name,
-                last_name=message.receiver.last_name,
-                profile_image_url=message.receiver.profile_image_url
-            )
+        for relation in ("sender", "receiver"):
+            if relation in fieldset:
+                message_dict[relation] = getattr(message, relation)
         
-        return MessageReadSchema(
-            message_id=message.message_id,
-            sender_id=message.sender_id,
-            receiver_id=message.receiver_id,
-            content=message.content,
-            message_type=message.message_type,
-            status=message.status,
-            is_edited=message.is_edited,
-            edited_at=message.edited_at,
-            created_at=message.created_at,
-            updated_at=message.updated_at,
-            sender=sender,
-            receiver=receiver
-        )
+        return fieldset.build(MessageReadSchema, message_dict)
     
     def _convert_conversation_to_read(
         self, 
@@ -538,6 +569,17 @@ class MessagesService:
             unread_count=unread_count
         )
     
+    def _load_participants(self, conversations: List[Conversation]) -> None:
+        """
+        Load the users of conversations with one query for those not in the session yet.
+        
+        Args:
+            conversations: Conversations whose ``user1``/``user2`` will be read.
+        """
+        EntityLoader.for_session(self.db).load_many(
+            User, [user_id for conv in conversations for user_id in (conv.user1_id, conv.user2_id)]
+        )
+    
     def _update_conversation_timestamp(
         self, 
         user1_id: uuid.UUID, 
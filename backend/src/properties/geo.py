@@ -0,0 +1,122 @@
+"""
+Geographic helpers for property coordinates.
+
+Distance queries use Postgres' ``cube``/``earthdistance`` extensions:
+``ll_to_earth(latitude, longitude)`` is GiST-indexed, ``earth_box`` gives an
+index-assisted bounding cube around a point and ``earth_distance`` refines it
+to an exact great-circle distance in meters.
+"""
+import math
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, and_, func, or_
+
+from src.properties.models import Property
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def property_earth_point(source: Any = Property) -> ColumnElement:
+    """
+    Get the indexed earth point expression of a property.
+
+    Args:
+        source: Mapped class with ``latitude``/``longitude`` columns.
+
+    Returns:
+        ColumnElement: ``ll_to_earth(latitude, longitude)``.
+    """
+    return func.ll_to_earth(source.latitude, source.longitude)
+
+
+def distance_meters(latitude: float, longitude: float, source: Any = Property) -> ColumnElement:
+    """
+    Build the great-circle distance from a point to a property.
+
+    Args:
+        latitude: Latitude of the reference point.
+        longitude: Longitude of the reference point.
+        source: Mapped class with ``latitude``/``longitude`` columns.
+
+    Returns:
+        ColumnElement: Distance in meters.
+    """
+    return func.earth_distance(func.ll_to_earth(latitude, longitude), property_earth_point(source))
+
+
+def within_radius(latitude: float, longitude: float, radius_km: float, source: Any = Property) -> ColumnElement:
+    """
+    Build a condition matching properties within a radius of a point.
+
+    Args:
+        latitude: Latitude of the center.
+        longitude: Longitude of the center.
+        radius_km: Radius in kilometers.
+        source: Mapped class with ``latitude``/``longitude`` columns.
+
+    Returns:
+        ColumnElement: Indexed bounding-cube check plus exact distance check.
+    """
+    radius_m = radius_km * 1000
+    return and_(
+        func.earth_box(func.ll_to_earth(latitude, longitude), radius_m).op("@>")(property_earth_point(source)),
+        distance_meters(latitude, longitude, source) <= radius_m
+    )
+
+
+def within_bounds(
+    min_latitude: float,
+    max_latitude: float,
+    min_longitude: float,
+    max_longitude: float,
+    source: Any = Property
+) -> ColumnElement:
+    """
+    Build a condition matching properties inside a map viewport.
+
+    Args:
+        min_latitude: Southern edge.
+        max_latitude: Northern edge.
+        min_longitude: Western edge.
+        max_longitude: Eastern edge; smaller than ``min_longitude`` when the
+            viewport crosses the antimeridian.
+        source: Mapped class with ``latitude``/``longitude`` columns.
+
+    Returns:
+        ColumnElement: Bounding-box condition.
+    """
+    if min_longitude <= max_longitude:
+        longitude_condition = source.longitude.between(min_longitude, max_longitude)
+    else:
+        longitude_condition = or_(
+            source.longitude >= min_longitude, source.longitude <= max_longitude
+        )
+    return and_(source.latitude.between(min_latitude, max_latitude), longitude_condition)
+
+
+def haversine_km(
+    latitude1: Optional[float],
+    longitude1: Optional[float],
+    latitude2: Optional[float],
+    longitude2: Optional[float]
+) -> Optional[float]:
+    """
+    Compute the great-circle distance between two points.
+
+    Args:
+        latitude1: Latitude of the first point.
+        longitude1: Longitude of the first point.
+        latitude2: Latitude of the second point.
+        longitude2: Longitude of the second point.
+
+    Returns:
+        Optional[float]: Distance in kilometers, or None if a coordinate is missing.
+    """
+    if None in (latitude1, longitude1, latitude2, longitude2):
+        return None
+
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,201 @@
+"""
+Offline geocoding of properties from a local gazetteer file.
+
+The gazetteer is a CSV file with a header row containing at least ``city``,
+``state``, ``latitude`` and ``longitude``; ``country``, ``state_code`` and
+``country_code`` columns are used when present. Properties are matched on
+city + state (name or code) + country, falling back to city + state.
+
+Cached API responses are invalidated only with ``RESPONSE_CACHE_BACKEND=redis``;
+with the in-process ``memory`` cache, API workers pick up the coordinates after
+``RESPONSE_CACHE_TTL_SECONDS``.
+
+Usage:
+    python -m src.properties.geocoding data/gazetteer.csv [--all] [--batch-size 500]
+"""
+import argparse
+import csv
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database import SessionLocal
+from src.properties.models import Property
+from src.utils.cache import bump_version, invalidates_other_processes
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().replace(".", "").split())
+
+
+class Gazetteer:
+    """
+    In-memory lookup of place coordinates.
+    """
+
+    def __init__(self) -> None:
+        self._places: Dict[Tuple[str, str, str], Coordinates] = {}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "Gazetteer":
+        """
+        Load a gazetteer from a CSV file.
+
+        Args:
+            path: Path to the CSV file.
+
+        Returns:
+            Gazetteer: Loaded gazetteer.
+
+        Raises:
+            ValueError: If required columns are missing.
+        """
+        gazetteer = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            missing = {"city", "state", "latitude", "longitude"} - set(reader.fieldnames or [])
+            if missing:
+                raise ValueError(f"Gazetteer is missing columns: {', '.join(sorted(missing))}")
+
+            for row in reader:
+                try:
+                    coordinates = (float(row["latitude"]), float(row["longitude"]))
+                except (TypeError, ValueError):
+                    continue
+                gazetteer.add(
+                    row["city"],
+                    [row["state"], row.get("state_code")],
+                    [row.get("country"), row.get("country_code")],
+                    coordinates
+                )
+        return gazetteer
+
+    def add(
+        self,
+        city: str,
+        states: Iterable[Optional[str]],
+        countries: Iterable[Optional[str]],
+        coordinates: Coordinates
+    ) -> None:
+        """
+        Add a place under every spelling of its state and country.
+
+        Args:
+            city: City name.
+            states: State names/codes.
+            countries: Country names/codes.
+            coordinates: (latitude, longitude).
+        """
+        city_key = _normalize(city)
+        country_keys = {_normalize(country) for country in countries if country}
+        for state in filter(None, states):
+            state_key = _normalize(state)
+            # First entry wins, so gazetteers sorted by population prefer larger places
+            self._places.setdefault((city_key, state_key, ""), coordinates)
+            for country_key in country_keys:
+                self._places.setdefault((city_key, state_key, country_key), coordinates)
+
+    def lookup(self, city: str, state: str, country: Optional[str] = None) -> Optional[Coordinates]:
+        """
+        Find the coordinates of a place.
+
+        Args:
+            city: City name.
+            state: State name or code.
+            country: Optional country name or code.
+
+        Returns:
+            Optional[Coordinates]: (latitude, longitude), or None if unknown.
+        """
+        city_key, state_key = _normalize(city), _normalize(state)
+        return (
+            self._places.get((city_key, state_key, _normalize(country)))
+            or self._places.get((city_key, state_key, ""))
+        )
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+
+def geocode_properties(
+    db: Session,
+    gazetteer: Gazetteer,
+    regeocode: bool = False,
+    batch_size: int = 500
+) -> Tuple[int, int]:
+    """
+    Fill in latitude/longitude of properties from a gazetteer.
+
+    Args:
+        db: Database session.
+        gazetteer: Place lookup.
+        regeocode: Whether to recompute coordinates that are already set.
+        batch_size: Number of properties processed per commit.
+
+    Returns:
+        Tuple[int, int]: Number of properties geocoded and not found.
+    """
+    query = db.query(Property)
+    if not regeocode:
+        query = query.filter(Property.latitude.is_(None))
+
+    geocoded = not_found = 0
+    last_id = None
+    while True:
+        batch_query = query.order_by(Property.property_id)
+        if last_id is not None:
+            batch_query = batch_query.filter(Property.property_id > last_id)
+        batch = batch_query.limit(batch_size).all()
+        if not batch:
+            break
+
+        for prop in batch:
+            coordinates = gazetteer.lookup(prop.city, prop.state, prop.country)
+            if coordinates is None:
+                not_found += 1
+                logger.warning(f"No gazetteer match for property {prop.property_id}: {prop.city}, {prop.state}")
+                continue
+            prop.latitude, prop.longitude = coordinates
+            geocoded += 1
+
+        last_id = batch[-1].property_id
+        db.commit()
+
+    if geocoded:
+        # Reaches API workers only through a shared (redis) cache; see main()
+        bump_version(Property.__tablename__)
+    return geocoded, not_found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Geocode properties from a local gazetteer CSV.")
+    parser.add_argument("gazetteer", help="Path to the gazetteer CSV file")
+    parser.add_argument("--all", action="store_true", help="Re-geocode properties that already have coordinates")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    gazetteer = Gazetteer.from_csv(args.gazetteer)
+    logger.info(f"Loaded {len(gazetteer)} gazetteer entries")
+
+    db = SessionLocal()
+    try:
+        geocoded, not_found = geocode_properties(db, gazetteer, args.all, args.batch_size)
+    finally:
+        db.close()
+    logger.info(f"Geocoded {geocoded} properties, {not_found} without a match")
+    if geocoded and not invalidates_other_processes():
+        logger.warning(
+            "API workers keep serving cached listings for up to "
+            f"{settings.RESPONSE_CACHE_TTL_SECONDS}s; only RESPONSE_CACHE_BACKEND=redis invalidates them from a CLI"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ Properties domain models.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, Column, DateTime, Float, ForeignKey, Index, Integer, String, event, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from src.database import Base
@@ -16,6 +16,22 @@ class Property(Base):
     Property model for database table.
     """
     __tablename__ = "properties"
+    __table_args__ = (
+        Index(
+            "ix_properties_amenities", "amenities",
+            postgresql_using="gin", postgresql_ops={"amenities": "jsonb_path_ops"}
+        ),
+        Index("ix_properties_state_city", text("lower(state)"), text("lower(city)")),
+        Index("ix_properties_property_type", "property_type"),
+        Index(
+            "ix_properties_earth_location", text("ll_to_earth(latitude, longitude)"),
+            postgresql_using="gist"
+        ),
+        Index("ix_properties_latitude_longitude", "latitude", "longitude"),
+        # Keyset pagination (see PROPERTY_SORT)
+        Index("ix_properties_created_at_id", "created_at", "property_id"),
+        Index("ix_properties_owner_created_at_id", "owner_id", "created_at", "property_id"),
+    )
     
     property_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(100), nullable=False)
@@ -27,11 +43,32 @@ class Property(Base):
     state = Column(String(60), nullable=False)
     country = Column(String(60), nullable=False)
     square_feet = Column(Integer, nullable=True)
+    # Filled in by the offline geocoder (python -m src.properties.geocoding)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
-    amenities = Column(JSON, nullable=True)
+    # JSON array of amenity names; None is stored as SQL NULL, not a JSON null
+    amenities = Column(JSONB(none_as_null=True), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
     
     owner = relationship("User", back_populates="properties")
     subleases = relationship("SubLease", back_populates="property")
     images = relationship("PropertyImage", back_populates="property", cascade="all, delete-orphan")
+    
+    @property
+    def primary_image(self):
+        """Image shown in listings: the primary one, else the first in display order, as on feed cards."""
+        if not self.images:
+            return None
+        return min(
+            self.images, key=lambda image: (not image.is_primary, image.image_order or 0, image.created_at)
+        )
+
+
+# Distance indexes and queries need the cube/earthdistance extensions
+event.listen(
+    Property.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS cube; CREATE EXTENSION IF NOT EXISTS earthdistance")
+)
@@ -6,7 +6,8 @@ import logging
 import uuid
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Query, Request, Response, UploadFile
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from src.auth.dependencies import get_current_user
@@ -16,6 +17,9 @@ from src.properties.dependencies import get_property_by_id, get_user_property
 from src.properties.models import Property
 from src.properties.schemas import PropertyCreate, PropertyRead, PropertyUpdate
 from src.properties.service import PropertiesService
+from src.utils.conditional import latest, make_etag, not_modified
+from src.utils.fieldsets import FieldSet, fieldset_query
+from src.utils.pagination import set_cursor_headers
 from src.utils.responses import success_response
 
 logger = logging.getLogger(__name__)
@@ -23,33 +27,54 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+PROPERTY_LIST_JSON = TypeAdapter(List[PropertyRead])
+
+get_property_fieldset = fieldset_query(PropertyRead, "property_id", relations=("images", "primary_image"))
+
 
 @router.get("/", response_model=List[PropertyRead])
 def get_properties(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor"),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header"),
+    fieldset: FieldSet = Depends(get_property_fieldset),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[PropertyRead]:
+) -> Response:
     """
-    Get current user's properties with pagination.
+    Get current user's properties, newest first, with pagination.
+    
+    Cursors for the neighbouring pages are returned in the ``X-Next-Cursor``
+    and ``X-Prev-Cursor`` headers and as a ``Link`` header. ``fields`` and
+    ``include`` narrow both the query and the response, e.g.
+    ``?fields=title,city&include=primary_image``.
     
     Args:
-        skip: Number of records to skip.
-        limit: Maximum number of records to return.
+        request: Current request.
+        response: Response, used to set cursor headers.
+        skip: Legacy offset for the first page.
+        limit: Page size.
+        cursor: Cursor from a previous page.
+        fieldset: Fields to return.
         current_user: Current authenticated user.
         db: Database session.
         
     Returns:
-        List[PropertyRead]: List of current user's properties.
+        Response: JSON list of current user's properties.
     """
     logger.info(f"Getting properties for user: {current_user.user_id} - skip: {skip}, limit: {limit}")
     properties_service = PropertiesService(db)
-    properties = properties_service.get_properties_by_owner(current_user.user_id, skip=skip, limit=limit)
+    page = properties_service.get_properties_page_by_owner(
+        current_user.user_id, limit=limit, cursor=cursor, skip=skip, fieldset=fieldset
+    )
+    set_cursor_headers(request, response, page)
+    properties = page.items
     
-    property_list = [properties_service.convert_property_to_read(prop) for prop in properties]
+    property_list = [properties_service.convert_property_to_read(prop, fieldset) for prop in properties]
     logger.debug(f"Retrieved {len(property_list)} properties")
-    return property_list
+    return fieldset.response(PROPERTY_LIST_JSON, property_list, response)
 
 
 @router.get("/me", response_model=List[PropertyRead])
@@ -78,22 +103,38 @@ def get_my_properties(
 
 @router.get("/{property_id}", response_model=PropertyRead)
 def get_property(
+    request: Request,
+    response: Response,
     property_obj: Property = Depends(get_property_by_id),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> PropertyRead:
+) -> Any:
     """
     Get property by ID.
     
+    Image changes bump the property's ``updated_at``, so the validators cover
+    the images too; a matching ``If-None-Match`` or ``If-Modified-Since``
+    gets an empty 304 without loading them.
+    
     Args:
+        request: Current request.
+        response: Response, used to set validator headers.
         property_obj: Property object from dependency.
         current_user: Current authenticated user.
         db: Database session.
         
     Returns:
-        PropertyRead: Property data.
+        PropertyRead: Property data, or a 304 response.
     """
     logger.info(f"Getting property by ID: {property_obj.property_id}")
+    unchanged = not_modified(
+        request, response,
+        make_etag(property_obj.property_id, property_obj.created_at, property_obj.updated_at),
+        latest(property_obj.created_at, property_obj.updated_at)
+    )
+    if unchanged:
+        return unchanged
+    
     properties_service = PropertiesService(db)
     return properties_service.convert_property_to_read(property_obj)
 
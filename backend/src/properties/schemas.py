@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PropertyBase(BaseModel):
@@ -44,6 +44,8 @@ class PropertyUpdate(BaseModel):
     country: Optional[str] = None
     square_feet: Optional[int] = None
     amenities: Optional[List[str]] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 
 class PropertyRead(PropertyBase):
@@ -54,6 +56,9 @@ class PropertyRead(PropertyBase):
     
     property_id: uuid.UUID
     owner_id: uuid.UUID
-    amenities: Optional[Dict[str, Any]] = None
+    amenities: Optional[List[str]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
     images: Optional[List[Dict[str, Any]]] = None
+    primary_image: Optional[Dict[str, Any]] = None
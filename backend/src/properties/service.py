@@ -3,13 +3,70 @@ Properties domain service.
 """
 import json
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, selectinload
 
 from src.properties.models import Property
 from src.properties.schemas import PropertyCreate, PropertyUpdate, PropertyRead
+from src.utils.cache import bump_version
+from src.utils.fieldsets import FieldSet
+from src.utils.loaders import EntityLoader
+from src.utils.pagination import KeysetSort, Page, SortKey, paginate
+
+PROPERTY_SORT = KeysetSort("newest", [
+    SortKey(Property.created_at, descending=True),
+    SortKey(Property.property_id, descending=True),
+])
+
+ADDRESS_FIELDS = ("address_line1", "address_line2", "city", "state", "country")
+
+# Property columns returned by PropertyRead
+PROPERTY_COLUMNS = (
+    "property_id", "title", "description", "property_type", "address_line1", "address_line2", "city", "state",
+    "country", "square_feet", "owner_id", "amenities", "latitude", "longitude", "created_at",
+)
+
+
+def _image_dict(img: Any) -> Dict[str, Any]:
+    return {
+        "image_id": str(img.image_id),
+        "image_url": img.image_url,
+        "image_name": img.image_name,
+        "is_primary": img.is_primary,
+        "alt_text": img.alt_text,
+        "image_size": img.image_size,
+        "blurhash": img.blurhash,
+        "dominant_color": img.dominant_color,
+        "created_at": img.created_at
+    }
+
+
+def normalize_amenities(amenities: Any) -> Optional[List[str]]:
+    """
+    Normalize amenities to the stored JSON array form.
+    
+    Accepts the legacy ``{"0": "...", "1": "..."}`` mapping as well as lists,
+    trims names and drops blanks and duplicates while keeping order.
+    
+    Args:
+        amenities: Amenities as a list, legacy mapping or None.
+        
+    Returns:
+        Optional[List[str]]: Amenity names, or None if there are none.
+    """
+    if not amenities:
+        return None
+    if isinstance(amenities, dict):
+        amenities = list(amenities.values())
+    
+    names = []
+    for amenity in amenities:
+        name = str(amenity).strip()
+        if name and name not in names:
+            names.append(name)
+    return names or None
 
 
 class PropertiesService:
@@ -20,49 +77,31 @@ class PropertiesService:
     def __init__(self, db: Session):
         self.db = db
     
-    def convert_property_to_read(self, prop: Property) -> PropertyRead:
+    def convert_property_to_read(self, prop: Property, fieldset: Optional[FieldSet] = None) -> PropertyRead:
         """
         Convert Property model to PropertyRead schema.
         
         Args:
             prop: Property model instance.
+            fieldset: Fields to fill; everything by default.
             
         Returns:
             PropertyRead: Converted property schema.
         """
-        property_dict = {
-            "property_id": prop.property_id,
-            "title": prop.title,
-            "description": prop.description,
-            "property_type": prop.property_type,
-            "address_line1": prop.address_line1,
-            "address_line2": prop.address_line2,
-            "city": prop.city,
-            "state": prop.state,
-            "country": prop.country,
-            "square_feet": prop.square_feet,
-            "owner_id": prop.owner_id,
-            "amenities": prop.amenities,
-            "created_at": prop.created_at,
-            "images": None
-        }
+        fieldset = fieldset or FieldSet()
+        property_dict = {name: getattr(prop, name) for name in PROPERTY_COLUMNS if name in fieldset}
+        if "amenities" in property_dict:
+            property_dict["amenities"] = normalize_amenities(property_dict["amenities"])
         
         # Add images if they exist
-        if hasattr(prop, 'images') and prop.images:
-            property_dict["images"] = [
-                {
-                    "image_id": str(img.image_id),
-                    "image_url": img.image_url,
-                    "image_name": img.image_name,
-                    "is_primary": img.is_primary,
-                    "alt_text": img.alt_text,
-                    "image_size": img.image_size,
-                    "created_at": img.created_at
-                }
-                for img in prop.images
-            ]
+        if fieldset.wants_any("images", "primary_image"):
+            primary = prop.primary_image
+            images = [_image_dict(img) for img in prop.images]
+            property_dict["images"] = images or None
+            # Share the primary image's dictionary instead of building it twice
+            property_dict["primary_image"] = images[prop.images.index(primary)] if primary else None
         
-        return PropertyRead.model_validate(property_dict)
+        return fieldset.build(PropertyRead, property_dict)
     
     async def create_property(
         self, 
@@ -174,11 +213,11 @@ class PropertiesService:
         Returns:
             Property: Property object or None.
         """
-        return self.db.query(Property).filter(Property.property_id == property_id).first()
+        return EntityLoader.for_session(self.db).load(Property, property_id)
     
     def get_properties_by_owner(self, owner_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Property]:
         """
-        Get properties by owner ID with pagination.
+        Get properties by owner ID, newest first, with pagination.
         
         Args:
             owner_id: Owner user ID.
@@ -188,20 +227,63 @@ class PropertiesService:
         Returns:
             List[Property]: List of property objects.
         """
-        return self.db.query(Property).filter(Property.owner_id == owner_id).offset(skip).limit(limit).all()
+        return self.db.query(Property).filter(
+            Property.owner_id == owner_id
+        ).order_by(*PROPERTY_SORT.order_by()).offset(skip).limit(limit).all()
     
-    def get_all_properties(self, skip: int = 0, limit: int = 100) -> List[Property]:
+    def get_properties_page_by_owner(
+        self,
+        owner_id: uuid.UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fieldset: Optional[FieldSet] = None
+    ) -> Page[Property]:
         """
-        Get all properties with pagination.
+        Get a page of an owner's properties, newest first, using cursors.
+        
+        Images are loaded for the whole page in one extra query when they
+        are among the requested fields.
         
         Args:
-            skip: Number of records to skip.
-            limit: Maximum number of records to return.
+            owner_id: Owner user ID.
+            limit: Page size.
+            cursor: Cursor from a previous page.
+            skip: Legacy offset, only used for the first page.
+            fieldset: Response fields to load; everything by default.
             
         Returns:
-            List[Property]: List of property objects.
+            Page[Property]: Properties and page cursors.
+            
+        Raises:
+            ValidationError: If the cursor is invalid.
+        """
+        fieldset = fieldset or FieldSet()
+        query = self.db.query(Property).filter(Property.owner_id == owner_id)
+        if not fieldset.is_full:
+            query = query.options(load_only(
+                Property.property_id, Property.created_at,
+                *(getattr(Property, name) for name in PROPERTY_COLUMNS if name in fieldset)
+            ))
+        if fieldset.wants_any("images", "primary_image"):
+            query = query.options(selectinload(Property.images))
+        return paginate(query, PROPERTY_SORT, limit, cursor, start=skip)
+    
+    def get_all_properties(self, limit: int = 100, cursor: Optional[str] = None) -> Page[Property]:
+        """
+        Get a page of all properties, newest first, using cursors.
+        
+        Args:
+            limit: Page size.
+            cursor: Cursor from a previous page.
+            
+        Returns:
+            Page[Property]: Properties and page cursors.
+            
+        Raises:
+            ValidationError: If the cursor is invalid.
         """
-        return self.db.query(Property).offset(skip).limit(limit).all()
+        return paginate(self.db.query(Property), PROPERTY_SORT, limit, cursor)
     
     def _create_property_entity(self, property_data: PropertyCreate, owner_id: uuid.UUID) -> Property:
         """
@@ -215,15 +297,13 @@ class PropertiesService:
             Property: Created property object.
         """
         property_dict = property_data.model_dump()
-        if property_dict.get("amenities"):
-            property_dict["amenities"] = {
-                str(i): amenity for i, amenity in enumerate(property_dict["amenities"])
-            }
+        property_dict["amenities"] = normalize_amenities(property_dict.get("amenities"))
         
         property_obj = Property(**property_dict, owner_id=owner_id)
         
         self.db.add(property_obj)
         self.db.commit()
+        bump_version(Property.__tablename__)
         self.db.refresh(property_obj)
         
         return property_obj
@@ -275,14 +355,22 @@ class PropertiesService:
         update_data = property_data.model_dump(exclude_unset=True)
         
         if "amenities" in update_data and update_data["amenities"]:
-            update_data["amenities"] = {
-                str(i): amenity for i, amenity in enumerate(update_data["amenities"])
-            }
+            update_data["amenities"] = normalize_amenities(update_data["amenities"])
+        
+        # A changed address invalidates geocoded coordinates unless new ones are given
+        address_changed = any(
+            field in update_data and update_data[field] != getattr(property_obj, field)
+            for field in ADDRESS_FIELDS
+        )
+        if address_changed and "latitude" not in update_data and "longitude" not in update_data:
+            update_data["latitude"] = None
+            update_data["longitude"] = None
         
         for field, value in update_data.items():
             setattr(property_obj, field, value)
         
         self.db.commit()
+        bump_version(Property.__tablename__)
         self.db.refresh(property_obj)
         
         return property_obj
@@ -299,4 +387,5 @@ class PropertiesService:
         """
         self.db.delete(property_obj)
         self.db.commit()
+        bump_version(Property.__tablename__)
         return True
@@ -3,5 +3,6 @@ Property images domain package.
 """
 from .service import PropertyImageService
 from .models import PropertyImage
+from .router import router
 
-__all__ = ["PropertyImageService", "PropertyImage"]
+__all__ = ["PropertyImageService", "PropertyImage", "router"]
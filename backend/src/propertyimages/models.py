@@ -4,7 +4,7 @@ Property images domain models.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -16,6 +16,14 @@ class PropertyImage(Base):
     Property image model for storing multiple images per property.
     """
     __tablename__ = "property_images"
+    __table_args__ = (
+        # Gallery listing in display order
+        Index("ix_property_images_property_order", "property_id", "image_order", "created_at"),
+        Index(
+            "ix_property_images_primary", "property_id",
+            postgresql_where=text("is_primary")
+        ),
+    )
     
     image_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     property_id = Column(UUID(as_uuid=True), ForeignKey("properties.property_id"), nullable=False)
@@ -25,6 +33,8 @@ class PropertyImage(Base):
     image_order = Column(Integer, default=0)  # Display order (0 = main image)
     alt_text = Column(String, nullable=True)  # For accessibility
     is_primary = Column(Boolean, default=False)  # Main/featured image
+    blurhash = Column(String(64), nullable=True)  # Placeholder rendered before the image loads
+    dominant_color = Column(String(7), nullable=True)  # Hex color, e.g. "#a1b2c3"
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     
     # Relationship
@@ -0,0 +1,142 @@
+"""
+Property images domain router.
+"""
+import logging
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from src.exceptions import NotFoundError
+from src.properties.dependencies import get_user_property
+from src.properties.models import Property
+from src.propertyimages.dependencies import get_property_image_service
+from src.propertyimages.schemas import (
+    ImageUploadFinalizeRequest, ImageUploadIntentRequest, ImageUploadIntentResponse,
+    PropertyImageRead, PropertyImageReorderRequest, PropertyImageUploadResponse
+)
+from src.propertyimages.service import PropertyImageService
+from src.utils.responses import success_response
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter()
+
+
+@router.post("/{property_id}/images/upload-intents", response_model=Any)
+def create_image_upload_intents(
+    intent_data: ImageUploadIntentRequest,
+    property_obj: Property = Depends(get_user_property),
+    service: PropertyImageService = Depends(get_property_image_service)
+) -> Any:
+    """
+    Issue presigned URLs for uploading property images directly to storage.
+
+    Args:
+        intent_data: Files the client intends to upload.
+        property_obj: Property object from dependency (with ownership check).
+        service: Property image service.
+
+    Returns:
+        Success response with one presigned upload per file.
+    """
+    logger.info(
+        f"Issuing {len(intent_data.files)} upload intents for property {property_obj.property_id}"
+    )
+    uploads = service.create_upload_intents(property_obj.property_id, intent_data.files)
+
+    return success_response(
+        data=ImageUploadIntentResponse(uploads=uploads),
+        message="Upload URLs created successfully"
+    )
+
+
+@router.post("/{property_id}/images/finalize", response_model=Any)
+async def finalize_image_uploads(
+    finalize_data: ImageUploadFinalizeRequest,
+    property_obj: Property = Depends(get_user_property),
+    service: PropertyImageService = Depends(get_property_image_service)
+) -> Any:
+    """
+    Register directly uploaded images once they are in storage.
+
+    Args:
+        finalize_data: Upload tokens of the completed uploads.
+        property_obj: Property object from dependency (with ownership check).
+        service: Property image service.
+
+    Returns:
+        Success response with the created images and per-upload errors.
+    """
+    images, errors = await service.finalize_uploads(
+        property_obj.property_id, finalize_data.uploads
+    )
+    logger.info(
+        f"Finalized {len(images)} images for property {property_obj.property_id} "
+        f"({len(errors)} rejected)"
+    )
+
+    return success_response(
+        data=PropertyImageUploadResponse(
+            uploaded_images=[PropertyImageRead.model_validate(image) for image in images],
+            total_uploaded=len(images),
+            errors=errors
+        ),
+        message="Images finalized successfully"
+    )
+
+
+@router.put("/{property_id}/images/order", response_model=Any)
+def reorder_images(
+    reorder_data: PropertyImageReorderRequest,
+    property_obj: Property = Depends(get_user_property),
+    service: PropertyImageService = Depends(get_property_image_service)
+) -> Any:
+    """
+    Reorder a property's images and optionally change the primary image.
+
+    Args:
+        reorder_data: New position of every image and the optional primary image.
+        property_obj: Property object from dependency (with ownership check).
+        service: Property image service.
+
+    Returns:
+        Success response with the images in their new order.
+    """
+    images = service.reorder_images(
+        property_obj.property_id, reorder_data.image_orders, reorder_data.primary_image_id
+    )
+    return success_response(
+        data=[PropertyImageRead.model_validate(image) for image in images],
+        message="Images reordered successfully"
+    )
+
+
+@router.put("/{property_id}/images/{image_id}/primary", response_model=Any)
+def set_primary_image(
+    image_id: uuid.UUID,
+    property_obj: Property = Depends(get_user_property),
+    service: PropertyImageService = Depends(get_property_image_service)
+) -> Any:
+    """
+    Make an image the property's primary image.
+
+    Args:
+        image_id: Image ID.
+        property_obj: Property object from dependency (with ownership check).
+        service: Property image service.
+
+    Returns:
+        Success response with the primary image.
+
+    Raises:
+        NotFoundError: If the image doesn't belong to the property.
+    """
+    image = service.set_primary_image(property_obj.property_id, image_id)
+    if image is None:
+        raise NotFoundError("Image not found")
+    return success_response(
+        data=PropertyImageRead.model_validate(image),
+        message="Primary image updated successfully"
+    )
@@ -5,7 +5,9 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+from src.storage.schemas import PresignedUpload
 
 
 class PropertyImageBase(BaseModel):
@@ -36,6 +38,8 @@ class PropertyImageRead(PropertyImageBase):
     property_id: uuid.UUID
     image_url: str
     image_size: Optional[int]
+    blurhash: Optional[str] = Field(None, description="BlurHash placeholder")
+    dominant_color: Optional[str] = Field(None, description="Dominant color as hex")
     created_at: datetime
 
 
@@ -46,16 +50,68 @@ class PropertyImageUploadResponse(BaseModel):
     errors: List[str] = []
 
 
+class ImageOrderItem(BaseModel):
+    """New display position of one image."""
+    image_id: uuid.UUID
+    order: int = Field(ge=0, description="Display order")
+
+
 class PropertyImageReorderRequest(BaseModel):
-    """Schema for reordering property images."""
-    image_orders: List[dict] = Field(description="List of {image_id: str, order: int}")
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "image_orders": [
-                    {"image_id": "uuid1", "order": 0},
-                    {"image_id": "uuid2", "order": 1}
-                ]
-            }
+    """Schema for reordering property images, optionally changing the primary image."""
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "image_orders": [
+                {"image_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6", "order": 0},
+                {"image_id": "7c9e6679-7425-40de-944b-e07fc1f90ae7", "order": 1}
+            ],
+            "primary_image_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6"
         }
+    })
+    
+    image_orders: List[ImageOrderItem] = Field(
+        min_length=1, description="Every image of the property with its new position"
+    )
+    primary_image_id: Optional[uuid.UUID] = Field(None, description="Image to make primary")
+    
+    @field_validator("image_orders")
+    @classmethod
+    def check_unique_images(cls, image_orders: List[ImageOrderItem]) -> List[ImageOrderItem]:
+        if len({item.image_id for item in image_orders}) != len(image_orders):
+            raise ValueError("Each image may only appear once")
+        return image_orders
+
+
+class ImageUploadIntentFile(BaseModel):
+    """A file the client intends to upload directly to storage."""
+    filename: str = Field(min_length=1, description="Original filename")
+    content_type: str = Field(description="MIME type the client will upload")
+    size: int = Field(ge=1, description="File size in bytes")
+
+
+class ImageUploadIntentRequest(BaseModel):
+    """Schema for requesting presigned image uploads."""
+    files: List[ImageUploadIntentFile] = Field(min_length=1)
+
+
+class ImageUploadIntent(BaseModel):
+    """Presigned upload issued for a single image."""
+    image_id: uuid.UUID
+    filename: str
+    upload: PresignedUpload
+    upload_token: str = Field(description="Token to pass to the finalize endpoint")
+
+
+class ImageUploadIntentResponse(BaseModel):
+    """Response schema for upload intents."""
+    uploads: List[ImageUploadIntent]
+
+
+class ImageUploadFinalizeItem(BaseModel):
+    """A completed direct upload to register as a property image."""
+    upload_token: str
+    alt_text: Optional[str] = Field(None, description="Alt text for accessibility")
+
+
+class ImageUploadFinalizeRequest(BaseModel):
+    """Schema for finalizing presigned image uploads."""
+    uploads: List[ImageUploadFinalizeItem] = Field(min_length=1)
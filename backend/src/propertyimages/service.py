@@ -1,16 +1,32 @@
 """
 Property images domain service.
 """
+import logging
 import os
 import uuid
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
 from fastapi import UploadFile
-from sqlalchemy.orm import Session
+from jose import JWTError, jwt
+from sqlalchemy import Integer, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session, aliased
 
 from src.config import settings
+from src.exceptions import FileUploadError, ValidationError
+from src.properties.models import Property
 from src.propertyimages.models import PropertyImage
-from src.utils.file_upload import validate_image_file, save_upload_file
+from src.propertyimages.schemas import (
+    ImageOrderItem, ImageUploadFinalizeItem, ImageUploadIntent, ImageUploadIntentFile
+)
+from src.storage import get_storage
+from src.storage.config import storage_config
+from src.utils.cache import bump_version
+from src.utils.file_upload import ALLOWED_EXTENSIONS, validate_image_file, save_upload_file
+from src.utils.image_processing import compute_placeholder, run_in_process
+
+UPLOAD_TOKEN_TYPE = "property_image_upload"
 
 
 class PropertyImageService:
@@ -21,6 +37,17 @@ class PropertyImageService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _touch_property(self, property_id: uuid.UUID) -> None:
+        """
+        Bump the property's ``updated_at`` so its validators cover its images.
+        
+        Args:
+            property_id: Property ID.
+        """
+        self.db.query(Property).filter(Property.property_id == property_id).update(
+            {Property.updated_at: datetime.utcnow()}, synchronize_session=False
+        )
+    
     def get_images_by_property(self, property_id: uuid.UUID) -> List[PropertyImage]:
         """
         Get all images for a property, ordered by image_order.
@@ -108,19 +135,23 @@ class PropertyImageService:
                 image_id = uuid.uuid4()
                 unique_filename = f"{image_id}{file_extension}"
                 
-                # Save the image file (save_upload_file handles the full path construction)
-                logger.debug(f"Saving image {index + 1} to disk...")
-                file_path = await save_upload_file(
+                # Save the image file to the configured storage backend
+                logger.debug(f"Saving image {index + 1} to storage...")
+                stored = await save_upload_file(
                     file, 
                     "properties",  # Just the relative directory name
                     unique_filename
                 )
-                logger.debug(f"Image {index + 1} saved successfully to {file_path}")
+                logger.debug(f"Image {index + 1} saved successfully as {stored.key}")
                 
                 # Get file size
-                file_size = os.path.getsize(file_path)
+                file_size = stored.size
                 logger.debug(f"Image {index + 1} file size: {file_size} bytes")
                 
+                # Compute the placeholder shown while the full image loads
+                await file.seek(0)
+                blurhash, dominant_color = await self._compute_placeholder(await file.read())
+                
                 # Create database record
                 image_order = existing_images_count + index
                 is_primary = (index == 0 and make_first_primary and not has_primary)
@@ -128,11 +159,13 @@ class PropertyImageService:
                 db_image = PropertyImage(
                     image_id=image_id,
                     property_id=property_id,
-                    image_url=f"/images/properties/{unique_filename}",
+                    image_url=get_storage().url(stored.key),
                     image_name=file.filename,
                     image_size=file_size,
                     image_order=image_order,
-                    is_primary=is_primary
+                    is_primary=is_primary,
+                    blurhash=blurhash,
+                    dominant_color=dominant_color
                 )
                 
                 self.db.add(db_image)
@@ -149,7 +182,9 @@ class PropertyImageService:
         if uploaded_images:
             try:
                 logger.debug(f"Committing {len(uploaded_images)} images to database...")
+                self._touch_property(property_id)
                 self.db.commit()
+                bump_version(PropertyImage.__tablename__)
                 # Refresh all objects
                 for image in uploaded_images:
                     self.db.refresh(image)
@@ -164,9 +199,240 @@ class PropertyImageService:
         
         return uploaded_images
     
-    def delete_image(self, image_id: uuid.UUID) -> bool:
+    def create_upload_intents(
+        self,
+        property_id: uuid.UUID,
+        files: List[ImageUploadIntentFile]
+    ) -> List[ImageUploadIntent]:
+        """
+        Issue presigned direct-to-storage uploads for property images.
+
+        Args:
+            property_id: Property ID.
+            files: Files the client intends to upload.
+
+        Returns:
+            List[ImageUploadIntent]: One presigned upload per file.
+
+        Raises:
+            FileUploadError: If the files violate upload limits.
+        """
+        if len(files) > settings.MAX_FILES_PER_UPLOAD:
+            raise FileUploadError(
+                f"Too many files. Maximum {settings.MAX_FILES_PER_UPLOAD} files allowed per upload."
+            )
+
+        total_size = sum(file.size for file in files)
+        if total_size > settings.MAX_TOTAL_UPLOAD_SIZE:
+            raise FileUploadError(
+                f"Total upload size too large. Maximum "
+                f"{settings.MAX_TOTAL_UPLOAD_SIZE / (1024 * 1024):.1f} MB allowed."
+            )
+
+        storage = get_storage()
+        expires_in = storage_config.PRESIGN_EXPIRES_SECONDS
+        intents = []
+
+        for file in files:
+            file_extension = os.path.splitext(file.filename)[1].lower()
+            if file_extension not in ALLOWED_EXTENSIONS:
+                raise FileUploadError(
+                    f"File type '{file_extension}' is not supported. "
+                    f"Allowed types are: {', '.join(ALLOWED_EXTENSIONS)}."
+                )
+            if not file.content_type.startswith("image/"):
+                raise FileUploadError(f"File '{file.filename}' is not an image.")
+            if file.size > settings.MAX_FILE_SIZE:
+                raise FileUploadError(
+                    f"File '{file.filename}' size ({file.size / (1024 * 1024):.2f} MB) "
+                    f"exceeds the maximum limit of {settings.MAX_FILE_SIZE / (1024 * 1024):.1f} MB."
+                )
+
+            image_id = uuid.uuid4()
+            key = f"properties/{image_id}{file_extension}"
+            upload = storage.presign_put(key, content_type=file.content_type, expires_in=expires_in)
+
+            intents.append(ImageUploadIntent(
+                image_id=image_id,
+                filename=file.filename,
+                upload=upload,
+                upload_token=self._create_upload_token(
+                    property_id, image_id, key, file.filename, expires_in
+                )
+            ))
+
+        return intents
+
+    async def finalize_uploads(
+        self,
+        property_id: uuid.UUID,
+        items: List[ImageUploadFinalizeItem],
+        make_first_primary: bool = True
+    ) -> Tuple[List[PropertyImage], List[str]]:
+        """
+        Verify direct uploads in storage and register them as property images.
+
+        Args:
+            property_id: Property ID.
+            items: Completed uploads identified by their upload tokens.
+            make_first_primary: Whether to make the first image primary if no primary exists.
+
+        Returns:
+            Tuple[List[PropertyImage], List[str]]: Created images and per-upload errors.
+
+        Raises:
+            ValidationError: If an upload token is invalid or belongs to another property.
+        """
+        logger = logging.getLogger(__name__)
+        storage = get_storage()
+
+        claims = [self._decode_upload_token(item.upload_token, property_id) for item in items]
+
+        existing_images_count = self.db.query(PropertyImage).filter(
+            PropertyImage.property_id == property_id
+        ).count()
+        has_primary = self.get_primary_image(property_id) is not None
+
+        created_images = []
+        errors = []
+
+        for item, claim in zip(items, claims):
+            image_id = uuid.UUID(claim["img"])
+            key = claim["key"]
+            filename = claim["name"]
+
+            if self.get_image_by_id(image_id):
+                errors.append(f"Image '{filename}' was already finalized.")
+                continue
+
+            stored = await storage.stat(key)
+            if stored is None:
+                errors.append(f"Image '{filename}' was not uploaded.")
+                continue
+
+            problem = None
+            if stored.size == 0:
+                problem = "is empty"
+            elif stored.size > settings.MAX_FILE_SIZE:
+                problem = "exceeds the maximum file size"
+            else:
+                try:
+                    blurhash, dominant_color = await run_in_process(
+                        compute_placeholder, await storage.get(key)
+                    )
+                except Exception:
+                    problem = "is not a valid image"
+
+            if problem:
+                logger.warning(f"Rejecting direct upload {key}: {problem}")
+                await storage.delete(key)
+                errors.append(f"Image '{filename}' {problem}.")
+                continue
+
+            is_primary = make_first_primary and not has_primary and not created_images
+            db_image = PropertyImage(
+                image_id=image_id,
+                property_id=property_id,
+                image_url=storage.url(key),
+                image_name=filename,
+                image_size=stored.size,
+                image_order=existing_images_count + len(created_images),
+                alt_text=item.alt_text,
+                is_primary=is_primary,
+                blurhash=blurhash,
+                dominant_color=dominant_color
+            )
+            self.db.add(db_image)
+            created_images.append(db_image)
+
+        if created_images:
+            try:
+                self._touch_property(property_id)
+                self.db.commit()
+                bump_version(PropertyImage.__tablename__)
+                for image in created_images:
+                    self.db.refresh(image)
+            except Exception as e:
+                logger.error(f"Failed to commit finalized images to database: {str(e)}")
+                self.db.rollback()
+                raise
+
+        return created_images, errors
+
+    def _create_upload_token(
+        self,
+        property_id: uuid.UUID,
+        image_id: uuid.UUID,
+        key: str,
+        filename: str,
+        expires_in: int
+    ) -> str:
+        """
+        Create a signed token binding a presigned upload to a property.
+
+        Args:
+            property_id: Property ID.
+            image_id: Image ID reserved for the upload.
+            key: Storage key of the upload.
+            filename: Original filename.
+            expires_in: Upload URL lifetime in seconds; finalize is allowed for twice as long.
+
+        Returns:
+            str: Signed upload token.
         """
-        Delete an image and its file.
+        claims = {
+            "typ": UPLOAD_TOKEN_TYPE,
+            "sub": str(property_id),
+            "img": str(image_id),
+            "key": key,
+            "name": filename,
+            "exp": datetime.now(timezone.utc) + timedelta(seconds=expires_in * 2)
+        }
+        return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    def _decode_upload_token(self, token: str, property_id: uuid.UUID) -> dict:
+        """
+        Decode and validate an upload token.
+
+        Args:
+            token: Upload token.
+            property_id: Property the upload must belong to.
+
+        Returns:
+            dict: Token claims.
+
+        Raises:
+            ValidationError: If the token is invalid, expired or for another property.
+        """
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            raise ValidationError("Invalid or expired upload token.")
+
+        if claims.get("typ") != UPLOAD_TOKEN_TYPE or claims.get("sub") != str(property_id):
+            raise ValidationError("Upload token does not belong to this property.")
+
+        return claims
+
+    async def _compute_placeholder(self, data: bytes) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Compute the BlurHash and dominant color of an image off the event loop.
+
+        Args:
+            data: Encoded image bytes.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: BlurHash and hex color, or Nones on failure.
+        """
+        try:
+            return await run_in_process(compute_placeholder, data)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Failed to compute image placeholder: {str(e)}")
+            return None, None
+
+    async def delete_image(self, image_id: uuid.UUID) -> bool:
+        """
+        Delete an image and its stored file.
         
         Args:
             image_id: Image ID.
@@ -178,78 +444,118 @@ class PropertyImageService:
         if not db_image:
             return False
         
-        # Delete physical file
+        # Delete stored file
+        storage = get_storage()
         try:
-            # Handle both old and new path structures
-            file_path = os.path.join(settings.UPLOAD_DIR, db_image.image_url.lstrip("/images/"))
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            key = storage.key_from_url(db_image.image_url)
+            if key:
+                await storage.delete(key)
         except Exception:
             pass  # Continue even if file deletion fails
         
         # Delete database record
         self.db.delete(db_image)
+        self._touch_property(db_image.property_id)
         self.db.commit()
+        bump_version(PropertyImage.__tablename__)
         return True
     
     def set_primary_image(self, property_id: uuid.UUID, image_id: uuid.UUID) -> Optional[PropertyImage]:
         """
         Set an image as the primary image for a property.
         
+        A single UPDATE flips ``is_primary`` on all of the property's images.
+        
         Args:
             property_id: Property ID.
             image_id: Image ID to set as primary.
             
         Returns:
-            PropertyImage: Updated primary image or None.
+            PropertyImage: Updated primary image or None if it isn't one of
+                the property's images.
         """
-        # Unset all primary images for the property
-        self.db.query(PropertyImage).filter(
-            PropertyImage.property_id == property_id
-        ).update({"is_primary": False})
-        
-        # Set the specified image as primary
-        db_image = self.db.query(PropertyImage).filter(
-            PropertyImage.image_id == image_id,
-            PropertyImage.property_id == property_id
-        ).first()
+        images = self.db.scalars(
+            update(PropertyImage)
+            .where(PropertyImage.property_id == property_id)
+            .values(is_primary=PropertyImage.image_id == image_id)
+            .returning(PropertyImage)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).all()
         
-        if db_image:
-            db_image.is_primary = True
-            self.db.commit()
-            self.db.refresh(db_image)
+        primary = next((image for image in images if image.image_id == image_id), None)
+        if primary is None:
+            self.db.rollback()
+            return None
         
-        return db_image
+        # RETURNING already loaded the final values; detached, they aren't expired by the commit
+        for image in images:
+            self.db.expunge(image)
+        self._touch_property(property_id)
+        self.db.commit()
+        bump_version(PropertyImage.__tablename__)
+        return primary
     
-    def reorder_images(self, property_id: uuid.UUID, image_orders: List[dict]) -> List[PropertyImage]:
+    def reorder_images(
+        self,
+        property_id: uuid.UUID,
+        image_orders: List[ImageOrderItem],
+        primary_image_id: Optional[uuid.UUID] = None
+    ) -> List[PropertyImage]:
         """
-        Reorder property images.
+        Reorder property images, optionally changing the primary image.
+        
+        The new positions are joined in as a ``VALUES`` list, so one UPDATE
+        moves every image and returns them. The same statement counts the
+        property's images, so it is rolled back unless ``image_orders``
+        names each of them exactly once.
         
         Args:
             property_id: Property ID.
-            image_orders: List of {image_id, order} dictionaries.
+            image_orders: New position of every image of the property.
+            primary_image_id: Image to make primary; the current one is kept if None.
             
         Returns:
-            List[PropertyImage]: Updated image objects.
+            List[PropertyImage]: The property's images in their new order.
+            
+        Raises:
+            ValidationError: If the images don't match the property's images.
         """
-        updated_images = []
+        positions = values(
+            column("image_id", UUID(as_uuid=True)), column("image_order", Integer), name="positions"
+        ).data([(item.image_id, item.order) for item in image_orders])
+        sibling = aliased(PropertyImage)
+        image_count = (
+            select(func.count())
+            .select_from(sibling)
+            .where(sibling.property_id == property_id)
+            .scalar_subquery()
+        )
         
-        for item in image_orders:
-            image_id = uuid.UUID(item["image_id"])
-            order = item["order"]
-            
-            db_image = self.db.query(PropertyImage).filter(
-                PropertyImage.image_id == image_id,
-                PropertyImage.property_id == property_id
-            ).first()
-            
-            if db_image:
-                db_image.image_order = order
-                updated_images.append(db_image)
+        changes = {PropertyImage.image_order: positions.c.image_order}
+        if primary_image_id is not None:
+            changes[PropertyImage.is_primary] = PropertyImage.image_id == primary_image_id
+        
+        rows = self.db.execute(
+            update(PropertyImage)
+            .where(PropertyImage.image_id == positions.c.image_id, PropertyImage.property_id == property_id)
+            .values(changes)
+            .returning(PropertyImage, image_count)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).all()
         
-        if updated_images:
-            self.db.commit()
-            for image in updated_images:
-                self.db.refresh(image)
+        images = [image for image, _ in rows]
+        total = rows[0][1] if rows else None
+        if len(images) != len(image_orders) or total != len(image_orders):
+            self.db.rollback()
+            raise ValidationError("Image order must list every image of the property exactly once.")
+        if primary_image_id is not None and all(image.image_id != primary_image_id for image in images):
+            self.db.rollback()
+            raise ValidationError("Primary image does not belong to this property.")
         
-        return updated_images
+        # RETURNING already loaded the final values; detached, they aren't expired by the commit
+        for image in images:
+            self.db.expunge(image)
+        self._touch_property(property_id)
+        self.db.commit()
+        bump_version(PropertyImage.__tablename__)
+        return sorted(images, key=lambda image: (image.image_order, image.created_at))
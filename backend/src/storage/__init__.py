@@ -0,0 +1,10 @@
+"""
+Storage domain package.
+"""
+from .backends import LocalStorage, S3Storage, StorageBackend, get_storage
+from .router import router
+from .static import StaticImagesMiddleware
+
+__all__ = [
+    "LocalStorage", "S3Storage", "StaticImagesMiddleware", "StorageBackend", "get_storage", "router"
+]
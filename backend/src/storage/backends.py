@@ -0,0 +1,627 @@
+"""
+Storage backends for uploaded files.
+
+Every file the application stores (avatars, property images) goes through a
+``StorageBackend`` addressed by a relative object key such as
+``properties/<uuid>.jpg``. The local driver keeps objects on disk under
+``UPLOAD_DIR``; the S3 driver talks to any S3-compatible object store
+(AWS S3, MinIO, Cloudflare R2, ...).
+"""
+import asyncio
+import hashlib
+import hmac
+import mimetypes
+import os
+import posixpath
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+from urllib.parse import urlencode
+
+import aiofiles
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.config import settings
+from src.exceptions import FileUploadError, NotFoundError
+from src.storage.config import storage_config
+from src.storage.schemas import PresignedUpload, StoredObject
+
+CHUNK_SIZE = 64 * 1024
+
+
+def normalize_key(key: str) -> str:
+    """
+    Normalize and validate an object key.
+
+    Args:
+        key: Object key, optionally with a leading slash.
+
+    Returns:
+        str: Normalized key without leading slash.
+
+    Raises:
+        FileUploadError: If the key is empty or escapes the storage root.
+    """
+    cleaned = posixpath.normpath(key.replace("\\", "/").lstrip("/"))
+    if cleaned in ("", ".", "..") or cleaned.startswith("../"):
+        raise FileUploadError(f"Invalid storage key '{key}'.")
+    return cleaned
+
+
+class StorageBackend(ABC):
+    """
+    Interface implemented by all storage drivers.
+    """
+
+    def __init__(self, public_prefix: str, public_base_url: Optional[str] = None):
+        self.public_prefix = "/" + public_prefix.strip("/")
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+
+    @abstractmethod
+    async def put(
+        self,
+        key: str,
+        data: bytes,
+        content_type: Optional[str] = None
+    ) -> StoredObject:
+        """
+        Store an object, replacing any existing object with the same key.
+
+        Args:
+            key: Object key.
+            data: Object contents.
+            content_type: Optional MIME type.
+
+        Returns:
+            StoredObject: Metadata of the stored object.
+        """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes:
+        """
+        Read a whole object into memory.
+
+        Args:
+            key: Object key.
+
+        Returns:
+            bytes: Object contents.
+
+        Raises:
+            NotFoundError: If the object does not exist.
+        """
+
+    @abstractmethod
+    def stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Stream an object in chunks.
+
+        Args:
+            key: Object key.
+            chunk_size: Maximum size of each chunk.
+
+        Returns:
+            AsyncIterator[bytes]: Object contents in chunks.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """
+        Delete an object.
+
+        Args:
+            key: Object key.
+
+        Returns:
+            bool: True if the object was deleted.
+        """
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """
+        Get object metadata without reading its contents.
+
+        Args:
+            key: Object key.
+
+        Returns:
+            StoredObject: Object metadata or None if it does not exist.
+        """
+
+    @abstractmethod
+    def presign_get(self, key: str, expires_in: Optional[int] = None) -> str:
+        """
+        Build a time-limited URL for downloading an object.
+
+        Args:
+            key: Object key.
+            expires_in: Lifetime in seconds.
+
+        Returns:
+            str: Download URL.
+        """
+
+    @abstractmethod
+    def presign_put(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+        expires_in: Optional[int] = None
+    ) -> PresignedUpload:
+        """
+        Build a time-limited request for uploading an object directly.
+
+        Args:
+            key: Object key.
+            content_type: MIME type the client must send.
+            expires_in: Lifetime in seconds.
+
+        Returns:
+            PresignedUpload: Upload URL, method and required headers.
+        """
+
+    @abstractmethod
+    def static_app(self) -> ASGIApp:
+        """
+        Build the ASGI app mounted at the public URL prefix.
+
+        Returns:
+            ASGIApp: App serving (or redirecting to) stored objects.
+        """
+
+    async def put_stream(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        max_size: Optional[int] = None
+    ) -> StoredObject:
+        """
+        Store an object from an async stream of chunks.
+
+        Args:
+            key: Object key.
+            chunks: Object contents in chunks.
+            content_type: Optional MIME type.
+            max_size: Optional maximum object size in bytes.
+
+        Returns:
+            StoredObject: Metadata of the stored object.
+
+        Raises:
+            FileUploadError: If the stream exceeds ``max_size``.
+        """
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer.extend(chunk)
+            if max_size is not None and len(buffer) > max_size:
+                raise FileUploadError("Uploaded object exceeds the maximum allowed size.")
+        return await self.put(key, bytes(buffer), content_type)
+
+    def url(self, key: str) -> str:
+        """
+        Get the stable public URL stored in the database for an object.
+
+        Args:
+            key: Object key.
+
+        Returns:
+            str: Public URL.
+        """
+        key = normalize_key(key)
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        return f"{self.public_prefix}/{key}"
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        """
+        Resolve the object key behind a public URL.
+
+        Args:
+            url: URL previously returned by ``url``.
+
+        Returns:
+            str: Object key or None if the URL is not managed by this backend.
+        """
+        for base in (self.public_base_url, self.public_prefix):
+            if base and url.startswith(base + "/"):
+                return normalize_key(url[len(base) + 1:])
+        return None
+
+    @staticmethod
+    def guess_content_type(key: str) -> str:
+        """
+        Guess a MIME type from an object key.
+
+        Args:
+            key: Object key.
+
+        Returns:
+            str: MIME type.
+        """
+        return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+class LocalStorage(StorageBackend):
+    """
+    Storage driver keeping objects on the local filesystem.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        signing_secret: str,
+        public_prefix: str = "/images",
+        public_base_url: Optional[str] = None,
+        upload_url_prefix: str = "/api/v1/storage"
+    ):
+        super().__init__(public_prefix, public_base_url)
+        self.root = os.path.abspath(root)
+        self.signing_secret = signing_secret.encode()
+        self.upload_url_prefix = upload_url_prefix.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """
+        Get the filesystem path for an object key.
+
+        Args:
+            key: Object key.
+
+        Returns:
+            str: Absolute file path.
+        """
+        return os.path.join(self.root, *normalize_key(key).split("/"))
+
+    async def put(
+        self,
+        key: str,
+        data: bytes,
+        content_type: Optional[str] = None
+    ) -> StoredObject:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so readers never see partial objects
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(data)
+        os.replace(tmp_path, path)
+
+        return self._stat_path(key, path, content_type)
+
+    async def put_stream(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        max_size: Optional[int] = None
+    ) -> StoredObject:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        written = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    written += len(chunk)
+                    if max_size is not None and written > max_size:
+                        raise FileUploadError("Uploaded object exceeds the maximum allowed size.")
+                    await f.write(chunk)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return self._stat_path(key, path, content_type)
+
+    async def get(self, key: str) -> bytes:
+        try:
+            async with aiofiles.open(self.path(key), "rb") as f:
+                return await f.read()
+        except FileNotFoundError:
+            raise NotFoundError(f"File '{key}' not found")
+
+    async def stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            async with aiofiles.open(self.path(key), "rb") as f:
+                while chunk := await f.read(chunk_size):
+                    yield chunk
+        except FileNotFoundError:
+            raise NotFoundError(f"File '{key}' not found")
+
+    async def delete(self, key: str) -> bool:
+        try:
+            os.remove(self.path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        path = self.path(key)
+        if not os.path.isfile(path):
+            return None
+        return self._stat_path(key, path)
+
+    def presign_get(self, key: str, expires_in: Optional[int] = None) -> str:
+        # Local objects are served publicly from the static mount
+        return self.url(key)
+
+    def presign_put(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+        expires_in: Optional[int] = None
+    ) -> PresignedUpload:
+        key = normalize_key(key)
+        expires = int(time.time()) + (expires_in or storage_config.PRESIGN_EXPIRES_SECONDS)
+        params = {"expires": expires, "signature": self.sign("PUT", key, content_type, expires)}
+        if content_type:
+            params["content_type"] = content_type
+
+        return PresignedUpload(
+            key=key,
+            url=f"{self.upload_url_prefix}/{key}?{urlencode(params)}",
+            headers={"Content-Type": content_type} if content_type else {},
+            expires_at=datetime.fromtimestamp(expires, timezone.utc)
+        )
+
+    def sign(self, method: str, key: str, content_type: Optional[str], expires: int) -> str:
+        """
+        Sign an upload request for the local upload endpoint.
+
+        Args:
+            method: HTTP method.
+            key: Object key.
+            content_type: Required MIME type, if any.
+            expires: Expiry as a unix timestamp.
+
+        Returns:
+            str: Hex encoded HMAC-SHA256 signature.
+        """
+        message = f"{method}\n{normalize_key(key)}\n{content_type or ''}\n{expires}"
+        return hmac.new(self.signing_secret, message.encode(), hashlib.sha256).hexdigest()
+
+    def verify_signature(
+        self,
+        method: str,
+        key: str,
+        content_type: Optional[str],
+        expires: int,
+        signature: str
+    ) -> bool:
+        """
+        Verify a signature produced by ``sign``.
+
+        Args:
+            method: HTTP method.
+            key: Object key.
+            content_type: Required MIME type, if any.
+            expires: Expiry as a unix timestamp.
+            signature: Signature to check.
+
+        Returns:
+            bool: True if the signature is valid and not expired.
+        """
+        if expires < time.time():
+            return False
+        expected = self.sign(method, key, content_type, expires)
+        return hmac.compare_digest(expected, signature)
+
+    def static_app(self) -> ASGIApp:
+        return StaticFiles(directory=self.root)
+
+    def _stat_path(
+        self,
+        key: str,
+        path: str,
+        content_type: Optional[str] = None
+    ) -> StoredObject:
+        st = os.stat(path)
+        return StoredObject(
+            key=normalize_key(key),
+            size=st.st_size,
+            content_type=content_type or self.guess_content_type(key),
+            etag=f"{st.st_mtime_ns:x}-{st.st_size:x}",
+            last_modified=datetime.fromtimestamp(st.st_mtime, timezone.utc)
+        )
+
+
+class S3Storage(StorageBackend):
+    """
+    Storage driver for S3-compatible object stores.
+
+    Requires the optional ``boto3`` dependency (``pip install raiders-sublease[s3]``).
+    Blocking client calls run in worker threads.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        force_path_style: bool = True,
+        public_prefix: str = "/images",
+        public_base_url: Optional[str] = None
+    ):
+        super().__init__(public_prefix, public_base_url)
+        try:
+            import boto3
+            from botocore.config import Config as BotoConfig
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError(
+                "The S3 storage backend requires boto3. "
+                "Install it with `uv sync --extra s3`."
+            ) from e
+
+        self.bucket = bucket
+        self._client_error = ClientError
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=BotoConfig(
+                signature_version="s3v4",
+                s3={"addressing_style": "path" if force_path_style else "auto"}
+            )
+        )
+
+    async def put(
+        self,
+        key: str,
+        data: bytes,
+        content_type: Optional[str] = None
+    ) -> StoredObject:
+        key = normalize_key(key)
+        content_type = content_type or self.guess_content_type(key)
+        response = await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type
+        )
+        return StoredObject(
+            key=key,
+            size=len(data),
+            content_type=content_type,
+            etag=response.get("ETag", "").strip('"') or None,
+            last_modified=datetime.now(timezone.utc)
+        )
+
+    async def get(self, key: str) -> bytes:
+        response = await self._get_object(key)
+        return await asyncio.to_thread(response["Body"].read)
+
+    async def stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        response = await self._get_object(key)
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str) -> bool:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=normalize_key(key)
+        )
+        return True
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        key = normalize_key(key)
+        try:
+            response = await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=key
+            )
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(
+            key=key,
+            size=response["ContentLength"],
+            content_type=response.get("ContentType"),
+            etag=response.get("ETag", "").strip('"') or None,
+            last_modified=response.get("LastModified")
+        )
+
+    def presign_get(self, key: str, expires_in: Optional[int] = None) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": normalize_key(key)},
+            ExpiresIn=expires_in or storage_config.PRESIGN_EXPIRES_SECONDS
+        )
+
+    def presign_put(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+        expires_in: Optional[int] = None
+    ) -> PresignedUpload:
+        key = normalize_key(key)
+        expires_in = expires_in or storage_config.PRESIGN_EXPIRES_SECONDS
+        params = {"Bucket": self.bucket, "Key": key}
+        if content_type:
+            params["ContentType"] = content_type
+
+        url = self.client.generate_presigned_url(
+            "put_object", Params=params, ExpiresIn=expires_in
+        )
+        return PresignedUpload(
+            key=key,
+            url=url,
+            headers={"Content-Type": content_type} if content_type else {},
+            expires_at=datetime.fromtimestamp(time.time() + expires_in, timezone.utc)
+        )
+
+    def static_app(self) -> ASGIApp:
+        return _PresignedRedirectApp(self)
+
+    async def _get_object(self, key: str) -> dict:
+        try:
+            return await asyncio.to_thread(
+                self.client.get_object, Bucket=self.bucket, Key=normalize_key(key)
+            )
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise NotFoundError(f"File '{key}' not found")
+            raise
+
+
+class _PresignedRedirectApp:
+    """
+    ASGI app redirecting public object URLs to presigned object store URLs.
+    """
+
+    def __init__(self, storage: StorageBackend):
+        self.storage = storage
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = scope["path"][len(scope.get("root_path", "")):].lstrip("/")
+        response = RedirectResponse(self.storage.presign_get(key), status_code=307)
+        await response(scope, receive, send)
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """
+    Get the configured storage backend.
+
+    Returns:
+        StorageBackend: Process-wide storage backend instance.
+    """
+    if storage_config.BACKEND == "s3":
+        if not storage_config.S3_BUCKET:
+            raise RuntimeError("STORAGE_S3_BUCKET must be set when STORAGE_BACKEND=s3")
+        return S3Storage(
+            bucket=storage_config.S3_BUCKET,
+            endpoint_url=storage_config.S3_ENDPOINT_URL,
+            region=storage_config.S3_REGION,
+            access_key_id=storage_config.S3_ACCESS_KEY_ID,
+            secret_access_key=storage_config.S3_SECRET_ACCESS_KEY,
+            force_path_style=storage_config.S3_FORCE_PATH_STYLE,
+            public_prefix=storage_config.PUBLIC_URL_PREFIX,
+            public_base_url=storage_config.PUBLIC_BASE_URL
+        )
+
+    if storage_config.BACKEND != "local":
+        raise RuntimeError(f"Unknown storage backend '{storage_config.BACKEND}'")
+
+    return LocalStorage(
+        root=storage_config.LOCAL_ROOT or settings.UPLOAD_DIR,
+        signing_secret=storage_config.SIGNING_SECRET or settings.SECRET_KEY,
+        public_prefix=storage_config.PUBLIC_URL_PREFIX,
+        public_base_url=storage_config.PUBLIC_BASE_URL
+    )
@@ -0,0 +1,31 @@
+"""
+Storage configuration.
+"""
+from typing import Optional
+
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+
+class StorageConfig(BaseSettings):
+    """
+    Storage backend configuration settings.
+    """
+    model_config = ConfigDict(env_file=".env", env_prefix="STORAGE_", extra="ignore")
+
+    BACKEND: str = "local"  # "local" or "s3"
+    LOCAL_ROOT: Optional[str] = None  # Defaults to settings.UPLOAD_DIR
+    PUBLIC_URL_PREFIX: str = "/images"
+    PUBLIC_BASE_URL: Optional[str] = None  # e.g. CDN or public bucket URL
+    PRESIGN_EXPIRES_SECONDS: int = 900
+    SIGNING_SECRET: Optional[str] = None  # Defaults to settings.SECRET_KEY
+
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None  # Set for MinIO and other S3-compatible stores
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_FORCE_PATH_STYLE: bool = True
+
+
+storage_config = StorageConfig()
@@ -0,0 +1,66 @@
+"""
+Storage domain router.
+
+Receives presigned uploads when the local filesystem driver is active. With the
+S3 driver, clients upload straight to the object store and never reach this app.
+"""
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from src.config import settings
+from src.exceptions import AuthorizationError, ValidationError
+from src.storage.backends import LocalStorage, StorageBackend, get_storage
+from src.utils.responses import success_response
+
+
+router = APIRouter()
+
+
+@router.put("/{key:path}", response_model=Any)
+async def upload_object(
+    key: str,
+    request: Request,
+    expires: int = Query(..., description="Expiry timestamp of the presigned URL"),
+    signature: str = Query(..., description="Presigned URL signature"),
+    content_type: Optional[str] = Query(None, description="Content type bound to the signature"),
+    storage: StorageBackend = Depends(get_storage)
+) -> Any:
+    """
+    Store an object uploaded through a presigned PUT URL.
+
+    Args:
+        key: Object key.
+        request: Incoming request; its body is streamed to storage.
+        expires: Expiry timestamp of the presigned URL.
+        signature: Presigned URL signature.
+        content_type: Content type bound to the signature.
+        storage: Storage backend.
+
+    Returns:
+        Success response with stored object metadata.
+
+    Raises:
+        ValidationError: If presigned uploads are not handled by this app.
+        AuthorizationError: If the signature is invalid or expired.
+    """
+    if not isinstance(storage, LocalStorage):
+        raise ValidationError("Presigned uploads go directly to object storage.")
+
+    if not storage.verify_signature("PUT", key, content_type, expires, signature):
+        raise AuthorizationError("Invalid or expired upload signature")
+
+    if content_type and request.headers.get("content-type") != content_type:
+        raise ValidationError(f"Content-Type must be '{content_type}'.")
+
+    stored = await storage.put_stream(
+        key,
+        request.stream(),
+        content_type=content_type,
+        max_size=settings.MAX_FILE_SIZE
+    )
+
+    return success_response(
+        data=stored,
+        message="File uploaded successfully"
+    )
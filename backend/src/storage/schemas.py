@@ -0,0 +1,25 @@
+"""
+Storage domain schemas.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class StoredObject(BaseModel):
+    """Metadata for an object held by a storage backend."""
+    key: str = Field(description="Backend-relative object key, e.g. 'properties/<id>.jpg'")
+    size: int = Field(description="Object size in bytes")
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+class PresignedUpload(BaseModel):
+    """A presigned request the client can use to upload an object directly."""
+    key: str
+    url: str
+    method: str = "PUT"
+    headers: Dict[str, str] = {}
+    expires_at: datetime
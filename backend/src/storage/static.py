@@ -0,0 +1,264 @@
+"""
+Fast path for serving stored images.
+
+``StaticImagesMiddleware`` sits at the very front of the ASGI stack (in front
+of CORS, the request limit middleware and FastAPI routing) and answers
+``GET``/``HEAD`` requests for the public image prefix itself. With the local
+driver it supports conditional requests (``If-None-Match`` /
+``If-Modified-Since``), single byte ranges, long-lived immutable caching and
+zero-copy transfer when the server offers the ASGI ``zerocopysend`` or
+``pathsend`` extensions. Other drivers delegate to the backend's static app.
+
+Because image requests never reach the application's middleware, the
+application's CORS policy is passed in and applied to them here, so
+cross-origin ``fetch()`` and canvas reads keep working.
+"""
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.exceptions import FileUploadError
+from src.storage.backends import CHUNK_SIZE, LocalStorage, StorageBackend, normalize_key
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def cache_control_for(key: str) -> str:
+    """
+    Get the Cache-Control policy for an object key.
+
+    Property images are written once under a unique key, so they can be
+    cached forever. Legacy avatars live at a fixed ``avatars/<user_id>...``
+    key that is overwritten on change and must be revalidated.
+
+    Args:
+        key: Object key.
+
+    Returns:
+        str: Cache-Control header value.
+    """
+    if key.startswith("avatars/") and key.count("/") == 1:
+        return REVALIDATE_CACHE_CONTROL
+    return IMMUTABLE_CACHE_CONTROL
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        header: Range header value, e.g. ``bytes=0-1023``.
+        size: Size of the representation in bytes.
+
+    Returns:
+        Tuple[int, int]: Inclusive (start, end) offsets, or None if unsatisfiable.
+
+    Raises:
+        ValueError: If the header is malformed or asks for several ranges.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("Unsupported range")
+
+    start_str, _, end_str = spec.strip().partition("-")
+    if not start_str:
+        # Suffix range: the last N bytes
+        length = int(end_str)
+        if length <= 0:
+            return None
+        return max(size - length, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size:
+        return None
+    if start > end:
+        raise ValueError("Invalid range")
+    return start, min(end, size - 1)
+
+
+class StaticImagesMiddleware:
+    """
+    ASGI middleware serving public image URLs ahead of the application.
+    """
+
+    def __init__(self, app: ASGIApp, storage: StorageBackend, cors_options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            app: Application handling every other request.
+            storage: Storage backend holding the images.
+            cors_options: ``CORSMiddleware`` options of the application, applied
+                to image responses (including preflight requests); None for no CORS.
+        """
+        self.app = app
+        self.storage = storage
+        self.prefix = storage.public_prefix + "/"
+        self.images: ASGIApp = self._serve
+        if cors_options is not None:
+            self.images = CORSMiddleware(self._serve, **cors_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        await self.images(scope, receive, send)
+
+    async def _serve(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["method"] not in ("GET", "HEAD"):
+            await self._send_empty(send, 405, [(b"allow", b"GET, HEAD")])
+            return
+
+        if not isinstance(self.storage, LocalStorage):
+            # Object stores serve the bytes themselves; hand out a presigned URL
+            try:
+                key = normalize_key(scope["path"][len(self.prefix):])
+            except FileUploadError:
+                await self._send_empty(send, 404)
+                return
+            response = RedirectResponse(self.storage.presign_get(key), status_code=307)
+            await response(scope, receive, send)
+            return
+
+        await self._serve_local(scope, send)
+
+    async def _serve_local(self, scope: Scope, send: Send) -> None:
+        storage: LocalStorage = self.storage  # type: ignore[assignment]
+        try:
+            key = normalize_key(scope["path"][len(self.prefix):])
+            path = storage.path(key)
+            st = os.stat(path)
+        except (FileUploadError, OSError):
+            await self._send_empty(send, 404)
+            return
+
+        if not os.path.isfile(path):
+            await self._send_empty(send, 404)
+            return
+
+        size = st.st_size
+        etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", (mimetypes.guess_type(key)[0] or "application/octet-stream").encode()),
+            (b"etag", etag.encode()),
+            (b"last-modified", formatdate(st.st_mtime, usegmt=True).encode()),
+            (b"cache-control", cache_control_for(key).encode()),
+            (b"accept-ranges", b"bytes"),
+        ]
+        request_headers = dict(scope["headers"])
+
+        if self._not_modified(request_headers, etag, st.st_mtime):
+            await self._send_empty(send, 304, headers)
+            return
+
+        status = 200
+        start, end = 0, size - 1
+        range_header = request_headers.get(b"range")
+        if range_header and size > 0 and self._if_range_matches(request_headers, etag):
+            try:
+                byte_range = parse_range(range_header.decode("latin-1"), size)
+            except ValueError:
+                byte_range = (0, size - 1)  # Ignore malformed or multi-range requests
+
+            if byte_range is None:
+                await self._send_empty(
+                    send, 416, [(b"content-range", f"bytes */{size}".encode())]
+                )
+                return
+
+            start, end = byte_range
+            if (start, end) != (0, size - 1):
+                status = 206
+                headers.append((b"content-range", f"bytes {start}-{end}/{size}".encode()))
+
+        length = end - start + 1 if size else 0
+        headers.append((b"content-length", str(length).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+
+        if scope["method"] == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await self._send_file(scope, send, path, start, length, full=(status == 200))
+
+    async def _send_file(
+        self,
+        scope: Scope,
+        send: Send,
+        path: str,
+        start: int,
+        length: int,
+        full: bool
+    ) -> None:
+        extensions = scope.get("extensions") or {}
+
+        if "http.response.zerocopysend" in extensions:
+            with open(path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": start,
+                    "count": length,
+                })
+            return
+
+        if full and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": path})
+            return
+
+        async with await anyio.open_file(path, "rb") as f:
+            await f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    def _not_modified(request_headers: dict, etag: str, mtime: float) -> bool:
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.decode().split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request_headers.get(b"if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since.decode())
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since.timestamp()
+
+        return False
+
+    @staticmethod
+    def _if_range_matches(request_headers: dict, etag: str) -> bool:
+        if_range = request_headers.get(b"if-range")
+        return if_range is None or if_range.decode().strip() == etag
+
+    @staticmethod
+    async def _send_empty(
+        send: Send,
+        status: int,
+        headers: Optional[List[Tuple[bytes, bytes]]] = None
+    ) -> None:
+        headers = list(headers or [])
+        if status != 304:
+            headers.append((b"content-length", b"0"))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,18 @@
+"""
+Subleases configuration.
+"""
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+
+class SubLeaseConfig(BaseSettings):
+    """
+    Sublease configuration settings.
+    """
+    model_config = ConfigDict(env_file=".env", env_prefix="SUBLEASE_", extra="ignore")
+
+    EXPIRY_INTERVAL_SECONDS: int = 900  # How often expired listings are swept
+    EXPIRY_BATCH_SIZE: int = 1000  # Listings expired per transaction
+
+
+sublease_config = SubLeaseConfig()
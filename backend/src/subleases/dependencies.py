@@ -2,16 +2,19 @@
 Subleases domain dependencies.
 """
 import uuid
-from typing import Optional
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Query
 from sqlalchemy.orm import Session
 
 from src.auth.dependencies import get_current_user
 from src.auth.models import User
 from src.database import get_db
-from src.exceptions import NotFoundError, AuthorizationError
+from src.exceptions import NotFoundError, AuthorizationError, ValidationError
 from src.subleases.models import SubLease
+from src.subleases.schemas import SubLeaseFilters
 from src.subleases.service import SubLeaseService
 
 
@@ -96,3 +99,100 @@ def get_user_property_sublease(
         raise AuthorizationError("Not authorized to access this sublease")
     
     return sublease
+
+
+def get_sublease_filters(
+    q: Optional[str] = Query(
+        None, max_length=200, description="Full-text search over titles, descriptions and address"
+    ),
+    move_in: Optional[date] = Query(None, description="Date the tenant moves in"),
+    move_out: Optional[date] = Query(None, description="Date the tenant moves out"),
+    stay_days: Optional[int] = Query(
+        None, ge=1, description="Length of stay in days (defaults to move_out - move_in)"
+    ),
+    min_rate: Optional[Decimal] = Query(None, ge=0, description="Minimum rate"),
+    max_rate: Optional[Decimal] = Query(None, ge=0, description="Maximum rate"),
+    property_type: Optional[str] = Query(None, description="Property type"),
+    city: Optional[str] = Query(None, description="City (case-insensitive)"),
+    state: Optional[str] = Query(None, description="State (case-insensitive)"),
+    min_square_feet: Optional[int] = Query(None, ge=0, description="Minimum square footage"),
+    max_square_feet: Optional[int] = Query(None, ge=0, description="Maximum square footage"),
+    amenities: List[str] = Query([], description="Amenities the property must all have"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Latitude to measure distance from"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180, description="Longitude to measure distance from"),
+    radius_km: Optional[float] = Query(None, gt=0, le=500, description="Maximum distance in km"),
+    min_latitude: Optional[float] = Query(None, ge=-90, le=90, description="Viewport south edge"),
+    max_latitude: Optional[float] = Query(None, ge=-90, le=90, description="Viewport north edge"),
+    min_longitude: Optional[float] = Query(None, ge=-180, le=180, description="Viewport west edge"),
+    max_longitude: Optional[float] = Query(None, ge=-180, le=180, description="Viewport east edge")
+) -> SubLeaseFilters:
+    """
+    Get sublease browse filters from query parameters dependency.
+    
+    Args:
+        q: Full-text search query.
+        move_in: Date the tenant moves in.
+        move_out: Date the tenant moves out.
+        stay_days: Length of stay in days.
+        min_rate: Minimum rate.
+        max_rate: Maximum rate.
+        property_type: Property type.
+        city: City.
+        state: State.
+        min_square_feet: Minimum square footage.
+        max_square_feet: Maximum square footage.
+        amenities: Required amenities.
+        latitude: Latitude of the distance reference point.
+        longitude: Longitude of the distance reference point.
+        radius_km: Maximum distance from the reference point.
+        min_latitude: Viewport south edge.
+        max_latitude: Viewport north edge.
+        min_longitude: Viewport west edge.
+        max_longitude: Viewport east edge (may be less than the west edge across the antimeridian).
+        
+    Returns:
+        SubLeaseFilters: Parsed filters.
+        
+    Raises:
+        ValidationError: If a range is inverted.
+    """
+    if move_in and move_out and move_out < move_in:
+        raise ValidationError("move_out must be on or after move_in")
+    if min_rate is not None and max_rate is not None and max_rate < min_rate:
+        raise ValidationError("max_rate must be greater than or equal to min_rate")
+    if (
+        min_square_feet is not None and max_square_feet is not None
+        and max_square_feet < min_square_feet
+    ):
+        raise ValidationError("max_square_feet must be greater than or equal to min_square_feet")
+    if (latitude is None) != (longitude is None):
+        raise ValidationError("latitude and longitude must be given together")
+    if radius_km is not None and latitude is None:
+        raise ValidationError("radius_km requires latitude and longitude")
+    bounds = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if any(edge is not None for edge in bounds) and None in bounds:
+        raise ValidationError("min_latitude, max_latitude, min_longitude and max_longitude must be given together")
+    if min_latitude is not None and max_latitude < min_latitude:
+        raise ValidationError("max_latitude must be greater than or equal to min_latitude")
+    
+    return SubLeaseFilters(
+        q=q.strip() if q and q.strip() else None,
+        move_in=move_in,
+        move_out=move_out,
+        stay_days=stay_days,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        property_type=property_type,
+        city=city,
+        state=state,
+        min_square_feet=min_square_feet,
+        max_square_feet=max_square_feet,
+        amenities=[amenity.strip() for amenity in amenities if amenity.strip()],
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        min_latitude=min_latitude,
+        max_latitude=max_latitude,
+        min_longitude=min_longitude,
+        max_longitude=max_longitude
+    )
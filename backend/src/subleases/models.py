@@ -6,9 +6,11 @@ from datetime import datetime, date
 from decimal import Decimal
 from enum import Enum
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Numeric, Date, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean, Column, Computed, DateTime, Float, ForeignKey, Index, Integer, String, Numeric, Date, func, text
+)
+from sqlalchemy.dialects.postgresql import DATERANGE, JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
 from src.database import Base
 
@@ -26,6 +28,36 @@ class SubLease(Base):
     SubLease model for database table.
     """
     __tablename__ = "subleases"
+    __table_args__ = (
+        Index("ix_subleases_availability", "availability", postgresql_using="gist"),
+        Index("ix_subleases_rate", "rate"),
+        Index("ix_subleases_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination orderings (see SUBLEASE_SORTS); browse traffic
+        # filters on active listings, so those indexes only cover live rows
+        Index("ix_subleases_created_at_id", "created_at", "sublease_id"),
+        Index(
+            "ix_subleases_active_created_at_id", "created_at", "sublease_id",
+            postgresql_where=text("status = 'active'")
+        ),
+        Index(
+            "ix_subleases_active_rate_id", "rate", "sublease_id",
+            postgresql_where=text("status = 'active'")
+        ),
+        Index(
+            "ix_subleases_active_available_from_id", "available_from", "sublease_id",
+            postgresql_where=text("status = 'active'")
+        ),
+        # "My listings" and per-property lookups
+        Index("ix_subleases_lessor_created_at", "lessor_id", "created_at"),
+        Index("ix_subleases_property_id", "property_id"),
+        # Incremental exports from a last-change watermark (see src.exports)
+        Index("ix_subleases_changed_at", text("coalesce(updated_at, created_at)")),
+        # Expiry sweep (see src.subleases.tasks)
+        Index(
+            "ix_subleases_active_available_until", "available_until",
+            postgresql_where=text("status = 'active'")
+        ),
+    )
     
     sublease_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     property_id = Column(UUID(as_uuid=True), ForeignKey("properties.property_id"), nullable=False)
@@ -37,11 +69,93 @@ class SubLease(Base):
     maximum_stay_days = Column(Integer, nullable=True)
     available_from = Column(Date, nullable=False)
     available_until = Column(Date, nullable=False)
+    # Inclusive availability window, maintained by Postgres for indexed date searches
+    availability = Column(
+        DATERANGE,
+        Computed("daterange(available_from, available_until, '[]')", persisted=True)
+    )
     status = Column(String(20), nullable=False, default=SubLeaseStatus.ACTIVE.value)
+    # Weighted full-text document, maintained by triggers (see src.subleases.search)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
     
     # Relationships
     property = relationship("Property", back_populates="subleases")
     lessor = relationship("User", back_populates="subleases")
-    ratings = relationship("UserRating", back_populates="sublease")
\ No newline at end of file
+    ratings = relationship("UserRating", back_populates="sublease")
+
+class SubLeaseCard(Base):
+    """
+    Denormalized browse row for one active sublease.
+
+    Holds the listing with its property's filterable columns, primary image
+    and lessor summary so the browse feed reads a single table. Rows are
+    maintained by Postgres triggers (see src.subleases.feed) and only exist
+    while the sublease is active.
+    """
+    __tablename__ = "sublease_cards"
+    __table_args__ = (
+        Index("ix_sublease_cards_created_at_id", "created_at", "sublease_id"),
+        Index("ix_sublease_cards_rate_id", "rate", "sublease_id"),
+        Index("ix_sublease_cards_available_from_id", "available_from", "sublease_id"),
+        Index("ix_sublease_cards_reputation_id", "lessor_reputation_score", "sublease_id"),
+        Index("ix_sublease_cards_availability", "availability", postgresql_using="gist"),
+        Index("ix_sublease_cards_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_sublease_cards_amenities", "amenities",
+            postgresql_using="gin", postgresql_ops={"amenities": "jsonb_path_ops"}
+        ),
+        Index("ix_sublease_cards_state_city", text("lower(state)"), text("lower(city)")),
+        Index("ix_sublease_cards_property_type", "property_type"),
+        Index(
+            "ix_sublease_cards_earth_location", text("ll_to_earth(latitude, longitude)"),
+            postgresql_using="gist"
+        ),
+        # Trigger refreshes look rows up by property and lessor
+        Index("ix_sublease_cards_property_id", "property_id"),
+        Index("ix_sublease_cards_lessor_id", "lessor_id"),
+    )
+    
+    sublease_id = Column(
+        UUID(as_uuid=True), ForeignKey("subleases.sublease_id", ondelete="CASCADE"), primary_key=True
+    )
+    property_id = Column(UUID(as_uuid=True), nullable=False)
+    lessor_id = Column(UUID(as_uuid=True), nullable=False)
+    title = Column(String(200), nullable=False)
+    rate = Column(Numeric(10, 2), nullable=False)
+    minimum_stay_days = Column(Integer, nullable=False)
+    maximum_stay_days = Column(Integer, nullable=True)
+    available_from = Column(Date, nullable=False)
+    available_until = Column(Date, nullable=False)
+    availability = Column(
+        DATERANGE,
+        Computed("daterange(available_from, available_until, '[]')", persisted=True)
+    )
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    created_at = Column(DateTime, nullable=False)
+    
+    # Property
+    property_title = Column(String(100), nullable=False)
+    property_type = Column(String(50), nullable=True)
+    city = Column(String(60), nullable=False)
+    state = Column(String(60), nullable=False)
+    square_feet = Column(Integer, nullable=True)
+    amenities = Column(JSONB(none_as_null=True), nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    
+    # Primary image, falling back to the first image in display order
+    image_url = Column(String, nullable=True)
+    image_blurhash = Column(String(64), nullable=True)
+    image_dominant_color = Column(String(7), nullable=True)
+    
+    # Lessor
+    lessor_first_name = Column(String, nullable=False)
+    lessor_last_name = Column(String, nullable=False)
+    lessor_profile_image_url = Column(String, nullable=True)
+    lessor_average_rating = Column(Float, nullable=True)
+    lessor_total_ratings = Column(Integer, nullable=False, default=0)
+    lessor_reputation_score = Column(Float, nullable=False, default=0)
+    
+    refreshed_at = Column(DateTime, nullable=False, server_default=func.now())
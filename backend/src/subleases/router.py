@@ -2,49 +2,110 @@
 Subleases domain router.
 """
 import uuid
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
 from src.auth.dependencies import get_current_user
 from src.auth.models import User
 from src.database import get_db
-from src.subleases.dependencies import get_sublease_by_id, get_user_sublease
-from src.subleases.models import SubLease, SubLeaseStatus
+from src.exceptions import NotFoundError
+from src.properties.geo import haversine_km
+from src.subleases.dependencies import get_sublease_filters, get_user_sublease
+from src.subleases.models import SubLease, SubLeaseCard, SubLeaseStatus
 from src.subleases.schemas import (
-    SubLeaseCreate, SubLeaseRead, SubLeaseUpdate, SubLeaseDetail, SubLeaseMyRead,
-    PropertyImageRead, LessorRead
+    SubLeaseCreate, SubLeaseFilters, SubLeaseRead, SubLeaseUpdate, SubLeaseDetail, SubLeaseMyRead,
+    FacetCount, SubLeaseFacets, SubLeaseSearchResponse, SubLeaseSort,
+    SubLeaseCardRead
 )
-from src.subleases.service import SubLeaseService
+from src.subleases.service import LISTING_COLUMNS, LISTING_PROPERTY_FIELDS, SubLeaseService
+from src.utils.cache import get_response_cache
+from src.utils.conditional import latest, make_etag, not_modified
+from src.utils.fieldsets import FieldSet, fieldset_query
+from src.utils.pagination import set_cursor_headers
+from src.utils.serialization import orm_model
 from src.utils.responses import success_response
 
 
 router = APIRouter()
 
+# Tables each cached response is built from; a write to any of them invalidates it
+LISTING_TABLES = ("subleases", "properties", "property_images", "users")
+FEED_TABLES = LISTING_TABLES + ("user_ratings",)
 
-def _convert_sublease_to_read(sublease: SubLease) -> SubLeaseRead:
-    """Convert SubLease model to SubLeaseRead schema with property images and lessor details."""
-    sublease_dict = {
-        "sublease_id": sublease.sublease_id,
-        "property_id": sublease.property_id,
-        "lessor_id": sublease.lessor_id,
-        "title": sublease.title,
-        "description": sublease.description,
-        "rate": sublease.rate,
-        "minimum_stay_days": sublease.minimum_stay_days,
-        "maximum_stay_days": sublease.maximum_stay_days,
-        "available_from": sublease.available_from,
-        "available_until": sublease.available_until,
-        "status": sublease.status,
-        "created_at": sublease.created_at,
-        "property_images": [
-            PropertyImageRead.model_validate(image) 
-            for image in (sublease.property.images if sublease.property else [])
-        ],
-        "lessor": LessorRead.model_validate(sublease.lessor) if sublease.lessor else None
-    }
-    return SubLeaseRead.model_validate(sublease_dict)
+SUBLEASE_LIST_JSON = TypeAdapter(List[SubLeaseRead])
+SUBLEASE_CARDS_JSON = TypeAdapter(List[SubLeaseCardRead])
+
+get_listing_fieldset = fieldset_query(
+    SubLeaseRead, "sublease_id", relations=("property_images", "primary_image", "lessor")
+)
+get_card_fieldset = fieldset_query(SubLeaseCardRead, "sublease_id")
+
+# Card fields stored in the read model; the rest are computed per request
+CARD_COLUMNS = tuple(name for name in SubLeaseCardRead.model_fields if name in SubLeaseCard.__table__.columns)
+
+
+def _convert_sublease_to_read(
+    sublease: SubLease,
+    highlight: Optional[str] = None,
+    origin: Optional[Tuple[float, float]] = None,
+    fieldset: Optional[FieldSet] = None
+) -> SubLeaseRead:
+    """Convert SubLease model to SubLeaseRead schema with property images, lessor details and location."""
+    fieldset = fieldset or FieldSet()
+    sublease_dict = {name: getattr(sublease, name) for name in LISTING_COLUMNS if name in fieldset}
+    
+    prop = sublease.property if fieldset.wants_any(*LISTING_PROPERTY_FIELDS) else None
+    if fieldset.wants_any("property_images", "primary_image"):
+        sublease_dict["property_images"] = prop.images if prop else []
+        sublease_dict["primary_image"] = prop.primary_image if prop else None
+    if "lessor" in fieldset:
+        sublease_dict["lessor"] = sublease.lessor
+    sublease_dict.update(
+        latitude=prop.latitude if prop else None,
+        longitude=prop.longitude if prop else None,
+        distance_km=haversine_km(*origin, prop.latitude, prop.longitude) if origin and prop else None,
+        highlight=highlight
+    )
+    return fieldset.build(SubLeaseRead, sublease_dict)
+
+
+def _loaded(obj: Any, relationship: str) -> Any:
+    """Get a relationship's value if it was loaded, without triggering a lazy load."""
+    return None if relationship in inspect(obj).unloaded else getattr(obj, relationship)
+
+
+def _sublease_stamp(sublease: SubLease) -> Tuple[Any, ...]:
+    """Get the values a sublease's representation changes with, for validators."""
+    prop = _loaded(sublease, "property")
+    lessor = _loaded(sublease, "lessor")
+    return (
+        sublease.sublease_id,
+        sublease.updated_at or sublease.created_at,
+        prop.updated_at if prop else None,
+        lessor.updated_at if lessor else None
+    )
+
+
+def _sublease_last_modified(sublease: SubLease) -> Optional[datetime]:
+    """Get when a sublease, its property (including images) or its lessor last changed."""
+    prop = _loaded(sublease, "property")
+    lessor = _loaded(sublease, "lessor")
+    return latest(
+        sublease.created_at,
+        sublease.updated_at,
+        prop.updated_at if prop else None,
+        lessor.updated_at if lessor else None
+    )
+
+
+def _origin(filters: SubLeaseFilters) -> Optional[Tuple[float, float]]:
+    """Get the distance reference point of a search, if any."""
+    return (filters.latitude, filters.longitude) if filters.has_center else None
 
 
 def _convert_sublease_to_my_read(sublease: SubLease) -> SubLeaseMyRead:
@@ -61,37 +122,140 @@ def _convert_sublease_to_my_read(sublease: SubLease) -> SubLeaseMyRead:
         "available_until": sublease.available_until,
         "status": sublease.status,
         "created_at": sublease.created_at,
-        "property_images": [
-            PropertyImageRead.model_validate(image) 
-            for image in (sublease.property.images if sublease.property else [])
-        ]
+        "property_images": sublease.property.images if sublease.property else []
     }
-    return SubLeaseMyRead.model_validate(sublease_dict)
+    return orm_model(SubLeaseMyRead, sublease_dict)
 
 
 @router.get("/", response_model=List[SubLeaseRead])
 def get_subleases(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor"),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header"),
+    sort: Optional[SubLeaseSort] = Query(None, description="Sort order"),
     status: Optional[SubLeaseStatus] = Query(None, description="Filter by status"),
+    filters: SubLeaseFilters = Depends(get_sublease_filters),
+    fieldset: FieldSet = Depends(get_listing_fieldset),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[SubLeaseRead]:
+) -> Response:
     """
-    Get all subleases with pagination and optional status filter.
+    Get a page of subleases with optional status and availability filters.
+    
+    Cursors for the neighbouring pages are returned in the ``X-Next-Cursor``
+    and ``X-Prev-Cursor`` headers and as a ``Link`` header. Serialized pages
+    are served from the response cache until a listing changes, and a
+    matching ``If-None-Match`` gets an empty 304. ``fields`` and ``include``
+    narrow both the query and the response, e.g.
+    ``?fields=title,rate&include=primary_image``.
     
     Args:
-        skip: Number of records to skip.
-        limit: Maximum number of records to return.
+        request: Current request.
+        response: Response, used to set cursor headers.
+        skip: Legacy offset for the first page.
+        limit: Page size.
+        cursor: Cursor from a previous page.
+        sort: Sort order.
         status: Optional status filter.
+        filters: Text search, date, rate, location, size, amenity and map filters.
+        fieldset: Fields to return.
+        db: Database session.
+        
+    Returns:
+        Response: JSON list of subleases.
+    """
+    cache = get_response_cache()
+    cache_key = cache.key(request, LISTING_TABLES)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached.replay(request)
+    
+    sublease_service = SubLeaseService(db)
+    page = sublease_service.get_subleases_page(
+        filters, status=status, sort=sort, limit=limit, cursor=cursor, skip=skip, fieldset=fieldset
+    )
+    set_cursor_headers(request, response, page)
+    unchanged = not_modified(
+        request, response,
+        make_etag([_sublease_stamp(sublease) for sublease in page.items], page.next_cursor, page.prev_cursor),
+        latest(*(_sublease_last_modified(sublease) for sublease in page.items)),
+        compare_last_modified=False
+    )
+    if unchanged:
+        return unchanged
+    
+    highlights = (
+        sublease_service.get_search_highlights(page.items, filters.q) if filters.q and "highlight" in fieldset else {}
+    )
+    items = [
+        _convert_sublease_to_read(sublease, highlights.get(sublease.sublease_id), _origin(filters), fieldset)
+        for sublease in page.items
+    ]
+    return cache.store(cache_key, fieldset.dump_json(SUBLEASE_LIST_JSON, items), dict(response.headers))
+
+
+@router.get("/feed", response_model=List[SubLeaseCardRead])
+def get_sublease_feed(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header"),
+    sort: Optional[SubLeaseSort] = Query(None, description="Sort order"),
+    filters: SubLeaseFilters = Depends(get_sublease_filters),
+    fieldset: FieldSet = Depends(get_card_fieldset),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Browse active subleases as precomputed listing cards.
+    
+    Takes the same filters, sorts, cursors and ``fields`` as the list
+    endpoint but reads the ``sublease_cards`` read model, so each page is a
+    single-table query.
+    
+    Args:
+        request: Current request.
+        response: Response, used to set cursor headers.
+        limit: Page size.
+        cursor: Cursor from a previous page.
+        sort: Sort order.
+        filters: Text search, date, rate, location, size, amenity and map filters.
+        fieldset: Fields to return.
         db: Database session.
         
     Returns:
-        List[SubLeaseRead]: List of subleases.
+        Response: JSON list of listing cards.
     """
+    cache = get_response_cache()
+    cache_key = cache.key(request, FEED_TABLES)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached.replay(request)
+    
     sublease_service = SubLeaseService(db)
-    subleases = sublease_service.get_all_subleases(skip=skip, limit=limit, status=status)
-    return [_convert_sublease_to_read(sublease) for sublease in subleases]
+    page = sublease_service.get_feed_page(filters, sort=sort, limit=limit, cursor=cursor, fieldset=fieldset)
+    set_cursor_headers(request, response, page)
+    highlights = (
+        sublease_service.get_search_highlights(page.items, filters.q) if filters.q and "highlight" in fieldset else {}
+    )
+    origin = _origin(filters)
+    
+    cards = []
+    for card in page.items:
+        if fieldset.is_full:
+            read = SubLeaseCardRead.model_validate(card)
+        else:
+            # Unselected columns weren't loaded; reading them would query each row
+            read = fieldset.build(SubLeaseCardRead, {
+                name: getattr(card, name) for name in CARD_COLUMNS if name in fieldset
+            })
+        read.highlight = highlights.get(card.sublease_id)
+        if origin and "distance_km" in fieldset:
+            read.distance_km = haversine_km(*origin, card.latitude, card.longitude)
+        cards.append(read)
+    return cache.store(cache_key, fieldset.dump_json(SUBLEASE_CARDS_JSON, cards), dict(response.headers))
 
 
 @router.get("/me", response_model=List[SubLeaseMyRead])
@@ -114,21 +278,113 @@ def get_my_subleases(
     return [_convert_sublease_to_my_read(sublease) for sublease in subleases]
 
 
+@router.get("/search", response_model=SubLeaseSearchResponse)
+def search_subleases(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    sort: Optional[SubLeaseSort] = Query(None, description="Sort order"),
+    status: Optional[SubLeaseStatus] = Query(SubLeaseStatus.ACTIVE, description="Filter by status"),
+    filters: SubLeaseFilters = Depends(get_sublease_filters),
+    fieldset: FieldSet = Depends(get_listing_fieldset),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Search subleases with filters and facet counts.
+    
+    ``fields`` and ``include`` narrow the items as on the list endpoint.
+    
+    Args:
+        request: Current request.
+        response: Response, used to set cursor headers.
+        limit: Page size.
+        cursor: Cursor from a previous page.
+        sort: Sort order.
+        status: Status filter (active listings by default).
+        filters: Text search, date, rate, location, size, amenity and map filters.
+        fieldset: Fields to return for each item.
+        db: Database session.
+        
+    Returns:
+        Response: JSON page of matching subleases, total, facet counts and cursors.
+    """
+    cache = get_response_cache()
+    cache_key = cache.key(request, LISTING_TABLES)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached.replay(request)
+    
+    sublease_service = SubLeaseService(db)
+    page, total, facets = sublease_service.search_subleases(
+        filters, status=status, sort=sort, limit=limit, cursor=cursor, fieldset=fieldset
+    )
+    set_cursor_headers(request, response, page)
+    highlights = (
+        sublease_service.get_search_highlights(page.items, filters.q) if filters.q and "highlight" in fieldset else {}
+    )
+    result = SubLeaseSearchResponse(
+        items=[
+            _convert_sublease_to_read(sublease, highlights.get(sublease.sublease_id), _origin(filters), fieldset)
+            for sublease in page.items
+        ],
+        total=total,
+        facets=SubLeaseFacets(**{
+            facet: [FacetCount(value=value, count=count) for value, count in counts]
+            for facet, counts in facets.items()
+        }),
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor
+    )
+    body = result.model_dump_json(include=fieldset.envelope_include(SubLeaseSearchResponse, "items")).encode()
+    return cache.store(cache_key, body, dict(response.headers))
+
+
 @router.get("/{sublease_id}", response_model=SubLeaseRead)
 def get_sublease(
-    sublease_obj: SubLease = Depends(get_sublease_by_id),
-    current_user: User = Depends(get_current_user)
-) -> SubLeaseRead:
+    sublease_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
     """
     Get sublease by ID.
     
+    The sublease is looked up here rather than through a dependency so that
+    cache hits skip the query. A matching ``If-None-Match`` or
+    ``If-Modified-Since`` gets an empty 304.
+    
     Args:
-        sublease_obj: Sublease object from dependency.
+        sublease_id: Sublease ID.
+        request: Current request.
+        response: Response, used to set validator headers.
+        db: Database session.
         
     Returns:
-        SubLeaseRead: Sublease data.
+        Response: JSON sublease data.
+        
+    Raises:
+        NotFoundError: If the sublease does not exist.
     """
-    return _convert_sublease_to_read(sublease_obj)
+    cache = get_response_cache()
+    cache_key = cache.key(request, LISTING_TABLES)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached.replay(request)
+    
+    sublease_obj = SubLeaseService(db).get_sublease_by_id(sublease_id)
+    if not sublease_obj:
+        raise NotFoundError("Sublease not found")
+    
+    unchanged = not_modified(
+        request, response, make_etag(_sublease_stamp(sublease_obj)), _sublease_last_modified(sublease_obj)
+    )
+    if unchanged:
+        return unchanged
+    body = _convert_sublease_to_read(sublease_obj).model_dump_json().encode()
+    return cache.store(cache_key, body, dict(response.headers))
 
 
 @router.post("/", response_model=Any)
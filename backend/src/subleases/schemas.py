@@ -4,6 +4,7 @@ Subleases domain schemas.
 import uuid
 from datetime import datetime, date
 from decimal import Decimal
+from enum import Enum
 from typing import Optional, List
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -35,6 +36,8 @@ class PropertyImageRead(BaseModel):
     is_primary: bool
     alt_text: Optional[str] = None
     image_size: Optional[int] = None
+    blurhash: Optional[str] = None
+    dominant_color: Optional[str] = None
     created_at: datetime
 
 
@@ -76,7 +79,47 @@ class SubLeaseRead(SubLeaseBase):
     lessor_id: uuid.UUID
     created_at: datetime
     property_images: List[PropertyImageRead] = []
+    primary_image: Optional[PropertyImageRead] = None
     lessor: Optional[LessorRead] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    distance_km: Optional[float] = None
+    highlight: Optional[str] = None
+
+
+class SubLeaseCardRead(BaseModel):
+    """Schema for a browse feed card: listing, property summary, primary image and lessor."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    sublease_id: uuid.UUID
+    property_id: uuid.UUID
+    lessor_id: uuid.UUID
+    title: str
+    rate: Decimal
+    minimum_stay_days: int
+    maximum_stay_days: Optional[int] = None
+    available_from: date
+    available_until: date
+    created_at: datetime
+    property_title: str
+    property_type: Optional[str] = None
+    city: str
+    state: str
+    square_feet: Optional[int] = None
+    amenities: Optional[List[str]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    image_url: Optional[str] = None
+    image_blurhash: Optional[str] = None
+    image_dominant_color: Optional[str] = None
+    lessor_first_name: str
+    lessor_last_name: str
+    lessor_profile_image_url: Optional[str] = None
+    lessor_average_rating: Optional[float] = None
+    lessor_total_ratings: int = 0
+    lessor_reputation_score: float = 0
+    distance_km: Optional[float] = None
+    highlight: Optional[str] = None
 
 
 class SubLeaseMyRead(SubLeaseBase):
@@ -98,3 +141,87 @@ class SubLeaseDetail(SubLeaseRead):
     property_address: Optional[str] = None
     lessor_name: Optional[str] = None
     lessor_rating: Optional[float] = None
+
+
+class SubLeaseSort(str, Enum):
+    """Sort orders for browsing subleases."""
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    AVAILABLE_FROM = "available_from"
+    REPUTATION = "reputation"
+    RELEVANCE = "relevance"
+    DISTANCE = "distance"
+
+
+class SubLeaseFilters(BaseModel):
+    """Query filters for browsing subleases."""
+    q: Optional[str] = None
+    move_in: Optional[date] = None
+    move_out: Optional[date] = None
+    stay_days: Optional[int] = Field(None, ge=1)
+    min_rate: Optional[Decimal] = None
+    max_rate: Optional[Decimal] = None
+    property_type: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    min_square_feet: Optional[int] = None
+    max_square_feet: Optional[int] = None
+    amenities: List[str] = []
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    radius_km: Optional[float] = Field(None, gt=0)
+    min_latitude: Optional[float] = Field(None, ge=-90, le=90)
+    max_latitude: Optional[float] = Field(None, ge=-90, le=90)
+    min_longitude: Optional[float] = Field(None, ge=-180, le=180)
+    max_longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+    @property
+    def has_center(self) -> bool:
+        """Whether a reference point for distances was given."""
+        return self.latitude is not None and self.longitude is not None
+
+    @property
+    def has_bounds(self) -> bool:
+        """Whether a map viewport was given."""
+        return None not in (self.min_latitude, self.max_latitude, self.min_longitude, self.max_longitude)
+
+    @property
+    def filters_property(self) -> bool:
+        """Whether any filter or ordering applies to the sublease's property."""
+        return bool(
+            self.property_type or self.city or self.state or self.amenities
+            or self.min_square_feet is not None or self.max_square_feet is not None
+            or self.has_center or self.has_bounds
+        )
+
+    @property
+    def requested_stay_days(self) -> Optional[int]:
+        """Stay length to match against minimum/maximum stay, if known."""
+        if self.stay_days is not None:
+            return self.stay_days
+        if self.move_in and self.move_out:
+            return max((self.move_out - self.move_in).days, 1)
+        return None
+
+
+class FacetCount(BaseModel):
+    """Number of matching subleases for one facet value."""
+    value: str
+    count: int
+
+
+class SubLeaseFacets(BaseModel):
+    """Facet counts over all subleases matching a search."""
+    property_type: List[FacetCount] = []
+    city: List[FacetCount] = []
+    amenities: List[FacetCount] = []
+
+
+class SubLeaseSearchResponse(BaseModel):
+    """Schema for sublease search results with facet counts."""
+    items: List[SubLeaseRead]
+    total: int
+    facets: SubLeaseFacets
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
@@ -0,0 +1,127 @@
+"""
+Full-text search over subleases.
+
+``subleases.search_vector`` is maintained by Postgres triggers: the sublease's
+own trigger rebuilds it on insert and on changes to the searchable columns,
+and a trigger on ``properties`` touches dependent subleases when the
+property's title, description or address change. Weights: titles ``A``,
+descriptions ``B``, address ``C``.
+"""
+import html
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import DDL, ColumnElement, cast, event, func, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from src.subleases.models import SubLease
+
+SEARCH_CONFIG = "english"
+
+# Control characters never appear in listing text, so they can mark matches
+# in the raw headline before it is HTML-escaped.
+_START_SEL = "\x02"
+_STOP_SEL = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={_START_SEL}, StopSel={_STOP_SEL}, "
+    "MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+SEARCH_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION subleases_search_vector_update() RETURNS trigger AS $$
+DECLARE
+    prop record;
+BEGIN
+    SELECT title, description, address_line1, address_line2, city, state
+    INTO prop FROM properties WHERE property_id = NEW.property_id;
+
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', concat_ws(' ', NEW.title, prop.title)), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', concat_ws(' ', NEW.description, prop.description)), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', concat_ws(' ', prop.address_line1, prop.address_line2, prop.city, prop.state)), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS subleases_search_vector_trigger ON subleases;
+CREATE TRIGGER subleases_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, property_id ON subleases
+    FOR EACH ROW EXECUTE FUNCTION subleases_search_vector_update();
+
+CREATE OR REPLACE FUNCTION properties_search_vector_propagate() RETURNS trigger AS $$
+BEGIN
+    UPDATE subleases SET title = title WHERE property_id = NEW.property_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS properties_search_vector_trigger ON properties;
+CREATE TRIGGER properties_search_vector_trigger
+    AFTER UPDATE OF title, description, address_line1, address_line2, city, state ON properties
+    FOR EACH ROW EXECUTE FUNCTION properties_search_vector_propagate();
+"""
+
+# Install the triggers when the table is created outside of migrations
+event.listen(SubLease.__table__, "after_create", DDL(SEARCH_TRIGGER_SQL))
+
+
+def search_query(q: str) -> ColumnElement:
+    """
+    Build a ``tsquery`` from user input using web search syntax.
+
+    Args:
+        q: Search text, e.g. ``furnished "near campus" -shared``.
+
+    Returns:
+        ColumnElement: ``websearch_to_tsquery`` expression.
+    """
+    return func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), q)
+
+
+def search_rank(q: str, source: Any = SubLease) -> ColumnElement:
+    """
+    Build the relevance expression used to order search results.
+
+    Args:
+        q: Search text.
+        source: Mapped class with a ``search_vector`` column.
+
+    Returns:
+        ColumnElement: ``ts_rank`` expression.
+    """
+    return func.ts_rank(source.search_vector, search_query(q))
+
+
+def get_search_highlights(db: Session, sublease_ids: List[uuid.UUID], q: str) -> Dict[uuid.UUID, str]:
+    """
+    Get highlighted snippets for a page of search results.
+
+    ``ts_headline`` re-parses the document, so it only runs for the rows
+    being returned. Snippets are HTML-escaped with matches wrapped in
+    ``<mark>`` tags.
+
+    Args:
+        db: Database session.
+        sublease_ids: Subleases on the current page.
+        q: Search text.
+
+    Returns:
+        Dict[uuid.UUID, str]: Snippet per sublease ID.
+    """
+    if not sublease_ids:
+        return {}
+
+    headline = func.ts_headline(
+        cast(SEARCH_CONFIG, REGCONFIG),
+        func.concat_ws(" — ", SubLease.title, SubLease.description),
+        search_query(q),
+        HEADLINE_OPTIONS
+    )
+    rows = db.execute(
+        select(SubLease.sublease_id, headline).where(SubLease.sublease_id.in_(sublease_ids))
+    )
+    return {
+        sublease_id: html.escape(snippet).replace(_START_SEL, "<mark>").replace(_STOP_SEL, "</mark>")
+        for sublease_id, snippet in rows
+    }
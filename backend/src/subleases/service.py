@@ -2,16 +2,81 @@
 Subleases domain service.
 """
 import uuid
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import ColumnElement, Date, case, cast, func, literal, null, or_, select, true, union_all
+from sqlalchemy.orm import Query, Session, joinedload, load_only
 
-from src.subleases.models import SubLease, SubLeaseStatus
-from src.subleases.schemas import SubLeaseCreate, SubLeaseUpdate
+from src.exceptions import ValidationError
+from src.subleases.models import SubLease, SubLeaseCard, SubLeaseStatus
+from src.subleases.schemas import SubLeaseCreate, SubLeaseFilters, SubLeaseSort, SubLeaseUpdate
+from src.subleases.search import get_search_highlights, search_query, search_rank
+from src.subleases import feed  # noqa: F401  (installs the sublease_cards triggers on create_all)
+from src.properties.geo import distance_meters, within_bounds, within_radius
 from src.properties.models import Property
 from src.propertyimages.models import PropertyImage
 from src.auth.models import User
+from src.utils.cache import bump_version
+from src.utils.fieldsets import FieldSet
+from src.utils.loaders import EntityLoader
+from src.utils.pagination import KeysetSort, Page, SortKey, paginate, paginate_offset
+
+# Keyset orderings; each ends with the primary key so cursors are unambiguous
+SUBLEASE_SORTS = {
+    SubLeaseSort.NEWEST: KeysetSort(SubLeaseSort.NEWEST.value, [
+        SortKey(SubLease.created_at, descending=True),
+        SortKey(SubLease.sublease_id, descending=True),
+    ]),
+    SubLeaseSort.PRICE_ASC: KeysetSort(SubLeaseSort.PRICE_ASC.value, [
+        SortKey(SubLease.rate),
+        SortKey(SubLease.sublease_id),
+    ]),
+    SubLeaseSort.PRICE_DESC: KeysetSort(SubLeaseSort.PRICE_DESC.value, [
+        SortKey(SubLease.rate, descending=True),
+        SortKey(SubLease.sublease_id, descending=True),
+    ]),
+    SubLeaseSort.AVAILABLE_FROM: KeysetSort(SubLeaseSort.AVAILABLE_FROM.value, [
+        SortKey(SubLease.available_from),
+        SortKey(SubLease.sublease_id),
+    ]),
+    # Best lessors first; the query joins the lessor (see get_subleases_page)
+    SubLeaseSort.REPUTATION: KeysetSort(
+        SubLeaseSort.REPUTATION.value,
+        [SortKey(User.reputation_score, descending=True), SortKey(SubLease.sublease_id, descending=True)],
+        value_getter=lambda sublease: [sublease.lessor.reputation_score, sublease.sublease_id]
+    ),
+}
+
+# Sublease columns returned by list endpoints
+LISTING_COLUMNS = (
+    "sublease_id", "property_id", "lessor_id", "title", "description", "rate", "minimum_stay_days",
+    "maximum_stay_days", "available_from", "available_until", "status", "created_at",
+)
+
+# Columns loaded whatever fields are requested: keys, sort keys and validator timestamps
+LISTING_REQUIRED_COLUMNS = (
+    SubLease.sublease_id, SubLease.property_id, SubLease.lessor_id, SubLease.rate,
+    SubLease.available_from, SubLease.created_at, SubLease.updated_at,
+)
+
+# Response fields read from the sublease's property
+LISTING_PROPERTY_FIELDS = ("latitude", "longitude", "distance_km", "property_images", "primary_image")
+
+# Card columns copied from joined sort columns under another name
+FEED_SORT_COLUMNS = {"reputation_score": "lessor_reputation_score"}
+
+# Card columns loaded whatever fields are requested: the key and every sort key
+FEED_REQUIRED_COLUMNS = ("sublease_id", "created_at", "rate", "available_from", "lessor_reputation_score")
+
+# The same orderings over the browse feed read model
+FEED_SORTS = {
+    sort: KeysetSort(keyset.name, [
+        SortKey(getattr(SubLeaseCard, FEED_SORT_COLUMNS.get(key.column.key, key.column.key)), key.descending)
+        for key in keyset.keys
+    ])
+    for sort, keyset in SUBLEASE_SORTS.items()
+}
 
 
 class SubLeaseService:
@@ -32,10 +97,11 @@ class SubLeaseService:
         Returns:
             SubLease: Sublease object with property images and lessor details or None.
         """
-        return self.db.query(SubLease).options(
+        return EntityLoader.for_session(self.db).load(
+            SubLease, sublease_id,
             joinedload(SubLease.property).joinedload(Property.images),
             joinedload(SubLease.lessor)
-        ).filter(SubLease.sublease_id == sublease_id).first()
+        )
     
     def get_subleases_by_lessor(self, lessor_id: uuid.UUID) -> List[SubLease]:
         """
@@ -50,7 +116,7 @@ class SubLeaseService:
         return self.db.query(SubLease).options(
             joinedload(SubLease.property).joinedload(Property.images),
             joinedload(SubLease.lessor)
-        ).filter(SubLease.lessor_id == lessor_id).all()
+        ).filter(SubLease.lessor_id == lessor_id).order_by(SubLease.created_at.desc()).all()
     
     def get_subleases_by_property(self, property_id: uuid.UUID) -> List[SubLease]:
         """
@@ -64,27 +130,374 @@ class SubLeaseService:
         """
         return self.db.query(SubLease).filter(SubLease.property_id == property_id).all()
     
-    def get_all_subleases(self, skip: int = 0, limit: int = 100, status: Optional[SubLeaseStatus] = None) -> List[SubLease]:
+    def get_subleases_page(
+        self,
+        filters: Optional[SubLeaseFilters] = None,
+        status: Optional[SubLeaseStatus] = None,
+        sort: Optional[SubLeaseSort] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fieldset: Optional[FieldSet] = None
+    ) -> Page[SubLease]:
         """
-        Get all subleases with pagination, optional status filter, property images, and lessor details.
+        Get a page of subleases with optional filters, property images, and lessor details.
+        
+        With a narrowed ``fieldset`` only the columns and relationships
+        needed for the selected fields are loaded.
         
         Args:
-            skip: Number of records to skip.
-            limit: Maximum number of records to return.
+            filters: Optional browse filters.
             status: Optional status filter.
+            sort: Sort order; defaults to relevance when searching, distance when
+                a reference point is given and newest otherwise.
+            limit: Page size.
+            cursor: Cursor from a previous page.
+            skip: Legacy offset, only used for the first page.
+            fieldset: Response fields to load; everything by default.
             
         Returns:
-            List[SubLease]: List of sublease objects with property images and lessor details.
+            Page[SubLease]: Subleases with property images and lessor details, and page cursors.
+            
+        Raises:
+            ValidationError: If the sort needs a missing filter or the cursor is invalid.
         """
-        query = self.db.query(SubLease).options(
-            joinedload(SubLease.property).joinedload(Property.images),
-            joinedload(SubLease.lessor)
-        )
+        filters = filters or SubLeaseFilters()
+        sort = self._resolve_sort(sort, filters)
+        
+        query = self.db.query(SubLease).options(*self._listing_options(fieldset or FieldSet(), sort))
         
         if status:
             query = query.filter(SubLease.status == status.value)
         
-        return query.offset(skip).limit(limit).all()
+        query = self._apply_filters(query, filters)
+        
+        if sort == SubLeaseSort.RELEVANCE:
+            query = query.order_by(search_rank(filters.q).desc(), SubLease.sublease_id)
+            return paginate_offset(query, sort.value, limit, cursor, start=skip)
+        if sort == SubLeaseSort.DISTANCE:
+            # A reference point is a property filter, so _apply_filters has joined Property
+            query = query.order_by(
+                distance_meters(filters.latitude, filters.longitude).asc().nulls_last(),
+                SubLease.sublease_id
+            )
+            return paginate_offset(query, sort.value, limit, cursor, start=skip)
+        if sort == SubLeaseSort.REPUTATION:
+            query = query.join(User, SubLease.lessor_id == User.user_id)
+        
+        return paginate(query, SUBLEASE_SORTS[sort], limit, cursor, start=skip)
+    
+    def _listing_options(self, fieldset: FieldSet, sort: SubLeaseSort) -> List[Any]:
+        """
+        Build the loader options for a page of subleases.
+        
+        Args:
+            fieldset: Response fields.
+            sort: Resolved sort order.
+            
+        Returns:
+            List[Any]: Query options.
+        """
+        if fieldset.is_full:
+            return [joinedload(SubLease.property).joinedload(Property.images), joinedload(SubLease.lessor)]
+        
+        options = [load_only(
+            *LISTING_REQUIRED_COLUMNS,
+            *(getattr(SubLease, name) for name in LISTING_COLUMNS if name in fieldset)
+        )]
+        if fieldset.wants_any(*LISTING_PROPERTY_FIELDS):
+            property_loader = joinedload(SubLease.property).load_only(
+                Property.latitude, Property.longitude, Property.updated_at
+            )
+            if fieldset.wants_any("property_images", "primary_image"):
+                property_loader = property_loader.selectinload(Property.images)
+            options.append(property_loader)
+        if "lessor" in fieldset:
+            options.append(joinedload(SubLease.lessor))
+        elif sort == SubLeaseSort.REPUTATION:
+            # The sort's cursor values are read from the lessor
+            options.append(joinedload(SubLease.lessor).load_only(User.reputation_score, User.updated_at))
+        return options
+    
+    def get_feed_page(
+        self,
+        filters: Optional[SubLeaseFilters] = None,
+        sort: Optional[SubLeaseSort] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fieldset: Optional[FieldSet] = None
+    ) -> Page[SubLeaseCard]:
+        """
+        Get a page of active listings from the browse feed read model.
+        
+        Every filter and sort of ``get_subleases_page`` applies, but rows
+        come from ``sublease_cards`` alone, with no joins or eager loads.
+        
+        Args:
+            filters: Optional browse filters.
+            sort: Sort order, with the same defaults as ``get_subleases_page``.
+            limit: Page size.
+            cursor: Cursor from a previous page.
+            fieldset: Card fields to load; everything by default.
+            
+        Returns:
+            Page[SubLeaseCard]: Listing cards and page cursors.
+            
+        Raises:
+            ValidationError: If the sort needs a missing filter or the cursor is invalid.
+        """
+        filters = filters or SubLeaseFilters()
+        sort = self._resolve_sort(sort, filters)
+        
+        query = self.db.query(SubLeaseCard).filter(
+            *self._filter_conditions(filters, listing=SubLeaseCard, prop=SubLeaseCard)
+        )
+        if fieldset is not None and not fieldset.is_full:
+            columns = set(FEED_REQUIRED_COLUMNS)
+            columns.update(column for column in SubLeaseCard.__table__.columns.keys() if column in fieldset)
+            if "distance_km" in fieldset:
+                columns.update(("latitude", "longitude"))
+            query = query.options(load_only(*(getattr(SubLeaseCard, column) for column in columns)))
+        
+        if sort == SubLeaseSort.RELEVANCE:
+            query = query.order_by(search_rank(filters.q, SubLeaseCard).desc(), SubLeaseCard.sublease_id)
+            return paginate_offset(query, sort.value, limit, cursor)
+        if sort == SubLeaseSort.DISTANCE:
+            query = query.order_by(
+                distance_meters(filters.latitude, filters.longitude, SubLeaseCard).asc().nulls_last(),
+                SubLeaseCard.sublease_id
+            )
+            return paginate_offset(query, sort.value, limit, cursor)
+        
+        return paginate(query, FEED_SORTS[sort], limit, cursor)
+    
+    def _resolve_sort(self, sort: Optional[SubLeaseSort], filters: SubLeaseFilters) -> SubLeaseSort:
+        """
+        Pick the default sort and check that the sort can be applied.
+        
+        Args:
+            sort: Requested sort.
+            filters: Browse filters.
+            
+        Returns:
+            SubLeaseSort: Sort to apply.
+            
+        Raises:
+            ValidationError: If relevance/distance sorting lacks a query/reference point.
+        """
+        if sort is None:
+            if filters.q:
+                return SubLeaseSort.RELEVANCE
+            if filters.has_center:
+                return SubLeaseSort.DISTANCE
+            return SubLeaseSort.NEWEST
+        
+        if sort == SubLeaseSort.RELEVANCE and not filters.q:
+            raise ValidationError("Sorting by relevance requires q")
+        if sort == SubLeaseSort.DISTANCE and not filters.has_center:
+            raise ValidationError("Sorting by distance requires latitude and longitude")
+        return sort
+    
+    def get_search_highlights(self, subleases: List[SubLease], q: str) -> Dict[uuid.UUID, str]:
+        """
+        Get highlighted snippets of search matches for a page of subleases.
+        
+        Args:
+            subleases: Subleases being returned.
+            q: Search text.
+            
+        Returns:
+            Dict[uuid.UUID, str]: HTML snippet with ``<mark>``-wrapped matches per sublease ID.
+        """
+        return get_search_highlights(self.db, [sublease.sublease_id for sublease in subleases], q)
+    
+    def search_subleases(
+        self,
+        filters: SubLeaseFilters,
+        status: Optional[SubLeaseStatus] = None,
+        sort: Optional[SubLeaseSort] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fieldset: Optional[FieldSet] = None
+    ) -> Tuple[Page[SubLease], int, Dict[str, List[Tuple[str, int]]]]:
+        """
+        Search subleases and compute facet counts for the matching set.
+        
+        Args:
+            filters: Search filters.
+            status: Optional status filter.
+            sort: Sort order.
+            limit: Page size.
+            cursor: Cursor from a previous page.
+            skip: Legacy offset, only used for the first page.
+            fieldset: Response fields to load; everything by default.
+            
+        Returns:
+            Tuple: Page of subleases, total number of matches and facet counts
+            (``property_type``, ``city``, ``amenities``) as (value, count) pairs.
+        """
+        page = self.get_subleases_page(
+            filters, status=status, sort=sort, limit=limit, cursor=cursor, skip=skip, fieldset=fieldset
+        )
+        total, facets = self.get_search_facets(filters, status=status)
+        return page, total, facets
+    
+    def get_search_facets(
+        self,
+        filters: SubLeaseFilters,
+        status: Optional[SubLeaseStatus] = None,
+        facet_limit: int = 20
+    ) -> Tuple[int, Dict[str, List[Tuple[str, int]]]]:
+        """
+        Count matching subleases per property type, city and amenity.
+        
+        All facets and the total are computed in a single ``UNION ALL`` query
+        over the filtered set.
+        
+        Args:
+            filters: Search filters.
+            status: Optional status filter.
+            facet_limit: Maximum number of values returned per facet.
+            
+        Returns:
+            Tuple[int, Dict[str, List[Tuple[str, int]]]]: Total matches and facet counts.
+        """
+        conditions = self._filter_conditions(filters)
+        if status:
+            conditions.append(SubLease.status == status.value)
+        
+        # Rows stored before amenities were normalized may hold a JSON null or object
+        amenities = case((func.jsonb_typeof(Property.amenities) == "array", Property.amenities)).label("amenities")
+        matches = select(
+            Property.property_type, Property.city, amenities
+        ).select_from(SubLease).join(
+            Property, SubLease.property_id == Property.property_id
+        ).where(*conditions).cte("matches")
+        
+        amenity = func.jsonb_array_elements_text(matches.c.amenities).table_valued("value").alias("amenity")
+        count = func.count().label("count")
+        facet_query = union_all(
+            select(literal("total").label("facet"), null().label("value"), count).select_from(matches),
+            select(literal("property_type"), matches.c.property_type, count)
+            .where(matches.c.property_type.is_not(None))
+            .group_by(matches.c.property_type),
+            select(literal("city"), matches.c.city, count).group_by(matches.c.city),
+            select(literal("amenities"), amenity.c.value, count)
+            .select_from(matches.join(amenity, true()))
+            .group_by(amenity.c.value),
+        )
+        
+        total = 0
+        facets: Dict[str, List[Tuple[str, int]]] = {"property_type": [], "city": [], "amenities": []}
+        for facet, value, value_count in self.db.execute(facet_query):
+            if facet == "total":
+                total = value_count
+            else:
+                facets[facet].append((value, value_count))
+        
+        for facet, counts in facets.items():
+            facets[facet] = sorted(counts, key=lambda item: (-item[1], item[0]))[:facet_limit]
+        
+        return total, facets
+    
+    def _apply_filters(self, query: Query, filters: SubLeaseFilters) -> Query:
+        """
+        Apply browse filters to a sublease query.
+        
+        Args:
+            query: Sublease query.
+            filters: Filters to apply.
+            
+        Returns:
+            Query: Filtered query.
+        """
+        if filters.filters_property:
+            query = query.join(Property, SubLease.property_id == Property.property_id)
+        return query.filter(*self._filter_conditions(filters))
+    
+    def _filter_conditions(
+        self,
+        filters: SubLeaseFilters,
+        listing: Any = SubLease,
+        prop: Any = Property
+    ) -> List[ColumnElement]:
+        """
+        Build SQL conditions for browse filters.
+        
+        Text search matches the GIN-indexed ``search_vector``, date filters are
+        containment checks on the GiST-indexed ``availability`` range,
+        amenities use JSONB containment on the GIN-indexed array and radius
+        searches use the GiST-indexed ``ll_to_earth`` point, so all are
+        answered by indexes rather than scans. Property conditions
+        require ``properties`` to be joined.
+        
+        Args:
+            filters: Filters to apply.
+            listing: Mapped class holding the sublease columns.
+            prop: Mapped class holding the property columns; ``SubLeaseCard``
+                holds both.
+            
+        Returns:
+            List[ColumnElement]: Conditions to AND together.
+        """
+        conditions = []
+        
+        if filters.q:
+            conditions.append(listing.search_vector.op("@@")(search_query(filters.q)))
+        
+        # The whole stay must fit in the availability window; a single date plus a
+        # length places the stay after move-in (or before move-out)
+        stay = None
+        if filters.move_in and filters.move_out:
+            stay = (filters.move_in, filters.move_out)
+        elif filters.move_in and filters.stay_days is not None:
+            stay = (filters.move_in, filters.move_in + timedelta(days=filters.stay_days))
+        elif filters.move_out and filters.stay_days is not None:
+            stay = (filters.move_out - timedelta(days=filters.stay_days), filters.move_out)
+        if stay:
+            conditions.append(listing.availability.contains(func.daterange(*stay, "[]")))
+        elif filters.move_in or filters.move_out:
+            conditions.append(listing.availability.contains(
+                cast(filters.move_in or filters.move_out, Date)
+            ))
+        
+        stay_days = filters.requested_stay_days
+        if stay_days is not None:
+            conditions.append(listing.minimum_stay_days <= stay_days)
+            conditions.append(
+                or_(listing.maximum_stay_days.is_(None), listing.maximum_stay_days >= stay_days)
+            )
+            if not stay:
+                # With no dates, the availability window itself must be long enough for the stay
+                conditions.append(listing.available_until - listing.available_from >= stay_days)
+        
+        if filters.min_rate is not None:
+            conditions.append(listing.rate >= filters.min_rate)
+        if filters.max_rate is not None:
+            conditions.append(listing.rate <= filters.max_rate)
+        
+        if filters.property_type:
+            conditions.append(prop.property_type == filters.property_type)
+        if filters.city:
+            conditions.append(func.lower(prop.city) == filters.city.lower())
+        if filters.state:
+            conditions.append(func.lower(prop.state) == filters.state.lower())
+        if filters.min_square_feet is not None:
+            conditions.append(prop.square_feet >= filters.min_square_feet)
+        if filters.max_square_feet is not None:
+            conditions.append(prop.square_feet <= filters.max_square_feet)
+        if filters.amenities:
+            conditions.append(prop.amenities.contains(filters.amenities))
+        
+        if filters.has_center and filters.radius_km is not None:
+            conditions.append(within_radius(filters.latitude, filters.longitude, filters.radius_km, prop))
+        if filters.has_bounds:
+            conditions.append(within_bounds(
+                filters.min_latitude, filters.max_latitude, filters.min_longitude, filters.max_longitude, prop
+            ))
+        
+        return conditions
     
     def create_sublease(self, sublease_data: SubLeaseCreate, lessor_id: uuid.UUID) -> SubLease:
         """
@@ -112,6 +525,7 @@ class SubLeaseService:
         
         self.db.add(sublease)
         self.db.commit()
+        bump_version(SubLease.__tablename__)
         self.db.refresh(sublease)
         
         return sublease
@@ -136,6 +550,7 @@ class SubLeaseService:
         sublease.updated_at = datetime.utcnow()
         
         self.db.commit()
+        bump_version(SubLease.__tablename__)
         self.db.refresh(sublease)
         
         return sublease
@@ -149,3 +564,4 @@ class SubLeaseService:
         """
         self.db.delete(sublease)
         self.db.commit()
+        bump_version(SubLease.__tablename__)
@@ -0,0 +1,52 @@
+"""
+Subleases background tasks.
+"""
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from src.subleases.config import sublease_config
+from src.subleases.models import SubLease, SubLeaseStatus
+from src.utils.cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+
+def expire_subleases(db: Session, batch_size: int = sublease_config.EXPIRY_BATCH_SIZE) -> int:
+    """
+    Mark active subleases whose availability has ended as expired.
+    
+    Rows are updated in batches, each in its own short transaction, and rows
+    locked by concurrent edits are skipped and picked up on the next run.
+    
+    Args:
+        db: Database session.
+        batch_size: Number of subleases updated per transaction.
+        
+    Returns:
+        int: Number of subleases expired.
+    """
+    total = 0
+    while True:
+        batch = select(SubLease.sublease_id).where(
+            SubLease.status == SubLeaseStatus.ACTIVE.value,
+            SubLease.available_until < func.current_date()
+        ).limit(batch_size).with_for_update(skip_locked=True).scalar_subquery()
+        
+        result = db.execute(
+            update(SubLease)
+            .where(SubLease.sublease_id.in_(batch))
+            .values(status=SubLeaseStatus.EXPIRED.value, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    
+    if total:
+        bump_version(SubLease.__tablename__)
+        logger.info(f"Expired {total} subleases")
+    return total
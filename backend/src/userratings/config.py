@@ -0,0 +1,24 @@
+"""
+User ratings configuration.
+"""
+from pydantic import ConfigDict
+from pydantic_settings import BaseSettings
+
+
+class UserRatingConfig(BaseSettings):
+    """
+    User rating configuration settings.
+    """
+    model_config = ConfigDict(env_file=".env", env_prefix="USERRATING_", extra="ignore")
+
+    AGGREGATE_REPAIR_INTERVAL_SECONDS: int = 21600  # How often rating aggregates are reconciled
+    STATS_BATCH_MAX_USERS: int = 100  # Users per batch stats request
+    LIST_MAX_LIMIT: int = 100  # Most ratings returned per page, whatever limit is requested
+    REPUTATION_INTERVAL_SECONDS: int = 3600  # How often reputation scores are recomputed
+    REPUTATION_HALF_LIFE_DAYS: float = 365.0  # Age at which a rating counts half
+    REPUTATION_PRIOR_WEIGHT: float = 5.0  # Pseudo-ratings at the global mean each score starts from
+    REPUTATION_BATCH_SIZE: int = 50000  # Ratings read and scores written per batch
+    REPUTATION_MIN_CHANGE: float = 0.001  # Smallest score change worth writing
+
+
+userrating_config = UserRatingConfig()
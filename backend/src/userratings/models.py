@@ -4,7 +4,7 @@ User ratings domain models.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -16,6 +16,17 @@ class UserRating(Base):
     User rating model for sublease ratings.
     """
     __tablename__ = "user_ratings"
+    __table_args__ = (
+        # Keyset pagination (see RATING_SORT)
+        Index("ix_user_ratings_created_at_id", "created_at", "rating_id"),
+        # Ratings received; covers rating aggregates without heap access
+        Index(
+            "ix_user_ratings_rated_user_created_at", "rated_user_id", "created_at",
+            postgresql_include=["rating"]
+        ),
+        Index("ix_user_ratings_rater_created_at", "rater_id", "created_at"),
+        Index("ix_user_ratings_sublease_id", "sublease_id"),
+    )
     
     rating_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     sublease_id = Column(UUID(as_uuid=True), ForeignKey("subleases.sublease_id"), nullable=False)
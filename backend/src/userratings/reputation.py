@@ -0,0 +1,160 @@
+"""
+Reputation scores: Bayesian-shrunk, recency-weighted rating averages.
+
+Each rating weighs ``0.5 ** (age_days / half_life_days)``, so a review loses
+half its influence every half-life. A user's score is their weighted average
+shrunk towards the platform-wide weighted mean ``m`` by ``prior_weight``
+pseudo-ratings:
+
+    score = (prior_weight * m + sum(w * rating)) / (prior_weight + sum(w))
+
+A single fresh 5-star review barely moves a user off ``m``, while dozens of
+4.8s dominate the prior. Users without ratings score exactly ``m``.
+
+Scores are recomputed periodically over the whole ratings table, streamed in
+batches and reduced with NumPy (see ``src.userratings.tasks``).
+"""
+import uuid
+from typing import Iterable, NamedTuple, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.userratings.models import UserRating
+
+SECONDS_PER_DAY = 86400.0
+
+
+def user_id_from_key(key: bytes) -> uuid.UUID:
+    """
+    Convert a 16-byte key back to a user id.
+
+    NumPy ``S16`` values drop trailing NUL bytes, so pad them back first.
+
+    Args:
+        key: Key from a ``RatingTotals`` array.
+
+    Returns:
+        uuid.UUID: User id.
+    """
+    return uuid.UUID(bytes=bytes(key).ljust(16, b"\0"))
+
+
+class RatingTotals(NamedTuple):
+    """
+    Per-user sums of rating weights and weighted ratings.
+    """
+    user_keys: np.ndarray  # 16-byte user ids, sorted and unique
+    weights: np.ndarray
+    weighted_ratings: np.ndarray
+
+
+def reduce_totals(user_keys: np.ndarray, weights: np.ndarray, weighted_ratings: np.ndarray) -> RatingTotals:
+    """
+    Sum weights and weighted ratings per user.
+
+    Args:
+        user_keys: 16-byte user id of each entry.
+        weights: Weight of each entry.
+        weighted_ratings: Weight times rating of each entry.
+
+    Returns:
+        RatingTotals: One entry per distinct user.
+    """
+    keys, inverse = np.unique(user_keys, return_inverse=True)
+    return RatingTotals(
+        keys,
+        np.bincount(inverse, weights=weights, minlength=len(keys)),
+        np.bincount(inverse, weights=weighted_ratings, minlength=len(keys))
+    )
+
+
+def batch_totals(
+    user_keys: np.ndarray,
+    ratings: np.ndarray,
+    ages_days: np.ndarray,
+    half_life_days: float
+) -> RatingTotals:
+    """
+    Weight one batch of ratings by age and sum them per user.
+
+    Args:
+        user_keys: 16-byte rated user id of each rating.
+        ratings: Rating values.
+        ages_days: Age of each rating in days.
+        half_life_days: Age at which a rating counts half.
+
+    Returns:
+        RatingTotals: Per-user totals for the batch.
+    """
+    weights = np.exp2(-np.maximum(ages_days, 0.0) / half_life_days)
+    return reduce_totals(user_keys, weights, weights * ratings)
+
+
+def merge_totals(batches: Iterable[RatingTotals]) -> RatingTotals:
+    """
+    Combine per-batch totals into per-user totals.
+
+    Args:
+        batches: Totals of each batch.
+
+    Returns:
+        RatingTotals: Totals over all batches.
+    """
+    batches = list(batches)
+    if not batches:
+        return RatingTotals(np.empty(0, dtype="S16"), np.empty(0), np.empty(0))
+    return reduce_totals(
+        np.concatenate([batch.user_keys for batch in batches]),
+        np.concatenate([batch.weights for batch in batches]),
+        np.concatenate([batch.weighted_ratings for batch in batches])
+    )
+
+
+def reputation_scores(totals: RatingTotals, prior_weight: float) -> Tuple[np.ndarray, float]:
+    """
+    Shrink each user's weighted average towards the global weighted mean.
+
+    Args:
+        totals: Per-user totals.
+        prior_weight: Number of pseudo-ratings at the global mean.
+
+    Returns:
+        Tuple[np.ndarray, float]: Score per user in ``totals`` order, and the
+            global mean, which is the score of users without ratings.
+    """
+    total_weight = totals.weights.sum()
+    if total_weight == 0:
+        return np.zeros(len(totals.user_keys)), 0.0
+    prior_mean = float(totals.weighted_ratings.sum() / total_weight)
+    scores = (prior_weight * prior_mean + totals.weighted_ratings) / (prior_weight + totals.weights)
+    return scores, prior_mean
+
+
+def load_rating_totals(db: Session, half_life_days: float, batch_size: int) -> RatingTotals:
+    """
+    Stream the ratings table in batches and reduce it to per-user totals.
+
+    Args:
+        db: Database session.
+        half_life_days: Age at which a rating counts half.
+        batch_size: Rows fetched and reduced at a time.
+
+    Returns:
+        RatingTotals: Per-user totals over every rating.
+    """
+    age_days = func.extract("epoch", func.now() - UserRating.created_at) / SECONDS_PER_DAY
+    result = db.execute(
+        select(UserRating.rated_user_id, UserRating.rating, age_days).execution_options(yield_per=batch_size)
+    )
+    batches = []
+    for rows in result.partitions():
+        user_ids, ratings, ages = zip(*rows)
+        batches.append(batch_totals(
+            np.array([user_id.bytes for user_id in user_ids], dtype="S16"),
+            np.array(ratings, dtype=np.float64),
+            np.array(ages, dtype=np.float64),
+            half_life_days
+        ))
+    return merge_totals(batches)
@@ -4,96 +4,176 @@ User ratings domain router.
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from src.auth.dependencies import get_current_user
 from src.auth.models import User
 from src.database import get_db
+from src.exceptions import NotFoundError, ValidationError
+from src.userratings.config import userrating_config
 from src.userratings.dependencies import get_rating_by_id, get_user_rating, get_rating_service
 from src.userratings.models import UserRating
 from src.userratings.schemas import (
-    UserRatingCreate, UserRatingRead, UserRatingUpdate, UserRatingDetail
+    UserRatingCreate, UserRatingDetail, UserRatingFilters, UserRatingRead, UserRatingStats, UserRatingUpdate
 )
-from src.userratings.service import UserRatingService
+from src.userratings.service import RATING_COLUMNS, UserRatingService
+from src.utils.fieldsets import FieldSet, fieldset_query
+from src.utils.pagination import set_cursor_headers
 from src.utils.responses import success_response
 
 
 router = APIRouter()
 
+RATING_LIST_JSON = TypeAdapter(List[UserRatingRead])
+
+get_rating_fieldset = fieldset_query(UserRatingRead, "rating_id", relations=("rater",))
+
+
+def _convert_rating_to_read(rating: UserRating, fieldset: FieldSet) -> UserRatingRead:
+    """Convert UserRating model to UserRatingRead schema with the selected fields."""
+    if fieldset.is_full:
+        return UserRatingRead.model_validate(rating)
+    rating_dict = {name: getattr(rating, name) for name in RATING_COLUMNS if name in fieldset}
+    if "rater" in fieldset:
+        rating_dict["rater"] = rating.rater
+    return fieldset.build(UserRatingRead, rating_dict)
+
 
 @router.get("/", response_model=List[UserRatingRead])
 def get_ratings(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return (capped server-side)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header"),
     sublease_id: Optional[uuid.UUID] = Query(None, description="Filter by sublease ID"),
     rater_id: Optional[uuid.UUID] = Query(None, description="Filter by rater ID"),
     rated_user_id: Optional[uuid.UUID] = Query(None, description="Filter by rated user ID"),
+    fieldset: FieldSet = Depends(get_rating_fieldset),
     current_user: User = Depends(get_current_user),
     service: UserRatingService = Depends(get_rating_service)
-) -> List[UserRatingRead]:
+) -> Response:
     """
-    Get all ratings with pagination and optional filters.
+    Get ratings matching any combination of filters, newest first.
+    
+    Results are paginated with cursors returned in the
+    ``X-Next-Cursor``/``X-Prev-Cursor`` and ``Link`` headers. ``fields``
+    and ``include`` narrow both the query and the response.
     
     Args:
-        skip: Number of records to skip.
+        request: Current request.
+        response: Response, used to set cursor headers.
+        skip: Legacy offset for the first page.
         limit: Maximum number of records to return.
+        cursor: Cursor from a previous page.
         sublease_id: Optional sublease ID filter.
         rater_id: Optional rater ID filter.
         rated_user_id: Optional rated user ID filter.
+        fieldset: Fields to return.
         service: User rating service.
         
     Returns:
-        List[UserRatingRead]: List of ratings.
-    """
-    if sublease_id:
-        ratings = service.get_ratings_by_sublease(sublease_id)
-    elif rater_id:
-        ratings = service.get_ratings_by_rater(rater_id)
-    elif rated_user_id:
-        ratings = service.get_ratings_for_user(rated_user_id)
-    else:
-        ratings = service.get_all_ratings(skip=skip, limit=limit)
-    
-    return [UserRatingRead.model_validate(rating) for rating in ratings]
+        Response: JSON list of ratings.
+    """
+    filters = UserRatingFilters(sublease_id=sublease_id, rater_id=rater_id, rated_user_id=rated_user_id)
+    page = service.get_ratings_page(filters, limit=limit, cursor=cursor, skip=skip, fieldset=fieldset)
+    set_cursor_headers(request, response, page)
+    ratings = [_convert_rating_to_read(rating, fieldset) for rating in page.items]
+    return fieldset.response(RATING_LIST_JSON, ratings, response)
 
 
 @router.get("/me", response_model=List[UserRatingRead])
 def get_my_ratings(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return (capped server-side)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header"),
+    fieldset: FieldSet = Depends(get_rating_fieldset),
     current_user: User = Depends(get_current_user),
     service: UserRatingService = Depends(get_rating_service)
-) -> List[UserRatingRead]:
+) -> Response:
     """
-    Get current user's ratings (ratings given by the user).
+    Get a page of the current user's ratings (ratings given by the user).
     
     Args:
+        request: Current request.
+        response: Response, used to set cursor headers.
+        limit: Maximum number of records to return.
+        cursor: Cursor from a previous page.
+        fieldset: Fields to return.
         current_user: Current authenticated user.
         service: User rating service.
         
     Returns:
-        List[UserRatingRead]: List of user's ratings.
+        Response: JSON list of user's ratings.
     """
-    ratings = service.get_ratings_by_rater(current_user.user_id)
-    return [UserRatingRead.model_validate(rating) for rating in ratings]
+    page = service.get_ratings_page(
+        UserRatingFilters(rater_id=current_user.user_id), limit=limit, cursor=cursor, fieldset=fieldset
+    )
+    set_cursor_headers(request, response, page)
+    ratings = [_convert_rating_to_read(rating, fieldset) for rating in page.items]
+    return fieldset.response(RATING_LIST_JSON, ratings, response)
 
 
 @router.get("/received", response_model=List[UserRatingRead])
 def get_received_ratings(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return (capped server-side)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header"),
+    fieldset: FieldSet = Depends(get_rating_fieldset),
     current_user: User = Depends(get_current_user),
     service: UserRatingService = Depends(get_rating_service)
-) -> List[UserRatingRead]:
+) -> Response:
     """
-    Get ratings received by the current user.
+    Get a page of ratings received by the current user.
     
     Args:
+        request: Current request.
+        response: Response, used to set cursor headers.
+        limit: Maximum number of records to return.
+        cursor: Cursor from a previous page.
+        fieldset: Fields to return.
         current_user: Current authenticated user.
         service: User rating service.
         
     Returns:
-        List[UserRatingRead]: List of ratings received.
+        Response: JSON list of ratings received.
+    """
+    page = service.get_ratings_page(
+        UserRatingFilters(rated_user_id=current_user.user_id), limit=limit, cursor=cursor, fieldset=fieldset
+    )
+    set_cursor_headers(request, response, page)
+    ratings = [_convert_rating_to_read(rating, fieldset) for rating in page.items]
+    return fieldset.response(RATING_LIST_JSON, ratings, response)
+
+
+@router.get("/stats", response_model=List[UserRatingStats])
+def get_users_rating_stats(
+    user_ids: List[uuid.UUID] = Query(..., description="User IDs, repeated: ?user_ids=a&user_ids=b"),
+    current_user: User = Depends(get_current_user),
+    service: UserRatingService = Depends(get_rating_service)
+) -> List[UserRatingStats]:
+    """
+    Get rating statistics for many users in one request.
+    
+    Args:
+        user_ids: User IDs.
+        service: User rating service.
+        
+    Returns:
+        List[UserRatingStats]: Statistics in request order; unknown users are omitted.
+        
+    Raises:
+        ValidationError: If too many user IDs are requested.
     """
-    ratings = service.get_ratings_for_user(current_user.user_id)
-    return [UserRatingRead.model_validate(rating) for rating in ratings]
+    if len(set(user_ids)) > userrating_config.STATS_BATCH_MAX_USERS:
+        raise ValidationError(
+            f"At most {userrating_config.STATS_BATCH_MAX_USERS} user IDs can be requested at once."
+        )
+    return service.get_users_rating_stats(user_ids)
 
 
 @router.get("/{rating_id}", response_model=UserRatingRead)
@@ -150,8 +230,13 @@ def update_rating(
         
     Returns:
         UserRatingRead: Updated rating.
+        
+    Raises:
+        NotFoundError: If the rating was deleted concurrently.
     """
     updated_rating = service.update_rating(rating.rating_id, rating_data)
+    if not updated_rating:
+        raise NotFoundError(f"Rating with ID {rating.rating_id} not found")
     return UserRatingRead.model_validate(updated_rating)
 
 
@@ -170,27 +255,26 @@ def delete_rating(
     service.delete_rating(rating.rating_id)
 
 
-@router.get("/stats/{user_id}", response_model=dict)
+@router.get("/stats/{user_id}", response_model=UserRatingStats)
 def get_user_rating_stats(
     user_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     service: UserRatingService = Depends(get_rating_service)
-) -> dict:
+) -> UserRatingStats:
     """
-    Get rating statistics for a user.
+    Get rating statistics for a user, read from the maintained aggregates.
     
     Args:
         user_id: User ID.
         service: User rating service.
         
     Returns:
-        dict: Rating statistics.
+        UserRatingStats: Average, total and per-star counts.
+        
+    Raises:
+        NotFoundError: If the user does not exist.
     """
-    average_rating = service.get_user_average_rating(user_id)
-    rating_count = service.get_user_rating_count(user_id)
-    
-    return {
-        "user_id": user_id,
-        "average_rating": average_rating,
-        "total_ratings": rating_count
-    }
+    stats = service.get_user_rating_stats(user_id)
+    if stats is None:
+        raise NotFoundError("User not found")
+    return stats
@@ -3,7 +3,7 @@ User ratings domain schemas.
 """
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -26,6 +26,16 @@ class UserRatingUpdate(BaseModel):
     review: Optional[str] = Field(None, description="Optional review text")
 
 
+class RaterRead(BaseModel):
+    """Schema for the display info of the user who gave a rating."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    user_id: uuid.UUID
+    first_name: str
+    last_name: str
+    profile_image_url: Optional[str] = None
+
+
 class UserRatingRead(UserRatingBase):
     """Schema for reading a user rating."""
     model_config = ConfigDict(from_attributes=True)
@@ -35,6 +45,14 @@ class UserRatingRead(UserRatingBase):
     rater_id: uuid.UUID
     rated_user_id: uuid.UUID
     created_at: datetime
+    rater: Optional[RaterRead] = None
+
+
+class UserRatingFilters(BaseModel):
+    """Filters for listing ratings; any combination may be given."""
+    sublease_id: Optional[uuid.UUID] = None
+    rater_id: Optional[uuid.UUID] = None
+    rated_user_id: Optional[uuid.UUID] = None
 
 
 class UserRatingDetail(UserRatingRead):
@@ -43,3 +61,15 @@ class UserRatingDetail(UserRatingRead):
     rater_name: Optional[str] = None
     rated_user_name: Optional[str] = None
     sublease_title: Optional[str] = None
+
+
+class UserRatingStats(BaseModel):
+    """Schema for a user's rating aggregates."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    user_id: uuid.UUID
+    average_rating: Optional[float] = None
+    total_ratings: int = 0
+    rating_counts: Dict[int, int] = Field(
+        default_factory=dict, description="Number of ratings per star, 1 to 5"
+    )
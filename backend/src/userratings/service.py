@@ -3,12 +3,59 @@ User ratings domain service.
 """
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Numeric, cast, delete, func, update
+from sqlalchemy.orm import Session, load_only
 
+from src.auth.models import User
+from src.userratings.config import userrating_config
 from src.userratings.models import UserRating
-from src.userratings.schemas import UserRatingCreate, UserRatingUpdate
+from src.userratings.schemas import UserRatingCreate, UserRatingFilters, UserRatingStats, UserRatingUpdate
+from src.utils.cache import bump_version
+from src.utils.fieldsets import FieldSet
+from src.utils.loaders import EntityLoader
+from src.utils.pagination import KeysetSort, Page, SortKey, paginate
+
+RATING_SORT = KeysetSort("newest", [
+    SortKey(UserRating.created_at, descending=True),
+    SortKey(UserRating.rating_id, descending=True),
+])
+
+# Rating columns returned by list endpoints
+RATING_COLUMNS = ("rating_id", "sublease_id", "rater_id", "rated_user_id", "rating", "review", "created_at")
+
+STARS = range(1, 6)
+
+
+def rating_count_column(star: int) -> Any:
+    """
+    Get the ``User`` column counting ratings of one star value.
+    
+    Args:
+        star: Rating value, 1 to 5.
+        
+    Returns:
+        Any: ``User.rating_<star>_count`` column.
+    """
+    return getattr(User, f"rating_{star}_count")
+
+
+def rating_average(rating_sum: Any, total_ratings: Any) -> ColumnElement:
+    """
+    Build the average rating expression from a running sum and count.
+    
+    Shared by the incremental updates and the repair job so both store
+    exactly the same value.
+    
+    Args:
+        rating_sum: Sum of ratings expression.
+        total_ratings: Number of ratings expression.
+        
+    Returns:
+        ColumnElement: Average, NULL when there are no ratings.
+    """
+    return cast(rating_sum, Numeric) / func.nullif(total_ratings, 0)
 
 
 class UserRatingService:
@@ -29,56 +76,58 @@ class UserRatingService:
         Returns:
             UserRating: User rating object or None.
         """
-        return self.db.query(UserRating).filter(UserRating.rating_id == rating_id).first()
+        return EntityLoader.for_session(self.db).load(UserRating, rating_id)
     
-    def get_ratings_by_sublease(self, sublease_id: uuid.UUID) -> List[UserRating]:
+    def get_ratings_page(
+        self,
+        filters: Optional[UserRatingFilters] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fieldset: Optional[FieldSet] = None
+    ) -> Page[UserRating]:
         """
-        Get all ratings for a sublease.
+        Get a page of ratings matching any combination of filters, newest first.
         
-        Args:
-            sublease_id: Sublease ID.
-            
-        Returns:
-            List[UserRating]: List of rating objects.
-        """
-        return self.db.query(UserRating).filter(UserRating.sublease_id == sublease_id).all()
-    
-    def get_ratings_by_rater(self, rater_id: uuid.UUID) -> List[UserRating]:
-        """
-        Get all ratings given by a user.
+        Unless the fieldset leaves them out, raters not already in the
+        session are loaded with one more query for the whole page. Pages
+        never exceed ``USERRATING_LIST_MAX_LIMIT`` rows whatever ``limit``
+        asks for.
         
         Args:
-            rater_id: Rater user ID.
+            filters: Optional sublease, rater and rated user filters.
+            limit: Page size.
+            cursor: Cursor from a previous page.
+            skip: Legacy offset, only used for the first page.
+            fieldset: Response fields to load; everything by default.
             
         Returns:
-            List[UserRating]: List of rating objects.
-        """
-        return self.db.query(UserRating).filter(UserRating.rater_id == rater_id).all()
-    
-    def get_ratings_for_user(self, rated_user_id: uuid.UUID) -> List[UserRating]:
-        """
-        Get all ratings received by a user.
-        
-        Args:
-            rated_user_id: Rated user ID.
+            Page[UserRating]: Ratings with their raters, and page cursors.
             
-        Returns:
-            List[UserRating]: List of rating objects.
-        """
-        return self.db.query(UserRating).filter(UserRating.rated_user_id == rated_user_id).all()
-    
-    def get_all_ratings(self, skip: int = 0, limit: int = 100) -> List[UserRating]:
+        Raises:
+            ValidationError: If the cursor is invalid.
         """
-        Get all ratings with pagination.
+        filters = filters or UserRatingFilters()
+        fieldset = fieldset or FieldSet()
+        query = self.db.query(UserRating)
+        if not fieldset.is_full:
+            query = query.options(load_only(
+                UserRating.rating_id, UserRating.rater_id, UserRating.created_at,
+                *(getattr(UserRating, name) for name in RATING_COLUMNS if name in fieldset)
+            ))
+        if filters.sublease_id:
+            query = query.filter(UserRating.sublease_id == filters.sublease_id)
+        if filters.rater_id:
+            query = query.filter(UserRating.rater_id == filters.rater_id)
+        if filters.rated_user_id:
+            query = query.filter(UserRating.rated_user_id == filters.rated_user_id)
         
-        Args:
-            skip: Number of records to skip.
-            limit: Maximum number of records to return.
-            
-        Returns:
-            List[UserRating]: List of rating objects.
-        """
-        return self.db.query(UserRating).offset(skip).limit(limit).all()
+        page = paginate(query, RATING_SORT, min(limit, userrating_config.LIST_MAX_LIMIT), cursor, start=skip)
+        if "rater" in fieldset:
+            # A page usually repeats raters (and includes the current user); rating.rater then
+            # resolves from the identity map
+            EntityLoader.for_session(self.db).load_many(User, [rating.rater_id for rating in page.items])
+        return page
     
     def create_rating(self, rating_data: UserRatingCreate, rater_id: uuid.UUID) -> UserRating:
         """
@@ -100,7 +149,9 @@ class UserRatingService:
             review=rating_data.review
         )
         self.db.add(db_rating)
+        self._update_aggregates(db_rating.rated_user_id, added=db_rating.rating)
         self.db.commit()
+        bump_version(UserRating.__tablename__, User.__tablename__)
         self.db.refresh(db_rating)
         return db_rating
     
@@ -115,14 +166,18 @@ class UserRatingService:
         Returns:
             UserRating: Updated rating object or None.
         """
-        db_rating = self.get_rating_by_id(rating_id)
+        db_rating = self._lock_rating(rating_id)
         if not db_rating:
             return None
         
+        previous_rating = db_rating.rating
         for key, value in rating_data.model_dump(exclude_unset=True).items():
             setattr(db_rating, key, value)
         
+        if db_rating.rating != previous_rating:
+            self._update_aggregates(db_rating.rated_user_id, added=db_rating.rating, removed=previous_rating)
         self.db.commit()
+        bump_version(UserRating.__tablename__, User.__tablename__)
         self.db.refresh(db_rating)
         return db_rating
     
@@ -136,17 +191,66 @@ class UserRatingService:
         Returns:
             bool: True if deleted, False if not found.
         """
-        db_rating = self.get_rating_by_id(rating_id)
+        db_rating = self._lock_rating(rating_id)
         if not db_rating:
             return False
         
-        self.db.delete(db_rating)
+        deleted = self.db.execute(
+            delete(UserRating)
+            .where(UserRating.rating_id == rating_id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not deleted:
+            self.db.rollback()
+            return False
+        self._update_aggregates(db_rating.rated_user_id, removed=db_rating.rating)
         self.db.commit()
+        bump_version(UserRating.__tablename__, User.__tablename__)
         return True
     
+    def get_user_rating_stats(self, user_id: uuid.UUID) -> Optional[UserRatingStats]:
+        """
+        Get a user's rating aggregates without reading their ratings.
+        
+        Args:
+            user_id: User ID.
+            
+        Returns:
+            Optional[UserRatingStats]: Rating statistics, or None if the user doesn't exist.
+        """
+        stats = self.get_users_rating_stats([user_id])
+        return stats[0] if stats else None
+    
+    def get_users_rating_stats(self, user_ids: List[uuid.UUID]) -> List[UserRatingStats]:
+        """
+        Get the rating aggregates of many users in one query.
+        
+        Args:
+            user_ids: User IDs; duplicates are ignored.
+            
+        Returns:
+            List[UserRatingStats]: Statistics in the order of ``user_ids``,
+                skipping users that don't exist.
+        """
+        rows = self.db.query(
+            User.user_id, User.average_rating, User.total_ratings,
+            *(rating_count_column(star) for star in STARS)
+        ).filter(User.user_id.in_(set(user_ids))).all()
+        
+        by_id = {
+            row.user_id: UserRatingStats(
+                user_id=row.user_id,
+                average_rating=row.average_rating,
+                total_ratings=row.total_ratings,
+                rating_counts={star: getattr(row, f"rating_{star}_count") for star in STARS}
+            )
+            for row in rows
+        }
+        return [by_id[user_id] for user_id in dict.fromkeys(user_ids) if user_id in by_id]
+    
     def get_user_average_rating(self, user_id: uuid.UUID) -> Optional[float]:
         """
-        Calculate the average rating for a user.
+        Get the average rating for a user.
         
         Args:
             user_id: User ID.
@@ -154,11 +258,8 @@ class UserRatingService:
         Returns:
             float: Average rating or None if no ratings.
         """
-        ratings = self.get_ratings_for_user(user_id)
-        if not ratings:
-            return None
-        
-        return sum(rating.rating for rating in ratings) / len(ratings)
+        average = self.db.query(User.average_rating).filter(User.user_id == user_id).scalar()
+        return float(average) if average is not None else None
     
     def get_user_rating_count(self, user_id: uuid.UUID) -> int:
         """
@@ -170,4 +271,62 @@ class UserRatingService:
         Returns:
             int: Number of ratings.
         """
-        return self.db.query(UserRating).filter(UserRating.rated_user_id == user_id).count()
+        return self.db.query(User.total_ratings).filter(User.user_id == user_id).scalar() or 0
+    
+    def _lock_rating(self, rating_id: uuid.UUID) -> Optional[UserRating]:
+        """
+        Load a rating with a row lock held until the end of the transaction.
+        
+        Concurrent edits or deletes of the same rating wait for each other,
+        so each sees the value the previous one left and the aggregate
+        deltas are computed from it rather than from a stale copy.
+        
+        Args:
+            rating_id: Rating ID.
+            
+        Returns:
+            Optional[UserRating]: Locked rating, or None if it doesn't exist (any more).
+        """
+        return (
+            self.db.query(UserRating)
+            .filter(UserRating.rating_id == rating_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+    
+    def _update_aggregates(
+        self,
+        user_id: uuid.UUID,
+        added: Optional[int] = None,
+        removed: Optional[int] = None
+    ) -> None:
+        """
+        Apply a rating change to the rated user's aggregates in the current transaction.
+        
+        The update is relative to the stored values, so concurrent changes for
+        the same user serialize on its row instead of overwriting each other.
+        
+        Args:
+            user_id: Rated user ID.
+            added: Rating value added, if any.
+            removed: Rating value removed, if any.
+        """
+        sum_delta = (added or 0) - (removed or 0)
+        count_delta = (added is not None) - (removed is not None)
+        values: Dict[Any, Any] = {
+            User.rating_sum: User.rating_sum + sum_delta,
+            User.total_ratings: User.total_ratings + count_delta,
+            User.average_rating: rating_average(User.rating_sum + sum_delta, User.total_ratings + count_delta),
+        }
+        if added is not None:
+            values[rating_count_column(added)] = rating_count_column(added) + 1
+        if removed is not None:
+            values[rating_count_column(removed)] = rating_count_column(removed) - 1
+        
+        self.db.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,137 @@
+"""
+User ratings background tasks.
+"""
+import logging
+
+import numpy as np
+from sqlalchemy import Float, bindparam, func, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session, aliased
+
+from src.auth.models import User
+from src.userratings.config import userrating_config
+from src.userratings.models import UserRating
+from src.userratings.reputation import load_rating_totals, reputation_scores, user_id_from_key
+from src.userratings.service import STARS, rating_average, rating_count_column
+from src.utils.cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+
+def repair_rating_aggregates(db: Session) -> int:
+    """
+    Recompute every user's rating aggregates and fix the ones that drifted.
+
+    Aggregates are maintained incrementally by ``UserRatingService``; this
+    catches rows changed outside of it (manual SQL, restores). Only users whose
+    stored values differ are updated.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        int: Number of users repaired.
+    """
+    ratings = select(
+        UserRating.rated_user_id,
+        func.count().label("total_ratings"),
+        func.sum(UserRating.rating).label("rating_sum"),
+        *(func.count().filter(UserRating.rating == star).label(f"rating_{star}_count") for star in STARS)
+    ).group_by(UserRating.rated_user_id).subquery()
+
+    # Users without ratings must be reset too, so start from every user
+    user = aliased(User)
+    count_columns = [f"rating_{star}_count" for star in STARS]
+    actual = select(
+        user.user_id,
+        func.coalesce(ratings.c.total_ratings, 0).label("total_ratings"),
+        func.coalesce(ratings.c.rating_sum, 0).label("rating_sum"),
+        *(func.coalesce(ratings.c[name], 0).label(name) for name in count_columns)
+    ).outerjoin(ratings, ratings.c.rated_user_id == user.user_id).subquery()
+
+    stored = [User.total_ratings, User.rating_sum, *(rating_count_column(star) for star in STARS)]
+    expected = [actual.c.total_ratings, actual.c.rating_sum, *(actual.c[name] for name in count_columns)]
+    result = db.execute(
+        update(User)
+        .where(
+            User.user_id == actual.c.user_id,
+            or_(
+                tuple_(*stored).is_distinct_from(tuple_(*expected)),
+                User.average_rating.is_distinct_from(rating_average(actual.c.rating_sum, actual.c.total_ratings))
+            )
+        )
+        .values({
+            User.total_ratings: actual.c.total_ratings,
+            User.rating_sum: actual.c.rating_sum,
+            User.average_rating: rating_average(actual.c.rating_sum, actual.c.total_ratings),
+            **{rating_count_column(star): actual.c[f"rating_{star}_count"] for star in STARS}
+        })
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if result.rowcount:
+        bump_version(User.__tablename__)
+        logger.warning(f"Repaired rating aggregates of {result.rowcount} users")
+    return result.rowcount
+
+
+def recompute_reputation_scores(db: Session) -> int:
+    """
+    Recompute every user's reputation score and store the changed ones.
+
+    See ``src.userratings.reputation`` for the scoring model. Decay moves
+    every score a little on each run, so only changes larger than
+    ``REPUTATION_MIN_CHANGE`` are written. ``updated_at`` is left alone:
+    the score isn't part of the user's profile, and bumping it would
+    invalidate every validator derived from the user.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        int: Number of users whose score changed.
+    """
+    totals = load_rating_totals(
+        db, userrating_config.REPUTATION_HALF_LIFE_DAYS, userrating_config.REPUTATION_BATCH_SIZE
+    )
+    scores, prior_mean = reputation_scores(totals, userrating_config.REPUTATION_PRIOR_WEIGHT)
+    scores = np.round(scores, 6)
+    prior_mean = round(prior_mean, 6)
+    min_change = userrating_config.REPUTATION_MIN_CHANGE
+
+    # Rated users get their own score, unrated users the global mean
+    changed = db.execute(
+        update(User)
+        .where(User.total_ratings == 0, func.abs(User.reputation_score - prior_mean) > min_change)
+        # Keep updated_at: setting it explicitly skips the column's onupdate
+        .values(reputation_score=prior_mean, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+
+    assign = text(
+        "UPDATE users SET reputation_score = v.score "
+        "FROM unnest(CAST(:user_ids AS uuid[]), CAST(:scores AS float8[])) AS v(user_id, score) "
+        "WHERE users.user_id = v.user_id AND abs(users.reputation_score - v.score) > :min_change"
+    ).bindparams(
+        bindparam("user_ids", type_=ARRAY(UUID(as_uuid=True))),
+        bindparam("scores", type_=ARRAY(Float)),
+        bindparam("min_change", type_=Float)
+    )
+    batch_size = userrating_config.REPUTATION_BATCH_SIZE
+    for start in range(0, len(scores), batch_size):
+        keys = totals.user_keys[start:start + batch_size]
+        changed += db.execute(assign, {
+            "user_ids": [user_id_from_key(key) for key in keys],
+            "scores": scores[start:start + batch_size].tolist(),
+            "min_change": min_change
+        }).rowcount
+        db.commit()
+
+    if changed:
+        bump_version(User.__tablename__)
+    logger.info(
+        f"Recomputed reputation of {len(scores)} rated users (prior mean {prior_mean:.3f}); {changed} changed"
+    )
+    return changed
@@ -0,0 +1,350 @@
+"""
+Versioned cache of serialized JSON responses.
+
+A cached response is stored under a key built from the request path, its
+query string and the current version of every table the response reads.
+Services call ``bump_version`` after committing a write, so later requests
+compute a new key and never see the stale entry; superseded entries age out
+of the LRU or expire.
+
+Entries are kept in an in-process LRU. With ``RESPONSE_CACHE_BACKEND=redis``
+versions and entries are also shared through Redis, so a bump in one worker
+is seen by all of them. The local LRU still answers repeat hits, leaving one
+round trip per request to read versions. In ``memory`` mode versions are per
+process, so with several workers a write is seen by the other workers only
+after ``RESPONSE_CACHE_TTL_SECONDS``.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from src.config import settings
+from src.utils.conditional import etag_matches, not_modified_response
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "cache:version:"
+RESPONSE_KEY_PREFIX = "cache:response:"
+
+
+class CachedResponse(NamedTuple):
+    """
+    Serialized response body with the headers to send alongside it.
+    """
+    body: bytes
+    headers: Dict[str, str]
+
+    def to_response(self, cache_status: str = "HIT") -> Response:
+        """
+        Build a JSON response from the cached bytes.
+
+        Args:
+            cache_status: Value of the ``X-Cache`` header.
+
+        Returns:
+            Response: Response sending the body unchanged.
+        """
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={**self.headers, "X-Cache": cache_status}
+        )
+
+    def replay(self, request: Request) -> Response:
+        """
+        Send the cached body, or an empty 304 if the client's ETag still matches.
+
+        Args:
+            request: Current request.
+
+        Returns:
+            Response: Cached or 304 response.
+        """
+        if etag_matches(request, self.headers.get("etag")):
+            return not_modified_response(self.headers)
+        return self.to_response()
+
+    def dumps(self) -> bytes:
+        """
+        Encode for a shared backend: a JSON header line followed by the body.
+
+        Returns:
+            bytes: Encoded entry.
+        """
+        return json.dumps(self.headers).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        """
+        Decode an entry written by ``dumps``.
+
+        Args:
+            data: Encoded entry.
+
+        Returns:
+            CachedResponse: Decoded entry.
+        """
+        headers, _, body = data.partition(b"\n")
+        return cls(body, json.loads(headers))
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU with a per-entry time to live.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Get an entry, marking it recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Optional[CachedResponse]: Entry, or None if missing or expired.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """
+        Store an entry, evicting the least recently used ones beyond capacity.
+
+        Args:
+            key: Cache key.
+            entry: Entry to store.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Response cache keyed by request and table versions.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, redis_url: Optional[str] = None):
+        """
+        Args:
+            max_entries: Capacity of the in-process LRU.
+            ttl_seconds: Lifetime of an entry.
+            redis_url: Redis URL to share versions and entries across workers.
+
+        Raises:
+            RuntimeError: If a Redis URL is given but the redis package is missing.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.local = LRUCache(max_entries, ttl_seconds)
+        self._versions: Dict[str, int] = {}
+        self._versions_lock = threading.Lock()
+        self.redis = None
+        if redis_url:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "The redis response cache backend requires redis. "
+                    "Install it with `uv sync --extra redis`."
+                ) from e
+            self._redis_error = redis.RedisError
+            self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def versions(self, tables: Sequence[str]) -> List[int]:
+        """
+        Get the current version of each table.
+
+        Args:
+            tables: Table names.
+
+        Returns:
+            List[int]: Versions in the same order.
+        """
+        if self.redis is not None:
+            try:
+                values = self.redis.mget([VERSION_KEY_PREFIX + table for table in tables])
+                return [int(value or 0) for value in values]
+            except self._redis_error:
+                logger.warning("Response cache: reading versions from Redis failed", exc_info=True)
+                return [-1] * len(tables)
+        with self._versions_lock:
+            return [self._versions.get(table, 0) for table in tables]
+
+    def bump(self, *tables: str) -> None:
+        """
+        Invalidate cached responses reading any of ``tables``.
+
+        Args:
+            *tables: Names of the tables that changed.
+        """
+        with self._versions_lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+        if self.redis is not None:
+            try:
+                with self.redis.pipeline(transaction=False) as pipe:
+                    for table in tables:
+                        pipe.incr(VERSION_KEY_PREFIX + table)
+                    pipe.execute()
+            except self._redis_error:
+                logger.warning("Response cache: bumping versions in Redis failed", exc_info=True)
+
+    def key(self, request: Request, tables: Sequence[str]) -> Optional[str]:
+        """
+        Build the cache key of a request at the current table versions.
+
+        Compute the key before reading the database: if a write lands in
+        between, the response is stored under the older versions and is
+        never served.
+
+        Args:
+            request: Current request.
+            tables: Tables the response is built from.
+
+        Returns:
+            Optional[str]: Cache key, or None if versions are unavailable.
+        """
+        versions = self.versions(tables)
+        if -1 in versions:
+            return None
+        query = sorted(request.query_params.multi_items())
+        raw = json.dumps([request.url.path, query, list(tables), versions], separators=(",", ":"))
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[CachedResponse]:
+        """
+        Look an entry up locally, then in the shared backend.
+
+        Args:
+            key: Cache key from ``key``.
+
+        Returns:
+            Optional[CachedResponse]: Cached entry, or None on a miss.
+        """
+        if key is None:
+            return None
+        entry = self.local.get(key)
+        if entry is not None or self.redis is None:
+            return entry
+        try:
+            data = self.redis.get(RESPONSE_KEY_PREFIX + key)
+        except self._redis_error:
+            logger.warning("Response cache: Redis lookup failed", exc_info=True)
+            return None
+        if data is None:
+            return None
+        entry = CachedResponse.loads(data)
+        self.local.set(key, entry)
+        return entry
+
+    def store(self, key: Optional[str], body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Cache a serialized body and build the response for it.
+
+        Args:
+            key: Cache key from ``key``.
+            body: Serialized JSON body.
+            headers: Headers to replay on cache hits (e.g. cursor headers).
+
+        Returns:
+            Response: Response sending ``body``.
+        """
+        entry = CachedResponse(body, dict(headers or {}))
+        if key is not None:
+            self.local.set(key, entry)
+            if self.redis is not None:
+                try:
+                    self.redis.set(RESPONSE_KEY_PREFIX + key, entry.dumps(), ex=self.ttl_seconds)
+                except self._redis_error:
+                    logger.warning("Response cache: Redis store failed", exc_info=True)
+        return entry.to_response("MISS")
+
+
+class DisabledResponseCache(ResponseCache):
+    """
+    Response cache that never stores anything.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(max_entries=0, ttl_seconds=0)
+
+    def key(self, request: Request, tables: Sequence[str]) -> Optional[str]:
+        return None
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    """
+    Get the configured response cache.
+
+    Returns:
+        ResponseCache: Process-wide response cache.
+
+    Raises:
+        RuntimeError: If the configured backend is unknown or misconfigured.
+    """
+    backend = settings.RESPONSE_CACHE_BACKEND
+    if backend == "none":
+        return DisabledResponseCache()
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("REDIS_URL must be set when RESPONSE_CACHE_BACKEND=redis")
+        return ResponseCache(
+            settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS, settings.REDIS_URL
+        )
+    if backend != "memory":
+        raise RuntimeError(f"Unknown response cache backend '{backend}'")
+    return ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def invalidates_other_processes() -> bool:
+    """
+    Whether ``bump_version`` in this process reaches every API worker.
+
+    Only the redis backend shares versions between processes; with ``memory``
+    a bump from a separate process (e.g. a CLI) only changes its own copy.
+
+    Returns:
+        bool: True if other processes see bumps immediately (or nothing is cached).
+    """
+    return settings.RESPONSE_CACHE_BACKEND in ("redis", "none")
+
+
+def bump_version(*tables: str) -> None:
+    """
+    Invalidate cached responses built from ``tables``; call after committing.
+
+    Args:
+        *tables: Names of the tables that changed.
+    """
+    get_response_cache().bump(*tables)
@@ -0,0 +1,180 @@
+"""
+Conditional GET support with ``ETag`` and ``Last-Modified`` validators.
+
+Handlers derive validators from cheap inputs (ids and timestamps of the rows a
+response is built from, or a small aggregate query) and call
+``not_modified`` before serializing. If the client's ``If-None-Match`` (or,
+without one, ``If-Modified-Since``) still matches, the handler returns an
+empty 304 instead of the payload.
+
+ETags are weak: they identify the data behind a response, not its exact
+bytes. Last-Modified is the newest timestamp among those rows. Removing a row
+from a collection doesn't advance it, so collection endpoints only compare
+ETags.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from fastapi import Request, Response, status
+
+# Authenticated payloads: browsers may keep them, but must revalidate first
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values a response depends on.
+
+    Args:
+        *parts: JSON-serializable values; ids, datetimes and decimals are
+            converted with ``str``.
+
+    Returns:
+        str: Weak entity tag.
+    """
+    raw = json.dumps(parts, default=str, separators=(",", ":"))
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+
+
+def latest(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    """
+    Get the newest of some timestamps, ignoring missing ones.
+
+    Args:
+        *timestamps: Naive UTC timestamps.
+
+    Returns:
+        Optional[datetime]: Newest timestamp, or None if all are missing.
+    """
+    present = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(present) if present else None
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Build the validator headers for a response.
+
+    Args:
+        etag: Entity tag.
+        last_modified: Naive UTC modification time.
+
+    Returns:
+        Dict[str, str]: ``ETag``, ``Cache-Control`` and, if known, ``Last-Modified``.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """
+    Check ``If-None-Match`` using weak comparison.
+
+    Args:
+        request: Current request.
+        etag: Current entity tag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == current for tag in header.split(","))
+
+
+def is_not_modified(
+    request: Request,
+    etag: Optional[str],
+    last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Evaluate the request's preconditions against the current validators.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    consulted without it, and only if ``last_modified`` is given.
+
+    Args:
+        request: Current request.
+        etag: Current entity tag.
+        last_modified: Naive UTC modification time.
+
+    Returns:
+        bool: True if a 304 should be sent.
+    """
+    if "if-none-match" in request.headers:
+        return etag_matches(request, etag)
+
+    header = request.headers.get("if-modified-since")
+    if not header or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified_response(headers: Mapping[str, str]) -> Response:
+    """
+    Build an empty 304 response, keeping only the headers allowed on it.
+
+    Args:
+        headers: Headers of the full response.
+
+    Returns:
+        Response: 304 Not Modified response.
+    """
+    allowed = {"etag", "last-modified", "cache-control", "vary", "link", "x-next-cursor", "x-prev-cursor"}
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={name: value for name, value in headers.items() if name.lower() in allowed}
+    )
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    compare_last_modified: bool = True
+) -> Optional[Response]:
+    """
+    Add validators to a response and short-circuit if the client is current.
+
+    Args:
+        request: Current request.
+        response: Response the validators are added to.
+        etag: Current entity tag.
+        last_modified: Naive UTC modification time.
+        compare_last_modified: Whether ``If-Modified-Since`` may produce a 304;
+            disable it for collections whose timestamps miss removals.
+
+    Returns:
+        Optional[Response]: A 304 response to return instead, or None to send
+            the full payload.
+    """
+    for name, value in validator_headers(etag, last_modified).items():
+        response.headers[name] = value
+    if is_not_modified(request, etag, last_modified if compare_last_modified else None):
+        return not_modified_response(response.headers)
+    return None
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    return timestamp.replace(tzinfo=timezone.utc) if timestamp.tzinfo is None else timestamp
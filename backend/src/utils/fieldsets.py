@@ -0,0 +1,171 @@
+"""
+Sparse fieldsets for list endpoints.
+
+List endpoints take ``fields`` (comma-separated scalar fields) and
+``include`` (comma-separated related objects) query parameters:
+
+- neither: the full representation, as before;
+- ``fields`` only: the identifier plus the listed fields, no related objects;
+- ``include`` only: every scalar field plus the listed related objects;
+- both: the identifier, the listed fields and the listed related objects.
+
+Services use the resulting ``FieldSet`` to load only the columns and
+relationships a response needs; routers use it to serialize only those
+fields, e.g. ``?fields=title,rate&include=primary_image`` for a listing card.
+"""
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Iterable, Optional, Sequence, Type
+
+from fastapi import Query, Response
+from pydantic import BaseModel, TypeAdapter
+
+from src.exceptions import ValidationError
+from src.utils.serialization import orm_model, partial_model
+
+
+class FieldSet:
+    """
+    Top-level fields of a response schema selected by a request.
+    """
+
+    def __init__(self, names: Optional[AbstractSet[str]] = None):
+        """
+        Args:
+            names: Selected fields, or None for every field.
+        """
+        self.names: Optional[FrozenSet[str]] = frozenset(names) if names is not None else None
+
+    @property
+    def is_full(self) -> bool:
+        """Whether every field is selected."""
+        return self.names is None
+
+    def __contains__(self, name: str) -> bool:
+        return self.names is None or name in self.names
+
+    def wants_any(self, *names: str) -> bool:
+        """
+        Check whether any of the given fields is selected.
+
+        Args:
+            names: Field names.
+
+        Returns:
+            bool: True if at least one is selected.
+        """
+        return any(name in self for name in names)
+
+    def build(self, schema: Type[BaseModel], values: Dict[str, Any]) -> BaseModel:
+        """
+        Build a response model from the values of the selected fields.
+
+        Narrowed models lack the fields that weren't selected; serialize
+        them with ``dump_json``, which only emits the selected fields.
+
+        Args:
+            schema: Response schema.
+            values: Field values, ORM rows for nested schemas; unselected entries are ignored.
+
+        Returns:
+            BaseModel: Response model.
+        """
+        if self.names is None:
+            return orm_model(schema, values)
+        return partial_model(schema, {
+            name: values[name] for name in schema.model_fields if name in values and name in self.names
+        })
+
+    def dump_json(self, adapter: TypeAdapter, items: Sequence[BaseModel]) -> bytes:
+        """
+        Serialize a list of response models with only the selected fields.
+
+        Args:
+            adapter: Type adapter of the list type.
+            items: Response models.
+
+        Returns:
+            bytes: JSON array.
+        """
+        if self.names is None:
+            return adapter.dump_json(items)
+        return adapter.dump_json(items, include={"__all__": set(self.names)})
+
+    def envelope_include(self, schema: Type[BaseModel], items_field: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the ``include`` argument narrowing the items of an envelope schema.
+
+        Args:
+            schema: Envelope schema, e.g. a search response with totals.
+            items_field: Field of ``schema`` holding the list of items.
+
+        Returns:
+            Optional[Dict[str, Any]]: Include for ``model_dump_json``, or None for everything.
+        """
+        if self.names is None:
+            return None
+        include: Dict[str, Any] = {name: True for name in schema.model_fields}
+        include[items_field] = {"__all__": set(self.names)}
+        return include
+
+    def response(self, adapter: TypeAdapter, items: Sequence[BaseModel], response: Response) -> Response:
+        """
+        Render a list of response models as a JSON response.
+
+        Args:
+            adapter: Type adapter of the list type.
+            items: Response models.
+            response: Response whose headers (e.g. cursors) are kept.
+
+        Returns:
+            Response: JSON response.
+        """
+        return Response(
+            content=self.dump_json(adapter, items),
+            media_type="application/json",
+            headers=dict(response.headers)
+        )
+
+
+def fieldset_query(
+    schema: Type[BaseModel],
+    identifier: str,
+    relations: Iterable[str] = ()
+) -> Callable[..., FieldSet]:
+    """
+    Create a dependency reading the ``fields`` and ``include`` query parameters.
+
+    Args:
+        schema: Response schema of the list items.
+        identifier: Field that is always returned.
+        relations: Fields holding related objects; only selectable with ``include``.
+
+    Returns:
+        Callable[..., FieldSet]: FastAPI dependency returning the selected fields.
+    """
+    relations = tuple(relations)
+    scalars = tuple(name for name in schema.model_fields if name not in relations)
+
+    def get_fieldset(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated fields to return: {', '.join(scalars)}"
+        ),
+        include: Optional[str] = Query(
+            None, description=f"Comma-separated related objects to return: {', '.join(relations) or 'none'}"
+        )
+    ) -> FieldSet:
+        if fields is None and include is None:
+            return FieldSet()
+        selected_fields = _parse(fields, scalars, "field") if fields is not None else set(scalars)
+        selected_relations = _parse(include, relations, "include") if include is not None else set()
+        return FieldSet(selected_fields | selected_relations | {identifier})
+
+    return get_fieldset
+
+
+def _parse(value: str, allowed: Sequence[str], kind: str) -> set:
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = sorted(names.difference(allowed))
+    if unknown:
+        raise ValidationError(
+            f"Unknown {kind} {', '.join(unknown)}; expected any of: {', '.join(allowed) or 'none'}"
+        )
+    return names
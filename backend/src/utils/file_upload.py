@@ -1,20 +1,29 @@
 """
 File upload utilities for handling image uploads and processing.
 """
+import hashlib
 import os
+import posixpath
+import re
 import uuid
-from typing import Optional
+from typing import Dict, Optional
 
-import aiofiles
 from fastapi import UploadFile
-from PIL import Image
 
 from src.config import settings
 from src.exceptions import FileUploadError, FileProcessingError
+from src.storage import get_storage
+from src.storage.schemas import StoredObject
+from src.utils.image_processing import render_jpeg_variants, run_in_process
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 MAX_FILE_SIZE = settings.MAX_FILE_SIZE
 
+# Avatar sizes (max width/height in px); the largest is the profile_image_url
+AVATAR_SIZES = (64, 128, 300)
+AVATAR_DEFAULT_SIZE = max(AVATAR_SIZES)
+AVATAR_URL_PATTERN = re.compile(r"/avatars/[^/]+/[0-9a-f]+_(?P<size>\d+)\.jpg$")
+
 
 async def validate_image_file(upload_file: UploadFile) -> None:
     """
@@ -68,128 +77,121 @@ async def save_upload_file(
     upload_file: UploadFile, 
     directory: str, 
     filename: Optional[str] = None
-) -> str:
+) -> StoredObject:
     """
-    Save uploaded file to specified directory.
+    Save uploaded file to the configured storage backend.
     
     Args:
         upload_file: The uploaded file to save.
-        directory: Target directory within uploads folder.
+        directory: Target directory (key prefix) within storage.
         filename: Optional custom filename.
         
     Returns:
-        str: Path to saved file.
+        StoredObject: Metadata of the stored file.
         
     Raises:
         FileUploadError: If file validation fails.
     """
     await validate_image_file(upload_file)
 
-    upload_path = os.path.join(settings.UPLOAD_DIR, directory)
-    os.makedirs(upload_path, exist_ok=True)
-
     if not filename:
         file_extension = os.path.splitext(upload_file.filename or "")[1].lower()
         filename = f"{uuid.uuid4()}{file_extension}"
     
-    file_path = os.path.join(upload_path, filename)
-
-    async with aiofiles.open(file_path, 'wb') as f:
-        content = await upload_file.read()
-        await f.write(content)
-    
-    return file_path
+    content = await upload_file.read()
+    return await get_storage().put(
+        posixpath.join(directory, filename),
+        content,
+        content_type=upload_file.content_type
+    )
 
 
-async def resize_image(
-    file_path: str, 
-    max_width: int, 
-    max_height: int, 
-    quality: int = 85
-) -> str:
+async def upload_user_avatar(user_id: uuid.UUID, file: UploadFile) -> Dict[int, str]:
     """
-    Resize and optimize image.
+    Upload and process user avatar image.
+
+    The upload is decoded once in memory and every size in ``AVATAR_SIZES`` is
+    encoded in the image process pool, so the event loop never runs Pillow.
+    Keys embed a hash of the upload, which makes avatar URLs immutable and
+    lets them be cached forever.
     
     Args:
-        file_path: Path to the image file.
-        max_width: Maximum width for the resized image.
-        max_height: Maximum height for the resized image.
-        quality: JPEG quality (1-100).
+        user_id: UUID of the user.
+        file: Uploaded avatar file.
         
     Returns:
-        str: Path to optimized image.
+        Dict[int, str]: Public URL of each avatar size.
         
     Raises:
+        FileUploadError: If file validation fails.
         FileProcessingError: If image processing fails.
     """
+    await validate_image_file(file)
+    content = await file.read()
+
     try:
-        with Image.open(file_path) as img:
-            # Convert to RGB if necessary
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            
-            # Calculate new dimensions
-            ratio = min(max_width / img.width, max_height / img.height)
-            if ratio < 1:
-                new_width = int(img.width * ratio)
-                new_height = int(img.height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Save optimized image
-            optimized_path = file_path.replace(
-                os.path.splitext(file_path)[1], 
-                "_optimized.jpg"
-            )
-            img.save(optimized_path, "JPEG", quality=quality)
-            
-            # Remove original file
-            os.remove(file_path)
-            
-            return optimized_path
+        variants = await run_in_process(render_jpeg_variants, content, AVATAR_SIZES)
     except Exception as e:
         raise FileProcessingError(f"Failed to process image: {str(e)}")
 
+    storage = get_storage()
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    urls = {}
+    for size, data in variants.items():
+        key = f"avatars/{user_id}/{digest}_{size}.jpg"
+        await storage.put(key, data, content_type="image/jpeg")
+        urls[size] = storage.url(key)
+
+    return urls
+
 
-async def upload_user_avatar(user_id: uuid.UUID, file: UploadFile) -> str:
+def avatar_url_for_size(avatar_url: str, size: int) -> str:
     """
-    Upload and process user avatar image.
-    
+    Get the URL of another size of a versioned avatar.
+
     Args:
-        user_id: UUID of the user.
-        file: Uploaded avatar file.
-        
+        avatar_url: Stored ``profile_image_url`` of the user.
+        size: One of ``AVATAR_SIZES``.
+
     Returns:
-        str: Relative URL path to the uploaded avatar.
-        
-    Raises:
-        FileUploadError: If file validation fails.
-        FileProcessingError: If image processing fails.
+        str: URL of the requested size, or ``avatar_url`` for legacy avatars.
+    """
+    match = AVATAR_URL_PATTERN.search(avatar_url)
+    if match is None:
+        return avatar_url
+    return f"{avatar_url[:match.start('size')]}{size}.jpg"
+
+
+async def delete_user_avatar(avatar_url: str) -> None:
     """
-    directory = f"avatars"
-    filename = f"{user_id}.jpg"
-    filepath = await save_upload_file(file, directory, filename)
+    Delete every stored size of an avatar.
 
-    file_path = await resize_image(filepath, max_width=300, max_height=300)
+    Args:
+        avatar_url: Previous ``profile_image_url`` of the user.
+    """
+    if AVATAR_URL_PATTERN.search(avatar_url) is None:
+        await delete_file(avatar_url)
+        return
 
-    relative_path = os.path.relpath(file_path, settings.UPLOAD_DIR)
-    return f"/images/{relative_path}"
+    for size in AVATAR_SIZES:
+        await delete_file(avatar_url_for_size(avatar_url, size))
 
 
-def delete_file(file_path: str) -> bool:
+async def delete_file(file_url: str) -> bool:
     """
-    Delete file from filesystem.
+    Delete a stored file by its public URL.
     
     Args:
-        file_path: Path to file to delete.
+        file_url: Public URL of the file to delete.
         
     Returns:
         bool: True if deleted successfully, False otherwise.
     """
+    storage = get_storage()
     try:
-        full_path = os.path.join(settings.UPLOAD_DIR, file_path.replace("/images/", ""))
-        if os.path.exists(full_path):
-            os.remove(full_path)
-            return True
-        return False
+        key = storage.key_from_url(file_url)
+        if key is None:
+            return False
+        return await storage.delete(key)
     except Exception:
         return False
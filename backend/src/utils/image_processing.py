@@ -0,0 +1,240 @@
+"""
+Image processing utilities for placeholders and derived images.
+
+Functions here take and return plain bytes/strings so they can run in a
+worker process (see ``run_in_process``) without touching the event loop.
+"""
+import asyncio
+import io
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+BASE83_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+BLURHASH_COMPONENTS = (4, 3)
+BLURHASH_SAMPLE_SIZE = 32
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool used for CPU-bound image work.
+
+    Returns:
+        ProcessPoolExecutor: Lazily created, process-wide pool.
+    """
+    global _process_pool
+    if _process_pool is None:
+        # Imported here so worker processes don't load application settings
+        from src.config import settings
+
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """
+    Shut down the image process pool if it was started.
+    """
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a picklable function in the image process pool.
+
+    Args:
+        func: Module-level function to call.
+        *args: Positional arguments.
+        **kwargs: Keyword arguments.
+
+    Returns:
+        Any: The function's return value.
+
+    Raises:
+        BrokenProcessPool: If a worker died; the pool is replaced on the next call.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        shutdown_process_pool()
+        raise
+
+
+def _encode_base83(value: int, length: int) -> str:
+    return "".join(
+        BASE83_CHARS[(value // 83 ** (length - i)) % 83] for i in range(1, length + 1)
+    )
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def encode_blurhash(img: Image.Image, components: Tuple[int, int] = BLURHASH_COMPONENTS) -> str:
+    """
+    Encode an image as a BlurHash string.
+
+    The image is downsampled first; a BlurHash only keeps a handful of
+    low-frequency components, so a 32px sample is indistinguishable from the
+    full-size image and keeps encoding in the low milliseconds.
+
+    Args:
+        img: Source image.
+        components: Number of (x, y) components, each between 1 and 9.
+
+    Returns:
+        str: BlurHash string (``4 + 2 * x * y`` characters).
+    """
+    components_x, components_y = components
+    sample = img.convert("RGB")
+    sample.thumbnail((BLURHASH_SAMPLE_SIZE, BLURHASH_SAMPLE_SIZE))
+    width, height = sample.size
+    pixels = [tuple(_srgb_to_linear(c) for c in px) for px in sample.getdata()]
+
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(components_x)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(components_y)]
+
+    factors: List[Tuple[float, float, float]] = []
+    for j in range(components_y):
+        for i in range(components_x):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row_basis = cos_y[j][y]
+                offset = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * row_basis
+                    pr, pg, pb = pixels[offset + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    blurhash = _encode_base83((components_x - 1) + (components_y - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(v) for factor in ac for v in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        blurhash += _encode_base83(quantised_max, 1)
+    else:
+        max_value = 1.0
+        blurhash += _encode_base83(0, 1)
+
+    dc_value = (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2])
+    blurhash += _encode_base83(dc_value, 4)
+
+    for factor in ac:
+        quantised = [
+            max(0, min(18, int(math.floor(_sign_pow(v / max_value, 0.5) * 9 + 9.5))))
+            for v in factor
+        ]
+        blurhash += _encode_base83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+
+    return blurhash
+
+
+def dominant_color(img: Image.Image) -> str:
+    """
+    Find the dominant color of an image.
+
+    Args:
+        img: Source image.
+
+    Returns:
+        str: Hex color, e.g. ``#a1b2c3``.
+    """
+    sample = img.convert("RGB")
+    sample.thumbnail((64, 64))
+    palette_image = sample.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    palette = palette_image.getpalette() or []
+    _, index = max(palette_image.getcolors() or [(1, 0)])
+    r, g, b = palette[index * 3:index * 3 + 3] if palette else (0, 0, 0)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def compute_placeholder(data: bytes) -> Tuple[str, str]:
+    """
+    Decode an image and compute its BlurHash and dominant color.
+
+    Args:
+        data: Encoded image bytes.
+
+    Returns:
+        Tuple[str, str]: BlurHash string and hex dominant color.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the bytes are not a supported image.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", (BLURHASH_SAMPLE_SIZE * 4, BLURHASH_SAMPLE_SIZE * 4))
+        img = ImageOps.exif_transpose(img)
+        return encode_blurhash(img), dominant_color(img)
+
+
+def render_jpeg_variants(
+    data: bytes,
+    sizes: Sequence[int],
+    quality: int = 85
+) -> Dict[int, bytes]:
+    """
+    Decode an image once and encode a JPEG for each bounding-box size.
+
+    Images keep their aspect ratio and are never upscaled.
+
+    Args:
+        data: Encoded source image bytes.
+        sizes: Maximum width/height of each variant.
+        quality: JPEG quality (1-100).
+
+    Returns:
+        Dict[int, bytes]: Encoded JPEG per requested size.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the bytes are not a supported image.
+    """
+    variants = {}
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", (max(sizes), max(sizes)))
+        img = ImageOps.exif_transpose(img)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        for size in sorted(sizes, reverse=True):
+            variant = img.copy()
+            variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            variant.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+            variants[size] = buffer.getvalue()
+            # Downscale the next (smaller) variant from this one
+            img = variant
+
+    return variants
@@ -0,0 +1,129 @@
+"""
+Per-request batching of primary-key lookups.
+
+A request often needs the same row several times: the auth dependency loads
+the current user, ownership dependencies load the property or sublease, and
+services load the users on the other side. ``query(...).filter(pk == ...)``
+always goes to the database even when the row is already in the session.
+
+``EntityLoader`` lives on the request's session (one session per request,
+see ``get_db``) and resolves lookups from the session's identity map first.
+Expired rows are refetched and rows marked for deletion count as gone, as
+they would for a query. Ids that are not loaded yet are queued per model;
+the next ``load`` of that model fetches every queued id in a single
+``IN (...)`` query. List endpoints ``prime`` or
+``load_many`` the ids of the rows they are about to touch so they arrive in
+one round trip instead of one each; many-to-one relationships to those rows
+then resolve from the identity map without a query.
+
+Nothing is remembered about ids that were not found, so a row inserted later
+in the session is found by the next lookup.
+"""
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+LOADER_KEY = "entity_loader"
+
+ModelT = TypeVar("ModelT")
+
+
+class EntityLoader:
+    """
+    Identity-map-aware loader batching primary-key lookups per model.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: Dict[type, Set[uuid.UUID]] = defaultdict(set)
+        # The identity map only holds weak references; keep fetched rows alive for the session
+        self._loaded: List[object] = []
+
+    @classmethod
+    def for_session(cls, db: Session) -> "EntityLoader":
+        """
+        Get the loader of a session, creating it on first use.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            EntityLoader: Loader shared by everything using the session.
+        """
+        loader = db.info.get(LOADER_KEY)
+        if loader is None:
+            loader = db.info[LOADER_KEY] = cls(db)
+        return loader
+
+    def prime(self, model: Type[ModelT], ids: Iterable[Optional[uuid.UUID]]) -> None:
+        """
+        Queue ids to be fetched with the next load of ``model``.
+
+        Args:
+            model: Mapped class with a single-column primary key.
+            ids: Primary keys; None and already loaded ids are skipped.
+        """
+        for entity_id in ids:
+            if entity_id is not None and not self._is_loaded(model, entity_id):
+                self._pending[model].add(entity_id)
+
+    def load(self, model: Type[ModelT], entity_id: uuid.UUID, *options: Any) -> Optional[ModelT]:
+        """
+        Get a row by primary key, fetching it with any queued ids of its model.
+
+        Args:
+            model: Mapped class with a single-column primary key.
+            entity_id: Primary key.
+            *options: Loader options (e.g. ``joinedload``) for the query, if one is needed.
+
+        Returns:
+            Optional[ModelT]: Row, or None if it doesn't exist.
+        """
+        return self.load_many(model, [entity_id], *options)[0]
+
+    def load_many(
+        self, model: Type[ModelT], ids: Iterable[Optional[uuid.UUID]], *options: Any
+    ) -> List[Optional[ModelT]]:
+        """
+        Get rows by primary key with at most one query.
+
+        Args:
+            model: Mapped class with a single-column primary key.
+            ids: Primary keys.
+            *options: Loader options (e.g. ``joinedload``) for the query, if one is needed.
+
+        Returns:
+            List[Optional[ModelT]]: Rows in the order of ``ids``, None where missing.
+        """
+        ids = list(ids)
+        self.prime(model, ids)
+        fetched = self._flush(model, options)
+        rows = [fetched[entity_id] if entity_id in fetched else self._cached(model, entity_id) for entity_id in ids]
+        # Like a query after flush, rows marked for deletion are gone
+        return [row if row is not None and row not in self.db.deleted else None for row in rows]
+
+    def _flush(self, model: type, options: Iterable[Any] = ()) -> Dict[uuid.UUID, Optional[object]]:
+        pending = self._pending.pop(model, None)
+        if not pending:
+            return {}
+        primary_key = inspect(model).primary_key[0]
+        rows = self.db.query(model).options(*options).filter(primary_key.in_(pending)).all()
+        self._loaded.extend(rows)
+        # Answer this lookup from the result rather than the identity map, which may still
+        # hold an expired instance for an id whose row has since been deleted
+        fetched: Dict[uuid.UUID, Optional[object]] = dict.fromkeys(pending)
+        fetched.update((getattr(row, primary_key.key), row) for row in rows)
+        return fetched
+
+    def _is_loaded(self, model: type, entity_id: uuid.UUID) -> bool:
+        # Expired rows (e.g. after a commit) may be gone, where Session.get would raise
+        # ObjectDeletedError; refetch them with the next batch instead
+        instance = self._cached(model, entity_id)
+        return instance is not None and not inspect(instance).expired
+
+    def _cached(self, model: type, entity_id: uuid.UUID) -> Optional[object]:
+        return self.db.identity_map.get(identity_key(model, entity_id))
@@ -0,0 +1,328 @@
+"""
+Cursor-based (keyset) pagination utilities.
+
+A ``KeysetSort`` is an ordered list of columns ending in a unique key. Pages
+are fetched with ``WHERE (sort columns) > (last row's values)`` instead of
+``OFFSET``, so every page costs the same no matter how deep the client
+scrolls, and rows inserted meanwhile never shift or duplicate results.
+
+Cursors are opaque URL-safe base64 JSON. Orderings over computed values
+(search relevance, distance) can't be resumed from column values; for those
+``offset_sort`` produces cursors that carry an offset instead, so clients
+follow cursors the same way for every sort.
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Generic, List, NamedTuple, Optional, Sequence, TypeVar
+
+from fastapi import Request, Response
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+from sqlalchemy.orm import Query
+
+from src.exceptions import ValidationError
+
+T = TypeVar("T")
+
+NEXT = "next"
+PREV = "prev"
+
+# Largest offset an offset cursor may carry, far beyond any real result set
+MAX_CURSOR_OFFSET = 2 ** 31 - 1
+
+
+class SortKey(NamedTuple):
+    """
+    One column of a keyset ordering.
+    """
+    column: Any
+    descending: bool = False
+
+
+class KeysetSort:
+    """
+    Ordering that can be paginated with cursors.
+    """
+
+    def __init__(self, name: str, keys: Sequence[SortKey], value_getter: Optional[Callable[[Any], List[Any]]] = None):
+        """
+        Args:
+            name: Sort name, embedded in cursors so they can't be replayed with another sort.
+            keys: Columns to order by; the last one must be unique.
+            value_getter: Reads the key values from a result row. Defaults to
+                reading each column's attribute from the row.
+        """
+        self.name = name
+        self.keys = list(keys)
+        self.value_getter = value_getter or (
+            lambda row: [getattr(row, key.column.key) for key in self.keys]
+        )
+
+    def order_by(self, reverse: bool = False) -> List[ColumnElement]:
+        """
+        Get ORDER BY clauses.
+
+        Args:
+            reverse: Whether to invert every direction (used to page backwards).
+
+        Returns:
+            List[ColumnElement]: Order clauses.
+        """
+        return [
+            key.column.desc() if key.descending != reverse else key.column.asc()
+            for key in self.keys
+        ]
+
+    def after(self, values: List[Any], reverse: bool = False) -> ColumnElement:
+        """
+        Build the condition selecting rows that sort after ``values``.
+
+        Args:
+            values: Key values of the boundary row.
+            reverse: Whether to select rows sorting before ``values`` instead.
+
+        Returns:
+            ColumnElement: Keyset condition.
+        """
+        directions = {key.descending != reverse for key in self.keys}
+        if len(directions) == 1:
+            # Uniform direction: a row-value comparison can use a composite index range scan
+            columns = tuple_(*(key.column for key in self.keys))
+            return columns < tuple_(*values) if directions.pop() else columns > tuple_(*values)
+
+        clauses = []
+        for index, key in enumerate(self.keys):
+            equal = [self.keys[i].column == values[i] for i in range(index)]
+            beyond = key.column < values[index] if key.descending != reverse else key.column > values[index]
+            clauses.append(and_(*equal, beyond))
+        return or_(*clauses)
+
+    def encode_values(self, row: Any) -> List[Any]:
+        """
+        Read a row's key values in a JSON-serializable form.
+
+        Args:
+            row: Result row.
+
+        Returns:
+            List[Any]: Serializable key values.
+        """
+        return [_to_json(value) for value in self.value_getter(row)]
+
+    def decode_values(self, values: List[Any]) -> List[Any]:
+        """
+        Convert cursor values back to column types.
+
+        Args:
+            values: Values from a cursor.
+
+        Returns:
+            List[Any]: Typed key values.
+
+        Raises:
+            ValidationError: If the values don't match the sort keys.
+        """
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise ValidationError("Invalid cursor.")
+        try:
+            return [_from_json(key.column.type.python_type, value) for key, value in zip(self.keys, values)]
+        except (TypeError, ValueError, AttributeError, ArithmeticError):
+            raise ValidationError("Invalid cursor.")
+
+
+class Page(NamedTuple, Generic[T]):
+    """
+    One page of results with cursors to its neighbours.
+    """
+    items: List[T]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def encode_cursor(payload: dict) -> str:
+    """
+    Encode a cursor payload.
+
+    Args:
+        payload: JSON-serializable cursor data.
+
+    Returns:
+        str: Opaque URL-safe cursor.
+    """
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_name: str) -> dict:
+    """
+    Decode a cursor and check that it belongs to a sort.
+
+    Args:
+        cursor: Cursor from a previous page.
+        sort_name: Sort the cursor must have been issued for.
+
+    Returns:
+        dict: Cursor payload.
+
+    Raises:
+        ValidationError: If the cursor is malformed or for another sort.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise ValidationError("Invalid cursor.")
+
+    if not isinstance(payload, dict) or payload.get("d") not in (NEXT, PREV):
+        raise ValidationError("Invalid cursor.")
+    if payload.get("s") != sort_name:
+        raise ValidationError("Cursor was issued for a different sort order.")
+    return payload
+
+
+def paginate(
+    query: Query,
+    sort: KeysetSort,
+    limit: int,
+    cursor: Optional[str] = None,
+    start: int = 0
+) -> Page:
+    """
+    Fetch one page of a query using keyset pagination.
+
+    Args:
+        query: Query to paginate, without ORDER BY/LIMIT/OFFSET.
+        sort: Ordering to paginate over.
+        limit: Page size.
+        cursor: Cursor from a previous page, or None for the first page.
+        start: Offset of the first page, e.g. a legacy ``skip``; ignored with a cursor.
+
+    Returns:
+        Page: Items with next/previous cursors.
+
+    Raises:
+        ValidationError: If the cursor is invalid.
+    """
+    direction = NEXT
+    if cursor:
+        payload = decode_cursor(cursor, sort.name)
+        direction = payload["d"]
+        reverse = direction == PREV
+        query = query.filter(sort.after(sort.decode_values(payload.get("v")), reverse=reverse))
+    else:
+        reverse = False
+
+    query = query.order_by(*sort.order_by(reverse=reverse))
+    if start and not cursor:
+        query = query.offset(start)
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if reverse:
+        rows.reverse()
+
+    def cursor_for(row: Any, to: str) -> str:
+        return encode_cursor({"s": sort.name, "d": to, "v": sort.encode_values(row)})
+
+    if not rows:
+        return Page(rows, None, None)
+
+    # Going forward there is a next page only if we over-fetched; a previous
+    # page exists whenever we arrived via a cursor or skipped rows. Mirror
+    # that going back.
+    has_next = has_more if direction == NEXT else True
+    has_prev = bool(cursor or start) if direction == NEXT else has_more
+    return Page(
+        rows,
+        cursor_for(rows[-1], NEXT) if has_next else None,
+        cursor_for(rows[0], PREV) if has_prev else None
+    )
+
+
+def paginate_offset(
+    query: Query,
+    sort_name: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    start: int = 0
+) -> Page:
+    """
+    Fetch one page of an already ordered query using offset cursors.
+
+    Used for orderings over computed values that can't be resumed by keyset.
+
+    Args:
+        query: Ordered query to paginate, without an offset of its own.
+        sort_name: Sort name embedded in the cursors.
+        limit: Page size.
+        cursor: Cursor from a previous page, or None for the first page.
+        start: Offset of the first page, e.g. a legacy ``skip``; ignored with a cursor.
+
+    Returns:
+        Page: Items with next/previous cursors.
+
+    Raises:
+        ValidationError: If the cursor is invalid.
+    """
+    offset = start
+    if cursor:
+        offset = decode_cursor(cursor, sort_name).get("o")
+        # bool is an int subclass, so JSON true/false would pass as 1/0
+        if not isinstance(offset, int) or isinstance(offset, bool) or not 0 <= offset <= MAX_CURSOR_OFFSET:
+            raise ValidationError("Invalid cursor.")
+
+    rows = query.offset(offset).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return Page(
+        rows,
+        encode_cursor({"s": sort_name, "d": NEXT, "o": offset + limit}) if has_more else None,
+        encode_cursor({"s": sort_name, "d": PREV, "o": max(offset - limit, 0)}) if offset > 0 else None
+    )
+
+
+def set_cursor_headers(request: Request, response: Response, page: Page) -> None:
+    """
+    Expose page cursors as ``X-Next-Cursor``/``X-Prev-Cursor`` and ``Link`` headers.
+
+    Keeps list response bodies unchanged for existing clients.
+
+    Args:
+        request: Current request.
+        response: Response to add headers to.
+        page: Page being returned.
+    """
+    links = []
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        links.append(f'<{request.url.include_query_params(cursor=page.next_cursor)}>; rel="next"')
+    if page.prev_cursor:
+        response.headers["X-Prev-Cursor"] = page.prev_cursor
+        links.append(f'<{request.url.include_query_params(cursor=page.prev_cursor)}>; rel="prev"')
+    if links:
+        response.headers["Link"] = ", ".join(links)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _from_json(python_type: type, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (bool, list, dict)):
+        raise TypeError(f"Unsupported cursor value {value!r}")
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (Decimal, uuid.UUID, int, float, str):
+        return python_type(value)
+    raise TypeError(f"Unsupported cursor value type {python_type}")
@@ -0,0 +1,202 @@
+"""
+In-process periodic job scheduler.
+
+Every worker process runs the scheduler with its own timers. A due job first
+takes a Postgres session-level advisory lock keyed on the job name on a
+dedicated connection, then checks when the job last started in
+``scheduled_job_runs``. If another worker started it less than
+``interval_seconds`` ago the tick is skipped; otherwise the start time is
+recorded and the job runs. The job runs at most once per interval across
+all workers, not once per worker. The lock is released when the run finishes
+or, if the worker dies, when its connection closes.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import Column, DateTime, String, Table, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database import Base, engine
+
+logger = logging.getLogger(__name__)
+
+# When each job last started, shared by all workers (UTC)
+scheduled_job_runs = Table(
+    "scheduled_job_runs",
+    Base.metadata,
+    Column("job_name", String(100), primary_key=True),
+    Column("last_run_at", DateTime, nullable=False)
+)
+
+
+class Job(NamedTuple):
+    """
+    A periodic job.
+    """
+    name: str
+    func: Callable[[Session], None]
+    interval_seconds: float
+    initial_delay_seconds: float
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Derive a stable 64-bit advisory lock key from a name.
+
+    Args:
+        name: Lock name.
+
+    Returns:
+        int: Signed 64-bit key.
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@contextmanager
+def leader_session(name: str) -> Iterator[Optional[Session]]:
+    """
+    Try to become the leader for ``name`` across all workers.
+
+    Args:
+        name: Lock name.
+
+    Yields:
+        Optional[Session]: Session holding the lock, or None if another worker has it.
+    """
+    key = advisory_lock_key(name)
+    with engine.connect() as conn:
+        acquired = conn.scalar(select(func.pg_try_advisory_lock(key)))
+        conn.commit()
+        if not acquired:
+            yield None
+            return
+
+        try:
+            with Session(bind=conn) as db:
+                yield db
+        finally:
+            conn.rollback()
+            conn.scalar(select(func.pg_advisory_unlock(key)))
+            conn.commit()
+
+
+def claim_run(db: Session, job: Job) -> bool:
+    """
+    Record a run of ``job`` unless one started less than its interval ago.
+
+    Must be called while holding the job's advisory lock so that the check
+    and the update can't interleave with another worker's.
+
+    Args:
+        db: Session holding the job's lock.
+        job: Job about to run.
+
+    Returns:
+        bool: True if the run was recorded and the job should run.
+    """
+    now = db.scalar(select(func.timezone("UTC", func.now())))
+    last_run_at = db.scalar(
+        select(scheduled_job_runs.c.last_run_at).where(scheduled_job_runs.c.job_name == job.name)
+    )
+    if last_run_at is not None and now - last_run_at < timedelta(seconds=job.interval_seconds):
+        return False
+
+    db.execute(
+        insert(scheduled_job_runs)
+        .values(job_name=job.name, last_run_at=now)
+        .on_conflict_do_update(index_elements=[scheduled_job_runs.c.job_name], set_={"last_run_at": now})
+    )
+    # Committed before the job runs, so a failing job is retried next interval, not on every worker's tick
+    db.commit()
+    return True
+
+
+class Scheduler:
+    """
+    Runs registered jobs periodically on the event loop.
+
+    Jobs are synchronous functions taking a database session; they run in a
+    worker thread so they don't block request handling.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[Session], None],
+        interval_seconds: float,
+        initial_delay_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Register a periodic job.
+
+        Args:
+            name: Unique job name, also used as the leader lock name.
+            func: Job function taking a database session.
+            interval_seconds: Minimum seconds between the starts of two runs on any
+                workers; each worker also waits this long after its own tick.
+            initial_delay_seconds: Delay before the first run; defaults to a
+                random fraction of the interval so workers don't start in lockstep.
+        """
+        if initial_delay_seconds is None:
+            initial_delay_seconds = random.uniform(0, min(interval_seconds, 60))
+        self._jobs[name] = Job(name, func, interval_seconds, initial_delay_seconds)
+
+    def start(self) -> None:
+        """
+        Start running all registered jobs.
+        """
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._run_forever(job), name=f"job:{job.name}"))
+
+    async def stop(self) -> None:
+        """
+        Stop all jobs, waiting for running ones to be cancelled.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def run_once(self, name: str) -> bool:
+        """
+        Run a job now if no worker is running it and none ran it within its interval.
+
+        Args:
+            name: Job name.
+
+        Returns:
+            bool: True if the job ran.
+        """
+        job = self._jobs[name]
+        with leader_session(job.name) as db:
+            if db is None:
+                logger.debug(f"Skipping job {job.name}: another worker holds the lock")
+                return False
+            if not claim_run(db, job):
+                logger.debug(f"Skipping job {job.name}: it ran less than {job.interval_seconds}s ago")
+                return False
+            job.func(db)
+            return True
+
+    async def _run_forever(self, job: Job) -> None:
+        await asyncio.sleep(job.initial_delay_seconds)
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once, job.name)
+            except Exception:
+                logger.exception(f"Scheduled job {job.name} failed")
+            await asyncio.sleep(job.interval_seconds)
+
+
+scheduler = Scheduler()
@@ -0,0 +1,93 @@
+"""
+Fast paths for turning database rows into JSON responses.
+
+Response schemas are built from rows in one ``model_validate`` call with
+``from_attributes=True``: nested schemas (images, lessors, raters) are read
+straight from the related ORM rows by pydantic-core instead of being
+converted one by one in Python first. Skipping validation with
+``model_construct`` was measured to be slower than this, since
+pydantic-core validates in native code while ``model_construct`` and the
+conversions it would need run in Python (see
+``scripts/benchmark_serialization.py``).
+
+``partial_model`` builds schemas for sparse fieldsets, where required
+fields may be left out, validating only the fields that are present.
+
+``default_response_class`` picks the class FastAPI encodes return values
+with. ``JSON_RESPONSE_CLASS=orjson`` switches to ORJSON, which needs the
+optional ``orjson`` dependency (``uv sync --extra orjson``).
+"""
+from functools import lru_cache
+from typing import Any, Dict, Type, TypeVar
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def orm_model(schema: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """
+    Build a response schema from row values in a single validation pass.
+
+    Args:
+        schema: Response schema.
+        values: Field values; nested schemas may be given as ORM rows.
+
+    Returns:
+        ModelT: Schema instance.
+    """
+    return schema.model_validate(values, from_attributes=True)
+
+
+def partial_model(schema: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """
+    Build a response schema holding only some of its fields.
+
+    Each given field is validated on its own; the others are left unset,
+    so serialize the result with an ``include`` of the given fields.
+
+    Args:
+        schema: Response schema.
+        values: Values of the fields to set; nested schemas may be given as ORM rows.
+
+    Returns:
+        ModelT: Schema instance without the missing fields.
+    """
+    return schema.model_construct(**{
+        name: _field_adapter(schema, name).validate_python(value, from_attributes=True)
+        for name, value in values.items()
+    })
+
+
+def default_response_class(name: str) -> Type[JSONResponse]:
+    """
+    Get the response class for encoding endpoint return values.
+
+    Args:
+        name: ``"default"`` for the standard library encoder or ``"orjson"``.
+
+    Returns:
+        Type[JSONResponse]: Response class.
+
+    Raises:
+        RuntimeError: If orjson is selected but not installed.
+        ValueError: If the name is unknown.
+    """
+    if name == "default":
+        return JSONResponse
+    if name == "orjson":
+        try:
+            import orjson  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError(
+                "The orjson response class requires orjson. "
+                "Install it with `uv sync --extra orjson`."
+            ) from e
+        return ORJSONResponse
+    raise ValueError(f"Unknown JSON response class {name!r}; expected 'default' or 'orjson'")
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(schema: Type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(schema.model_fields[name].annotation)
@@ -0,0 +1,28 @@
+"""
+Tests for export content negotiation.
+"""
+
+import pytest
+
+from src.exports.router import _accepts_gzip
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", False),
+        ("identity", False),
+        ("gzip", True),
+        ("GZIP;q=0.5, br", True),
+        ("br, *", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.000", False),
+        ("gzip;q=0.", False),
+        ("*;q=0, gzip", True),
+        ("gzip;q=0, *", False),
+        ("*;q=0", False),
+        ("gzip;q=abc", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert _accepts_gzip(accept_encoding) is expected
@@ -0,0 +1,195 @@
+"""
+Tests for cursor encoding and decoding.
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, MetaData, Numeric, Table
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.exceptions import ValidationError
+from src.utils.pagination import (
+    MAX_CURSOR_OFFSET,
+    NEXT,
+    PREV,
+    KeysetSort,
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    paginate_offset,
+)
+
+listings = Table(
+    "listings",
+    MetaData(),
+    Column("created_at", DateTime),
+    Column("rate", Numeric(10, 2)),
+    Column("listing_id", UUID(as_uuid=True), primary_key=True),
+)
+
+NEWEST = KeysetSort(
+    "newest",
+    [
+        SortKey(listings.c.created_at, descending=True),
+        SortKey(listings.c.rate),
+        SortKey(listings.c.listing_id, descending=True),
+    ],
+)
+
+
+class ListQuery:
+    """Stands in for a Query over a list, recording the offset used."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.offset_used = None
+        self._limit = None
+
+    def offset(self, offset):
+        self.offset_used = offset
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+        return self
+
+    def all(self):
+        return self.rows[self.offset_used : self.offset_used + self._limit]
+
+
+def tamper(cursor: str) -> str:
+    return cursor[:-2] + ("A" if cursor[-2] != "A" else "B") + cursor[-1]
+
+
+def test_keyset_cursor_round_trip():
+    row = SimpleNamespace(
+        created_at=datetime(2026, 3, 1, 12, 30, 15, 250000),
+        rate=Decimal("1250.50"),
+        listing_id=uuid.UUID("6f1c2c54-1f0b-4c43-9a3c-0d1e2f3a4b5c"),
+    )
+    cursor = encode_cursor({"s": "newest", "d": NEXT, "v": NEWEST.encode_values(row)})
+
+    payload = decode_cursor(cursor, "newest")
+
+    assert "=" not in cursor
+    assert payload["d"] == NEXT
+    assert NEWEST.decode_values(payload["v"]) == [
+        row.created_at,
+        row.rate,
+        row.listing_id,
+    ]
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor({"s": "cheapest", "d": NEXT, "v": []})
+
+    with pytest.raises(ValidationError) as error:
+        decode_cursor(cursor, "newest")
+
+    assert error.value.status_code == 400
+    assert "different sort" in error.value.detail
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "bm90IGpzb24",  # "not json"
+        encode_cursor(["newest", NEXT]),
+        encode_cursor({"s": "newest", "d": "sideways"}),
+        encode_cursor({"s": "newest"}),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValidationError) as error:
+        decode_cursor(cursor, "newest")
+
+    assert error.value.status_code == 400
+
+
+def test_tampered_cursor_is_rejected():
+    cursor = encode_cursor({"s": "newest", "d": PREV, "v": ["2026-03-01T12:30:15"]})
+
+    with pytest.raises(ValidationError):
+        decode_cursor(tamper(cursor), "newest")
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        None,
+        "2026-03-01T12:30:15",
+        ["2026-03-01T12:30:15", "1.00"],
+        ["2026-03-01T12:30:15", "1.00", str(uuid.uuid4()), "extra"],
+        ["yesterday", "1.00", str(uuid.uuid4())],
+        ["2026-03-01T12:30:15", "cheap", str(uuid.uuid4())],
+        ["2026-03-01T12:30:15", "1.00", "not-a-uuid"],
+        ["2026-03-01T12:30:15", "1.00", 42],
+        [20260301, "1.00", str(uuid.uuid4())],
+        ["2026-03-01T12:30:15", True, str(uuid.uuid4())],
+        ["2026-03-01T12:30:15", ["1.00"], str(uuid.uuid4())],
+    ],
+)
+def test_cursor_values_not_matching_the_sort_are_rejected(values):
+    with pytest.raises(ValidationError) as error:
+        NEWEST.decode_values(values)
+
+    assert error.value.status_code == 400
+
+
+def test_cursor_values_may_be_null():
+    assert NEWEST.decode_values([None, None, None]) == [None, None, None]
+
+
+def test_offset_cursors_page_forwards_and_back():
+    rows = list(range(25))
+
+    first = paginate_offset(ListQuery(rows), "relevance", limit=10)
+    second_query = ListQuery(rows)
+    second = paginate_offset(second_query, "relevance", 10, first.next_cursor)
+    third = paginate_offset(ListQuery(rows), "relevance", 10, second.next_cursor)
+    back = paginate_offset(ListQuery(rows), "relevance", 10, third.prev_cursor)
+
+    assert first.items == rows[:10]
+    assert first.prev_cursor is None
+    assert second_query.offset_used == 10
+    assert second.items == rows[10:20]
+    assert third.items == rows[20:]
+    assert third.next_cursor is None
+    assert back.items == rows[10:20]
+
+
+def test_offset_start_applies_to_first_page_only():
+    query = ListQuery(list(range(25)))
+
+    page = paginate_offset(query, "relevance", limit=10, start=5)
+
+    assert query.offset_used == 5
+    assert page.items == list(range(5, 15))
+    assert decode_cursor(page.prev_cursor, "relevance")["o"] == 0
+
+
+@pytest.mark.parametrize(
+    "offset", [-1, MAX_CURSOR_OFFSET + 1, 10**30, 1.5, "10", None, True, False]
+)
+def test_offset_cursor_with_invalid_offset_is_rejected(offset):
+    cursor = encode_cursor({"s": "relevance", "d": NEXT, "o": offset})
+
+    with pytest.raises(ValidationError) as error:
+        paginate_offset(ListQuery([]), "relevance", 10, cursor)
+
+    assert error.value.status_code == 400
+
+
+def test_offset_cursor_at_the_bound_is_accepted():
+    cursor = encode_cursor({"s": "relevance", "d": NEXT, "o": MAX_CURSOR_OFFSET})
+    query = ListQuery([])
+
+    page = paginate_offset(query, "relevance", 10, cursor)
+
+    assert query.offset_used == MAX_CURSOR_OFFSET
+    assert page.items == []
@@ -0,0 +1,112 @@
+"""
+Tests for reputation score arithmetic.
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+
+from src.userratings.reputation import (
+    RatingTotals,
+    batch_totals,
+    merge_totals,
+    reputation_scores,
+    user_id_from_key,
+)
+
+USER_A = uuid.UUID("00000000-0000-0000-0000-0000000000a1")
+USER_B = uuid.UUID("00000000-0000-0000-0000-0000000000b2")
+USER_C = uuid.UUID("00000000-0000-0000-0000-0000000000c3")
+
+
+def keys(*user_ids: uuid.UUID) -> np.ndarray:
+    return np.array([user_id.bytes for user_id in user_ids], dtype="S16")
+
+
+def test_batch_totals_halves_weight_every_half_life():
+    totals = batch_totals(
+        keys(USER_A, USER_B, USER_A),
+        np.array([4.0, 2.0, 5.0]),
+        np.array([0.0, 30.0, 60.0]),
+        half_life_days=30.0,
+    )
+
+    assert [user_id_from_key(key) for key in totals.user_keys] == [USER_A, USER_B]
+    # A: 4 at weight 1 and 5 at weight 0.25; B: 2 at weight 0.5
+    assert totals.weights == pytest.approx([1.25, 0.5])
+    assert totals.weighted_ratings == pytest.approx([5.25, 1.0])
+
+
+def test_batch_totals_counts_future_ratings_at_full_weight():
+    totals = batch_totals(
+        keys(USER_A), np.array([3.0]), np.array([-2.0]), half_life_days=30.0
+    )
+
+    assert totals.weights == pytest.approx([1.0])
+    assert totals.weighted_ratings == pytest.approx([3.0])
+
+
+def test_merge_totals_sums_users_across_batches():
+    first = batch_totals(
+        keys(USER_A, USER_B), np.array([4.0, 2.0]), np.array([0.0, 0.0]), 30.0
+    )
+    second = batch_totals(keys(USER_A), np.array([5.0]), np.array([30.0]), 30.0)
+
+    totals = merge_totals([first, second])
+
+    assert [user_id_from_key(key) for key in totals.user_keys] == [USER_A, USER_B]
+    assert totals.weights == pytest.approx([1.5, 1.0])
+    assert totals.weighted_ratings == pytest.approx([6.5, 2.0])
+
+
+def test_merge_totals_of_no_batches_is_empty():
+    totals = merge_totals([])
+
+    assert len(totals.user_keys) == 0
+    assert len(totals.weights) == 0
+    assert len(totals.weighted_ratings) == 0
+
+
+def test_reputation_scores_shrink_towards_weighted_mean():
+    # A: weight 1.5, weighted sum 6.5; B: weight 0.5, weighted sum 1.0
+    totals = RatingTotals(
+        keys(USER_A, USER_B), np.array([1.5, 0.5]), np.array([6.5, 1.0])
+    )
+
+    scores, prior_mean = reputation_scores(totals, prior_weight=2.0)
+
+    # m = 7.5 / 2 = 3.75; A = (2 * 3.75 + 6.5) / 3.5; B = (2 * 3.75 + 1.0) / 2.5
+    assert prior_mean == pytest.approx(3.75)
+    assert scores == pytest.approx([4.0, 3.4])
+
+
+def test_reputation_score_without_rating_weight_is_prior_mean():
+    totals = RatingTotals(
+        keys(USER_A, USER_B, USER_C),
+        np.array([1.0, 0.0, 1.0]),
+        np.array([5.0, 0.0, 3.0]),
+    )
+
+    scores, prior_mean = reputation_scores(totals, prior_weight=5.0)
+
+    # m = 8 / 2 = 4; A = (5 * 4 + 5) / 6; B adds nothing to the prior;
+    # C = (5 * 4 + 3) / 6
+    assert prior_mean == pytest.approx(4.0)
+    assert scores == pytest.approx([25 / 6, 4.0, 23 / 6])
+
+
+def test_reputation_scores_without_ratings():
+    scores, prior_mean = reputation_scores(merge_totals([]), prior_weight=5.0)
+
+    assert len(scores) == 0
+    assert prior_mean == 0.0
+
+
+def test_user_id_from_key_restores_trailing_nul_bytes():
+    user_id = uuid.UUID(bytes=b"\x12\x34" + b"\0" * 14)
+    key = keys(user_id)[0]
+
+    # NumPy strips the trailing NULs from S16 values
+    assert len(key) == 2
+    assert user_id_from_key(key) == user_id